@@ -1,4 +1,24 @@
-from project_buzzkill import Game
+import argparse
 
 if __name__ == "__main__":
-    Game().run()
+    # Imported here, not at the top: spawned worker processes re-run this file
+    # as __mp_main__ and should not load the game (and pygame) for nothing
+    from project_buzzkill.core import MATCH_MODES
+    from project_buzzkill.game import Game
+
+    parser = argparse.ArgumentParser(description="2D-Flox")
+    parser.add_argument("--renderer", choices=("software", "texture"),
+                        help="drawing backend (default: software, or $FLOX_RENDERER)")
+    parser.add_argument("--resolution",
+                        help="internal arena resolution, e.g. 960x540 or native "
+                             "(default: native, or $FLOX_RESOLUTION)")
+    parser.add_argument("--sim-process", action="store_true", default=None,
+                        help="run the simulation in a worker process (or $FLOX_SIM_PROCESS=1)")
+    parser.add_argument("--mode", choices=tuple(MATCH_MODES),
+                        help="match mode (default: 1v1, or $FLOX_MODE)")
+    parser.add_argument("--arena",
+                        help="arena size in world units, e.g. 2560x1440; larger than 1280x720 "
+                             "scrolls with a camera (default: 1280x720, or $FLOX_ARENA)")
+    args = parser.parse_args()
+    Game(renderer=args.renderer, resolution=args.resolution, sim_process=args.sim_process,
+         mode=args.mode, arena=args.arena).run()
@@ -0,0 +1,279 @@
+"""Headless ship-balance sweep over the SHIPS table.
+
+Plays bot-vs-bot matches for every ship pairing and every combination of the
+requested parameter values, spread over a multiprocessing pool, and streams
+the results to disk as they come in:
+
+    python balance_sweep.py --param Osa.bullet_speed=5:9:1 --param "*.speed=3,4" \\
+        --matches 20 --out sweep_out
+
+Parameter specs are SHIP.key=values where SHIP may be * for every ship and
+values is either a comma list (3,4,5) or an inclusive start:stop:step range.
+
+Output directory:
+    matches.csv  one row per finished match, appended as results arrive
+    summary.csv  per config and ship-vs-opponent win rate, time-to-kill and
+                 damage, rewritten every --flush-every matches and at the end
+    configs.json the parameter overrides behind each config id
+"""
+import argparse
+import copy
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# Headless: no window, no audio device, no pygame banner in every worker
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import project_buzzkill as flox
+
+MATCH_FIELDS = ["config", "ship1", "ship2", "seed", "winner", "ticks",
+                "damage_to_ship1", "damage_to_ship2"]
+SUMMARY_FIELDS = ["config", "ship", "opponent", "matches", "wins", "losses", "draws",
+                  "win_rate", "mean_ttk", "mean_damage_dealt", "mean_damage_taken"]
+
+# Pristine SHIPS table per worker; every task starts from it so overrides never leak
+_BASE_SHIPS = None
+
+
+def parse_values(text):
+    """Parse '3,4,5' or an inclusive 'start:stop:step' range into a list of numbers."""
+    def num(v):
+        v = float(v)
+        return int(v) if v.is_integer() else v
+
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"range must be start:stop:step, got {text!r}")
+        start, stop, step = (float(p) for p in parts)
+        if step <= 0:
+            raise ValueError(f"range step must be positive, got {text!r}")
+        values = []
+        i = 0
+        while start + i * step <= stop + 1e-9:
+            values.append(num(round(start + i * step, 9)))
+            i += 1
+        return values
+    return [num(v) for v in text.split(",") if v.strip()]
+
+
+def parse_param(spec):
+    """Parse 'SHIP.key=values' into (ship, key, [values])."""
+    target, _, values = spec.partition("=")
+    ship, _, key = target.partition(".")
+    if not values or not key:
+        raise ValueError(f"parameter must look like SHIP.key=values, got {spec!r}")
+    if ship != "*" and ship not in flox.SHIPS:
+        raise ValueError(f"unknown ship {ship!r}")
+    if ship == "*":
+        missing = [name for name, cfg in flox.SHIPS.items() if key not in cfg]
+        if len(missing) == len(flox.SHIPS):
+            raise ValueError(f"no ship has a {key!r} setting")
+    elif key not in flox.SHIPS[ship]:
+        raise ValueError(f"{ship} has no {key!r} setting")
+    return ship, key, parse_values(values)
+
+
+def build_configs(params):
+    """Cartesian product of all parameter values -> list of override lists."""
+    if not params:
+        return [[]]
+    axes = [[(ship, key, v) for v in values] for ship, key, values in params]
+    return [list(combo) for combo in itertools.product(*axes)]
+
+
+def apply_overrides(overrides):
+    """Reset SHIPS to the pristine table and apply (ship, key, value) overrides in place."""
+    global _BASE_SHIPS
+    if _BASE_SHIPS is None:
+        _BASE_SHIPS = copy.deepcopy(flox.SHIPS)
+    # Mutate in place: Ship reads flox.SHIPS at runtime
+    flox.SHIPS.clear()
+    flox.SHIPS.update(copy.deepcopy(_BASE_SHIPS))
+    for ship, key, value in overrides:
+        names = flox.SHIPS.keys() if ship == "*" else [ship]
+        for name in names:
+            if key in flox.SHIPS[name]:
+                flox.SHIPS[name][key] = value
+    # Bullets and weapon patterns use the compiled specs
+    flox.compile_ships()
+
+
+def play_match(ship1_type, ship2_type, seed, max_ticks, tick_step=1):
+    """Play one bot-vs-bot match and return (winner, ticks, damage_to_ship1, damage_to_ship2).
+
+    winner is 1, 2 or 0 for a draw (both destroyed, or nobody by max_ticks).
+    tick_step > 1 simulates that many ticks per step (faster, coarser bots).
+    """
+    match = flox.Match()
+    match.new_match(ship1_type, flox.DEFAULT_SHIP_COLORS.get(ship1_type, flox.SHIP_COLORS[0]),
+                    ship2_type, flox.DEFAULT_SHIP_COLORS.get(ship2_type, flox.SHIP_COLORS[1]))
+    bot1 = flox.SimpleBot(match.ship1, match.ship2, seed=seed * 2)
+    bot2 = flox.SimpleBot(match.ship2, match.ship1, seed=seed * 2 + 1)
+    while match.state == "playing" and match.tick < max_ticks:
+        keys1, fire1 = bot1.think(tick_step)
+        keys2, fire2 = bot2.think(tick_step)
+        match.set_fire(match.ship1, fire1)
+        match.set_fire(match.ship2, fire2)
+        match.step(keys1, keys2, tick_step)
+
+    dead1 = match.ship1.health <= 0
+    dead2 = match.ship2.health <= 0
+    winner = 0
+    if dead2 and not dead1:
+        winner = 1
+    elif dead1 and not dead2:
+        winner = 2
+    damage1 = match.ship1.max_health - max(0, match.ship1.health)
+    damage2 = match.ship2.max_health - max(0, match.ship2.health)
+    return winner, match.tick, damage1, damage2
+
+
+def run_task(task):
+    """Pool worker: play every seed of one (config, pairing) and return the rows."""
+    config_id, overrides, ship1_type, ship2_type, seeds, max_ticks, tick_step = task
+    apply_overrides(overrides)
+    rows = []
+    for seed in seeds:
+        winner, ticks, damage1, damage2 = play_match(ship1_type, ship2_type, seed, max_ticks, tick_step)
+        rows.append({
+            "config": config_id, "ship1": ship1_type, "ship2": ship2_type, "seed": seed,
+            "winner": winner, "ticks": ticks,
+            "damage_to_ship1": damage1, "damage_to_ship2": damage2,
+        })
+    return rows
+
+
+class SweepSummary:
+    """Running per (config, ship, opponent) aggregates, written as summary.csv."""
+    def __init__(self):
+        self.stats = {}
+
+    def _entry(self, config_id, ship, opponent):
+        key = (config_id, ship, opponent)
+        if key not in self.stats:
+            self.stats[key] = {"matches": 0, "wins": 0, "losses": 0, "draws": 0,
+                               "ttk_total": 0, "dealt": 0, "taken": 0}
+        return self.stats[key]
+
+    def add(self, row):
+        # Record the match from both ships' point of view; a mirror match
+        # (Osa vs Osa) has one entry, so it is counted once, from ship 1's side
+        sides = ((row["ship1"], row["ship2"], 1, row["damage_to_ship2"], row["damage_to_ship1"]),
+                 (row["ship2"], row["ship1"], 2, row["damage_to_ship1"], row["damage_to_ship2"]))
+        if row["ship1"] == row["ship2"]:
+            sides = sides[:1]
+        for ship, opponent, side, dealt, taken in sides:
+            e = self._entry(row["config"], ship, opponent)
+            e["matches"] += 1
+            e["dealt"] += dealt
+            e["taken"] += taken
+            if row["winner"] == side:
+                e["wins"] += 1
+                e["ttk_total"] += row["ticks"]
+            elif row["winner"] == 0:
+                e["draws"] += 1
+            else:
+                e["losses"] += 1
+
+    def write(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            for (config_id, ship, opponent), e in sorted(self.stats.items()):
+                n = e["matches"]
+                writer.writerow({
+                    "config": config_id, "ship": ship, "opponent": opponent,
+                    "matches": n, "wins": e["wins"], "losses": e["losses"], "draws": e["draws"],
+                    "win_rate": round(e["wins"] / n, 4) if n else 0.0,
+                    # time-to-kill in seconds of game time, over the matches this ship won
+                    "mean_ttk": round(e["ttk_total"] / e["wins"] / flox.FPS, 3) if e["wins"] else "",
+                    "mean_damage_dealt": round(e["dealt"] / n, 3) if n else 0.0,
+                    "mean_damage_taken": round(e["taken"] / n, 3) if n else 0.0,
+                })
+        # atomic replace so readers never see a half-written table
+        os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless bot-vs-bot balance sweep over SHIPS.")
+    parser.add_argument("--param", action="append", default=[],
+                        help="SHIP.key=values, values as a,b,c or start:stop:step (repeatable)")
+    parser.add_argument("--ships", default="",
+                        help="comma-separated ships to include (default: all)")
+    parser.add_argument("--matches", type=int, default=10, help="matches per pairing per config")
+    parser.add_argument("--max-ticks", type=int, default=60 * flox.FPS,
+                        help="ticks before a match is scored as a draw")
+    parser.add_argument("--tick-step", type=int, default=1,
+                        help="ticks simulated per step; 2-4 trades bot precision for speed")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the bots")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default="sweep_out", help="output directory")
+    parser.add_argument("--flush-every", type=int, default=200,
+                        help="rewrite summary.csv after this many matches")
+    args = parser.parse_args(argv)
+
+    try:
+        params = [parse_param(p) for p in args.param]
+    except ValueError as e:
+        parser.error(str(e))
+    ships = [s.strip() for s in args.ships.split(",") if s.strip()] or list(flox.SHIPS.keys())
+    unknown = [s for s in ships if s not in flox.SHIPS]
+    if unknown:
+        parser.error(f"unknown ships: {', '.join(unknown)}")
+
+    if args.tick_step < 1:
+        parser.error("--tick-step must be at least 1")
+
+    configs = build_configs(params)
+    seeds = list(range(args.seed, args.seed + args.matches))
+    # Every ordered pairing, so each ship plays from both sides of the arena
+    tasks = [(cid, overrides, a, b, seeds, args.max_ticks, args.tick_step)
+             for cid, overrides in enumerate(configs)
+             for a, b in itertools.product(ships, ships)]
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "configs.json"), "w") as f:
+        json.dump({cid: [{"ship": s, "key": k, "value": v} for s, k, v in overrides]
+                   for cid, overrides in enumerate(configs)}, f, indent=2)
+
+    total = len(tasks) * len(seeds)
+    print(f"{len(configs)} config(s) x {len(ships) ** 2} pairing(s) x {len(seeds)} match(es) "
+          f"= {total} matches on {args.workers} worker(s)")
+
+    summary = SweepSummary()
+    summary_path = os.path.join(args.out, "summary.csv")
+    done = 0
+    since_flush = 0
+    start = time.time()
+    with open(os.path.join(args.out, "matches.csv"), "w", newline="") as f, \
+            multiprocessing.Pool(args.workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=MATCH_FIELDS)
+        writer.writeheader()
+        for rows in pool.imap_unordered(run_task, tasks):
+            for row in rows:
+                writer.writerow(row)
+                summary.add(row)
+            f.flush()
+            done += len(rows)
+            since_flush += len(rows)
+            if since_flush >= args.flush_every:
+                summary.write(summary_path)
+                since_flush = 0
+                rate = done / max(1e-6, time.time() - start)
+                print(f"  {done}/{total} matches ({rate:.1f}/s)")
+    summary.write(summary_path)
+    print(f"Done: {done} matches in {time.time() - start:.1f}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
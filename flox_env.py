@@ -0,0 +1,312 @@
+"""Vectorised Gym-style environment over the headless Match, for training bots.
+
+Steps a batch of independent matches in lockstep and returns NumPy arrays:
+
+    env = FloxVecEnv(num_envs=64, ship="Osa", opponent_ship="Rekin", seed=0,
+                     num_workers=8)
+    obs = env.reset()
+    while training:
+        actions = policy(obs)                    # int array, shape (num_envs,)
+        obs, rewards, dones, infos = env.step(actions)
+    env.close()
+
+Each match is still stepped by the per-object Python Match, so one core
+manages a few thousand env steps per second. num_workers shards the batch
+over that many processes, which step their slices in parallel and write
+straight into shared NumPy buffers, so throughput grows with the cores
+available; frame_skip (action repeat) multiplies the ticks per step.
+
+The agent flies ship1 (left side) against a SimpleBot on ship2. Finished
+matches reset themselves inside step(); their last observation is kept in
+infos["final_observation"]. The returned arrays are preallocated buffers that
+the next step() overwrites, so copy them if you need to keep them.
+
+Needs NumPy (listed in requirements.txt for this tool only; the game itself
+does not import it).
+"""
+import heapq
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import project_buzzkill as flox
+
+# Actions are bitmasks of these buttons, so the action space is Discrete(32)
+ACTION_UP = 1
+ACTION_DOWN = 2
+ACTION_LEFT = 4
+ACTION_RIGHT = 8
+ACTION_FIRE = 16
+NUM_ACTIONS = 32
+
+# Enemy bullets reported per observation, nearest first
+NEAREST_BULLETS = 4
+# own: x, y, health, magazine, charging, charge | enemy: x, y, health, magazine, charging
+# bullets: dx, dy, vx, present for each of the nearest enemy bullets
+OBS_SIZE = 6 + 5 + 4 * NEAREST_BULLETS
+
+WIN_REWARD = 1.0
+
+# Per-env buffers shared by every shard: name, dtype, row shape
+BUFFERS = (
+    ("actions", np.int64, ()),
+    ("obs", np.float32, (OBS_SIZE,)),
+    ("rewards", np.float32, ()),
+    ("dones", np.bool_, ()),
+    ("truncated", np.bool_, ()),
+    ("winners", np.int8, ()),
+    ("episode_ticks", np.int32, ()),
+    ("final_obs", np.float32, (OBS_SIZE,)),
+)
+
+
+def buffer_layout(num_envs):
+    """(offsets by name, total bytes) of the BUFFERS for num_envs, 8-byte aligned."""
+    offsets, size = {}, 0
+    for name, dtype, shape in BUFFERS:
+        offsets[name] = size
+        size += -(-num_envs * int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+    return offsets, max(size, 8)
+
+
+def buffer_views(buf, num_envs):
+    """NumPy arrays over buf, one per entry of BUFFERS."""
+    offsets, _ = buffer_layout(num_envs)
+    return {name: np.ndarray((num_envs,) + shape, dtype=dtype, buffer=buf, offset=offsets[name])
+            for name, dtype, shape in BUFFERS}
+
+
+class EnvShard:
+    """Matches lo..hi-1 of a batch, stepped in this process.
+
+    Reads its actions from and writes its results into the rows lo..hi-1 of
+    the batch's shared arrays (see BUFFERS).
+    """
+    def __init__(self, arrays, lo, hi, ship=None, opponent_ship=None, seed=None,
+                 frame_skip=1, max_ticks=60 * flox.FPS):
+        self.arrays = arrays
+        self.lo, self.hi = lo, hi
+        self.ship = ship
+        self.opponent_ship = opponent_ship
+        self.frame_skip = max(1, int(frame_skip))
+        self.max_ticks = max_ticks
+        self.rng = random.Random(seed)
+        self.ship_names = list(flox.SHIPS.keys())
+
+        self.matches = [flox.Match() for _ in range(hi - lo)]
+        self.bots = [None] * (hi - lo)
+        # health seen at the previous step, for damage-based rewards
+        self.last_health = [(0, 0)] * (hi - lo)
+
+    def _reset_one(self, i):
+        match = self.matches[i]
+        ship = self.ship or self.rng.choice(self.ship_names)
+        enemy = self.opponent_ship or self.rng.choice(self.ship_names)
+        match.new_match(ship, flox.DEFAULT_SHIP_COLORS.get(ship, flox.SHIP_COLORS[0]),
+                        enemy, flox.DEFAULT_SHIP_COLORS.get(enemy, flox.SHIP_COLORS[1]))
+        self.bots[i] = flox.SimpleBot(match.ship2, match.ship1, seed=self.rng.getrandbits(32))
+        self.last_health[i] = (match.ship1.health, match.ship2.health)
+        self._observe(i, self.arrays["obs"])
+
+    def reset(self):
+        for i in range(self.hi - self.lo):
+            self._reset_one(i)
+
+    def _observe(self, i, out):
+        match = self.matches[i]
+        me, enemy = match.ship1, match.ship2
+        w, h = float(flox.SCREEN_WIDTH), float(flox.SCREEN_HEIGHT)
+        row = [
+            me.x / w, me.y / h, me.health / me.max_health, me.bullets / me.max_bullets,
+            1.0 if me.charging else 0.0, me.charge_time / me.max_charge_time,
+            enemy.x / w, enemy.y / h, enemy.health / enemy.max_health,
+            enemy.bullets / enemy.max_bullets, 1.0 if enemy.charging else 0.0,
+        ]
+        # bullets fired by ship2 (side -1), including boomerangs on their way back
+        incoming = [b for b in match.bullets if b.side != 1]
+        if len(incoming) > NEAREST_BULLETS:
+            incoming = heapq.nsmallest(NEAREST_BULLETS, incoming,
+                                       key=lambda b: (b.x - me.x) ** 2 + (b.y - me.y) ** 2)
+        else:
+            incoming.sort(key=lambda b: (b.x - me.x) ** 2 + (b.y - me.y) ** 2)
+        for b in incoming:
+            row.extend(((b.x - me.x) / w, (b.y - me.y) / h, b.vx / w, 1.0))
+        row.extend([0.0] * (OBS_SIZE - len(row)))
+        out[self.lo + i] = row
+
+    def step(self):
+        """Advance every match of the shard by frame_skip ticks on its actions."""
+        a = self.arrays
+        lo, hi = self.lo, self.hi
+        a["rewards"][lo:hi] = 0.0
+        a["dones"][lo:hi] = False
+        a["truncated"][lo:hi] = False
+        a["winners"][lo:hi] = 0
+        for i, action in enumerate(a["actions"][lo:hi].tolist()):
+            match = self.matches[i]
+            me = match.ship1
+            controls = me.controls
+            keys = flox.KeyMap({
+                controls["up"]: bool(action & ACTION_UP),
+                controls["down"]: bool(action & ACTION_DOWN),
+                controls["left"]: bool(action & ACTION_LEFT),
+                controls["right"]: bool(action & ACTION_RIGHT),
+            })
+            fire = bool(action & ACTION_FIRE)
+            bot = self.bots[i]
+            for _ in range(self.frame_skip):
+                bot_keys, bot_fire = bot.think()
+                match.set_fire(me, fire)
+                match.set_fire(match.ship2, bot_fire)
+                match.step(keys, bot_keys)
+                if match.state != "playing" or match.tick >= self.max_ticks:
+                    break
+
+            health1, health2 = match.ship1.health, match.ship2.health
+            last1, last2 = self.last_health[i]
+            reward = (last2 - health2) - (last1 - health1)
+            self.last_health[i] = (health1, health2)
+
+            if match.state != "playing" or match.tick >= self.max_ticks:
+                dead1, dead2 = health1 <= 0, health2 <= 0
+                if dead2 and not dead1:
+                    a["winners"][lo + i] = 1
+                    reward += WIN_REWARD
+                elif dead1 and not dead2:
+                    a["winners"][lo + i] = 2
+                    reward -= WIN_REWARD
+                a["truncated"][lo + i] = match.state == "playing"
+                a["dones"][lo + i] = True
+                a["episode_ticks"][lo + i] = match.tick
+                self._observe(i, a["final_obs"])
+                self._reset_one(i)
+            else:
+                self._observe(i, a["obs"])
+            a["rewards"][lo + i] = reward
+
+
+def run_shard(shm_name, num_envs, lo, hi, options, conn):
+    """Worker process: step one EnvShard over the shared buffers on command.
+
+    conn delivers "reset" or "step" (answered with True once done); None stops.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shard = EnvShard(buffer_views(shm.buf, num_envs), lo, hi, **options)
+        while True:
+            command = conn.recv()
+            if command is None:
+                break
+            getattr(shard, command)()
+            conn.send(True)
+    finally:
+        shard = None  # release the array views before unmapping
+        shm.close()
+
+
+class FloxVecEnv:
+    """Batch of num_envs matches stepped together.
+
+    ship / opponent_ship pick the ship types; None draws a random ship for
+    every episode. frame_skip repeats each action for that many ticks (rewards
+    are summed), max_ticks truncates matches nobody is winning. num_workers > 0
+    splits the batch over that many worker processes; 0 steps it in-process.
+    """
+    def __init__(self, num_envs, ship=None, opponent_ship=None, seed=None,
+                 frame_skip=1, max_ticks=60 * flox.FPS, num_workers=0):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        for name in (ship, opponent_ship):
+            if name is not None and name not in flox.SHIPS:
+                raise ValueError(f"unknown ship {name!r}")
+        self.num_envs = num_envs
+        self.num_workers = num_workers = min(max(0, int(num_workers)), num_envs)
+        options = dict(ship=ship, opponent_ship=opponent_ship, frame_skip=frame_skip,
+                       max_ticks=max_ticks)
+        _, size = buffer_layout(num_envs)
+        self.shm = None
+        self.workers = []
+        if num_workers:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.arrays = buffer_views(self.shm.buf, num_envs)
+            rng = random.Random(seed)
+            # spawn: a fork would inherit whatever display/audio state the trainer has
+            ctx = multiprocessing.get_context("spawn")
+            for k in range(num_workers):
+                lo, hi = num_envs * k // num_workers, num_envs * (k + 1) // num_workers
+                conn, child = ctx.Pipe()
+                process = ctx.Process(target=run_shard, daemon=True,
+                                      args=(self.shm.name, num_envs, lo, hi,
+                                            dict(options, seed=rng.getrandbits(64)), child))
+                process.start()
+                self.workers.append((process, conn))
+            self.shards = []
+        else:
+            self.arrays = buffer_views(bytearray(size), num_envs)
+            self.shards = [EnvShard(self.arrays, 0, num_envs, seed=seed, **options)]
+        a = self.arrays
+        self.actions = a["actions"]
+        self.obs = a["obs"]
+        self.rewards = a["rewards"]
+        self.dones = a["dones"]
+        self.truncated = a["truncated"]
+        self.winners = a["winners"]
+        self.episode_ticks = a["episode_ticks"]
+        self.final_obs = a["final_obs"]
+
+    def _run(self, command):
+        for _, conn in self.workers:
+            conn.send(command)
+        for shard in self.shards:
+            getattr(shard, command)()
+        for _, conn in self.workers:
+            conn.recv()
+
+    def reset(self):
+        self._run("reset")
+        return self.obs
+
+    def step(self, actions):
+        """Advance every match by frame_skip ticks; returns (obs, rewards, dones, infos)."""
+        self.actions[:] = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+        self._run("step")
+        infos = {
+            "final_observation": self.final_obs,
+            "truncated": self.truncated,
+            # 1 agent won, 2 agent lost, 0 draw / still playing
+            "winner": self.winners,
+            "episode_ticks": self.episode_ticks,
+        }
+        return self.obs, self.rewards, self.dones, infos
+
+    def close(self):
+        """Stop the worker processes and free the shared buffers."""
+        for process, conn in self.workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+        if self.shm is not None:
+            self.arrays = self.actions = self.obs = self.rewards = self.dones = None
+            self.truncated = self.winners = self.episode_ticks = self.final_obs = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,369 @@
+"""Loopback network conditioner for benchmarking the LAN netcode on one box.
+
+Runs a frame-level proxy between a NetworkHost and a NetworkClient on
+127.0.0.1 that delays, jitters, reorders, drops and rate-limits messages,
+then plays a scripted client against a headless host through it and reports
+input latency and snapshot staleness:
+
+    python net_conditioner.py --profile wifi --seconds 10
+    python net_conditioner.py --script lan:5,bad_wifi:5,lan:5 --json net.json
+    python net_conditioner.py --proxy-only --profile bad_wifi --listen 50008 --target 50007
+
+The proxy conditions whole frames rather than TCP segments, so loss and
+reordering behave like a datagram link: a dropped input is recovered by the
+redundancy in later input packets, a dropped snapshot by the next one.
+--proxy-only just runs the proxy, for playing two real games through it.
+"""
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import select
+import socket
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import project_buzzkill as flox
+
+# One-way delay and jitter in ms, loss and reorder as per-frame chances,
+# bandwidth in kbit/s (0 = unlimited)
+LinkProfile = collections.namedtuple("LinkProfile", "delay jitter loss reorder bandwidth")
+
+PROFILES = {
+    "perfect": LinkProfile(0, 0, 0.0, 0.0, 0),
+    "lan": LinkProfile(1, 0.5, 0.0, 0.0, 0),
+    "wifi": LinkProfile(8, 6, 0.005, 0.005, 20000),
+    "bad_wifi": LinkProfile(30, 25, 0.03, 0.02, 2000),
+    "congested": LinkProfile(60, 40, 0.05, 0.05, 500),
+}
+
+# Extra delay given to a reordered frame so later ones overtake it
+REORDER_DELAY = 0.03
+
+
+def parse_script(text):
+    """Parse 'profile:seconds,profile:seconds' into [(seconds, LinkProfile)]."""
+    phases = []
+    for part in text.split(","):
+        name, _, seconds = part.strip().partition(":")
+        if name not in PROFILES:
+            raise ValueError(f"unknown profile {name!r}")
+        phases.append((float(seconds) if seconds else float("inf"), PROFILES[name]))
+    if not phases:
+        raise ValueError("empty script")
+    return phases
+
+
+class LinkStats:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.reordered = 0
+
+    def as_dict(self):
+        return {"frames": self.frames, "bytes": self.bytes,
+                "dropped": self.dropped, "reordered": self.reordered}
+
+
+class ConditionedLink(threading.Thread):
+    """Forwards frames from src to dst, one direction, under the scripted profile."""
+    def __init__(self, src, dst, schedule, rng, stats, started):
+        super().__init__(daemon=True)
+        self.src = src
+        self.dst = dst
+        self.schedule = schedule
+        self.rng = rng
+        self.stats = stats
+        self.started = started
+        self.reader = flox.FrameReader()
+        self.queue = []  # heap of (deliver_at, seq, frame bytes)
+        self.seq = 0
+        self.last_deliver = 0.0  # keeps unreordered frames in order despite jitter
+        self.link_free = 0.0  # when the bandwidth cap allows the next frame out
+        self.running = True
+
+    def profile(self, now):
+        elapsed = now - self.started
+        for seconds, profile in self.schedule:
+            if elapsed < seconds:
+                return profile
+            elapsed -= seconds
+        return self.schedule[-1][1]
+
+    def admit(self, frame, now):
+        p = self.profile(now)
+        self.stats.frames += 1
+        if p.loss and self.rng.random() < p.loss:
+            self.stats.dropped += 1
+            return
+        deliver = now + (p.delay + self.rng.uniform(-p.jitter, p.jitter)) / 1000.0
+        if p.bandwidth:
+            self.link_free = max(self.link_free, now) + len(frame) * 8 / (p.bandwidth * 1000.0)
+            deliver = max(deliver, self.link_free)
+        if p.reorder and self.rng.random() < p.reorder:
+            deliver += REORDER_DELAY
+            self.stats.reordered += 1
+        else:
+            deliver = max(deliver, self.last_deliver)
+            self.last_deliver = deliver
+        self.seq += 1
+        heapq.heappush(self.queue, (deliver, self.seq, frame))
+
+    def run(self):
+        try:
+            while self.running:
+                now = time.perf_counter()
+                while self.queue and self.queue[0][0] <= now:
+                    frame = heapq.heappop(self.queue)[2]
+                    self.dst.sendall(frame)
+                    self.stats.bytes += len(frame)
+                wait = min(0.05, self.queue[0][0] - now) if self.queue else 0.05
+                readable, _, _ = select.select([self.src], [], [], max(0.0, wait))
+                if not readable:
+                    continue
+                if not self.reader.recv(self.src):
+                    break
+                now = time.perf_counter()
+                for frame in self.reader.frames():
+                    self.admit(flox.FRAME_HEADER.pack(len(frame)) + bytes(frame), now)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.running = False
+            for sock in (self.src, self.dst):
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+
+class NetConditioner(threading.Thread):
+    """Proxy accepting clients on listen_port and relaying them to target_port."""
+    def __init__(self, listen_port, target_port, schedule, seed=0):
+        super().__init__(daemon=True)
+        self.target_port = target_port
+        self.schedule = schedule
+        self.rng = random.Random(seed)
+        self.upstream = LinkStats()  # client -> host
+        self.downstream = LinkStats()  # host -> client
+        self.links = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", listen_port))
+        self.sock.listen(1)
+        self.sock.settimeout(0.5)
+        self.started = time.perf_counter()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            try:
+                client, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                host = socket.create_connection(("127.0.0.1", self.target_port), timeout=5.0)
+            except OSError:
+                client.close()
+                continue
+            for sock in (client, host):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.settimeout(None)
+            self.links = [
+                ConditionedLink(client, host, self.schedule, random.Random(self.rng.random()),
+                                self.upstream, self.started),
+                ConditionedLink(host, client, self.schedule, random.Random(self.rng.random()),
+                                self.downstream, self.started),
+            ]
+            for link in self.links:
+                link.start()
+
+    def stop(self):
+        self.running = False
+        for link in self.links:
+            link.running = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class BenchHost(flox.Game):
+    """Headless host whose snapshots carry the time they were taken."""
+    def snapshot_state(self, snapshot=None):
+        state = super().snapshot_state(snapshot)
+        state["sent_at"] = time.perf_counter()
+        return state
+
+
+class BenchClientView:
+    """Stands in for the client Game: records every snapshot the client receives."""
+    def __init__(self):
+        self.snapshots = []  # (arrival, state)
+        self.connect_status = None
+        self.connect_error = None
+
+    @property
+    def remote_state_target(self):
+        return self.snapshots[-1][1] if self.snapshots else None
+
+    @remote_state_target.setter
+    def remote_state_target(self, state):
+        self.snapshots.append((time.perf_counter(), state))
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]
+    return {"count": len(values), "mean_ms": 1000 * sum(values) / len(values),
+            "p50_ms": 1000 * pick(0.5), "p95_ms": 1000 * pick(0.95), "max_ms": 1000 * values[-1]}
+
+
+def input_latencies(changes, snapshots):
+    """Time from each steering change to the first snapshot showing ship2 turn that way."""
+    latencies = []
+    i = 1
+    for changed_at, direction in changes:
+        while i < len(snapshots) and snapshots[i][0] < changed_at:
+            i += 1
+        for j in range(max(i, 1), len(snapshots)):
+            prev = snapshots[j - 1][1].get("ship2", {}).get("x")
+            cur = snapshots[j][1].get("ship2", {}).get("x")
+            if prev is not None and cur is not None and (cur - prev) * direction > 0 \
+                    and snapshots[j][1]["sent_at"] > changed_at:
+                latencies.append(snapshots[j][0] - changed_at)
+                break
+    return latencies
+
+
+def bench(schedule, seconds, port, seed, flip_every):
+    """Play a scripted client against a headless host through the conditioner."""
+    import pygame
+
+    pygame.init()
+    host = BenchHost()
+    host.start_game()
+    host.start_host(port)
+    proxy = NetConditioner(port + 1, port, schedule, seed)
+    proxy.start()
+    view = BenchClientView()
+    client = flox.NetworkClient(view, "127.0.0.1", port + 1)
+
+    rng = random.Random(seed)
+    changes = []  # (time, direction) of each steering change
+    ages = []  # age of the newest snapshot, sampled every tick as a renderer would
+    direction = 1
+    flip_at = 0.0
+    tick = 1.0 / flox.FPS
+    deadline = None
+    next_tick = time.perf_counter()
+    while True:
+        now = time.perf_counter()
+        if deadline is None and view.snapshots:
+            deadline = now + seconds
+            proxy.started = now
+        if deadline is not None and now >= deadline:
+            break
+        if deadline is None and now - next_tick > 10.0:
+            raise RuntimeError("client never received a snapshot")
+        if deadline is not None and now >= flip_at:
+            direction = -direction
+            changes.append((now, direction))
+            flip_at = now + flip_every * rng.uniform(0.5, 1.5)
+        client.record_input(flox.INPUT_LEFT if direction < 0 else flox.INPUT_RIGHT)
+        pygame.event.pump()
+        host.update()
+        if deadline is not None and view.snapshots:
+            ages.append(now - view.snapshots[-1][1]["sent_at"])
+        next_tick += tick
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    client.running = False
+    client.should_reconnect = False
+    proxy.stop()
+    host.stop_network()
+    pygame.quit()
+
+    snapshots = [s for s in view.snapshots if changes and s[0] >= changes[0][0]]
+    arrivals = [s[0] for s in snapshots]
+    return {
+        "seconds": seconds,
+        "input_latency": percentiles(input_latencies(changes, snapshots)),
+        "snapshot_transit": percentiles([a - s["sent_at"] for a, s in snapshots]),
+        "snapshot_age": percentiles(ages),
+        "snapshot_gap": percentiles([b - a for a, b in zip(arrivals, arrivals[1:])]),
+        "upstream": proxy.upstream.as_dict(),
+        "downstream": proxy.downstream.as_dict(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LAN netcode through a conditioned link.")
+    parser.add_argument("--profile", default="wifi", choices=sorted(PROFILES),
+                        help="link profile for the whole run")
+    parser.add_argument("--script", default="",
+                        help="profile:seconds,... phases instead of --profile (last one holds)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measured run length")
+    parser.add_argument("--port", type=int, default=50017, help="host port; the proxy uses port+1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--flip-every", type=float, default=0.3,
+                        help="mean seconds between the scripted client's steering changes")
+    parser.add_argument("--json", default="", help="also write the report to this file")
+    parser.add_argument("--proxy-only", action="store_true",
+                        help="only run the proxy from --listen to --target until interrupted")
+    parser.add_argument("--listen", type=int, default=50008)
+    parser.add_argument("--target", type=int, default=50007)
+    args = parser.parse_args(argv)
+
+    try:
+        schedule = parse_script(args.script) if args.script else [(float("inf"), PROFILES[args.profile])]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.proxy_only:
+        proxy = NetConditioner(args.listen, args.target, schedule, args.seed)
+        proxy.start()
+        print(f"conditioning 127.0.0.1:{args.listen} -> 127.0.0.1:{args.target}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            proxy.stop()
+        print(json.dumps({"upstream": proxy.upstream.as_dict(),
+                          "downstream": proxy.downstream.as_dict()}, indent=2))
+        return 0
+
+    report = bench(schedule, args.seconds, args.port, args.seed, args.flip_every)
+    report["script"] = args.script or args.profile
+    print(f"{'metric':<18} {'count':>6} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for key in ("input_latency", "snapshot_transit", "snapshot_age", "snapshot_gap"):
+        r = report[key]
+        if r["count"]:
+            print(f"{key:<18} {r['count']:>6} {r['mean_ms']:>8.1f} {r['p50_ms']:>8.1f} "
+                  f"{r['p95_ms']:>8.1f} {r['max_ms']:>8.1f}")
+        else:
+            print(f"{key:<18} {0:>6}")
+    for key in ("upstream", "downstream"):
+        r = report[key]
+        print(f"{key}: {r['frames']} frames, {r['bytes']} bytes, "
+              f"{r['dropped']} dropped, {r['reordered']} reordered")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,18 @@
 # prepare_release.ps1
-# Copies the main Python file and available asset folders into this 2D-Flox folder
+# Copies the game package and available asset folders into this 2D-Flox folder
 # Run this from the 2D-Flox folder in PowerShell.
 
 $root = Join-Path -Path $PSScriptRoot -ChildPath ".."
 $root = (Resolve-Path $root).Path
-$src_main = Join-Path -Path $root -ChildPath "project_buzzkill.py"
-$dest_main = Join-Path -Path $PSScriptRoot -ChildPath "project_buzzkill.py"
+$src_pkg = Join-Path -Path $root -ChildPath "project_buzzkill"
+$dest_pkg = Join-Path -Path $PSScriptRoot -ChildPath "project_buzzkill"
 
-if (Test-Path $src_main) {
-    Copy-Item -Path $src_main -Destination $dest_main -Force
-    Write-Host "Copied main script to 2D-Flox: project_buzzkill.py"
+if (Test-Path $src_pkg) {
+    if (-not (Test-Path $dest_pkg)) { New-Item -ItemType Directory -Path $dest_pkg | Out-Null }
+    Get-ChildItem -Path $src_pkg -Filter *.py -File | ForEach-Object { Copy-Item -Path $_.FullName -Destination (Join-Path $dest_pkg $_.Name) -Force }
+    Write-Host "Copied game package to 2D-Flox: project_buzzkill/"
 } else {
-    Write-Host "Main script not found at: $src_main"
+    Write-Host "Game package not found at: $src_pkg"
 }
 
 # Ensure assets folder exists
@@ -0,0 +1,99 @@
+"""2D-Flox, split into subsystems that are only imported when first used.
+
+    core       simulation: constants, SHIPS, Ship/Bullet/Particle, Match, SimpleBot
+    assets     asset folder lookup
+    net        LAN host/client, message framing and input packets
+    simworker  optional simulation worker process
+    audio      sound effects, loaded once the mixer is up
+    render     sprites, entity drawing, quality governor, texture renderer
+    game       the windowed Game: menus, settings and the main loop
+
+Importing the package loads none of them. Each public name is looked up in a
+table of the submodules' ``__all__``, so ``project_buzzkill.Match`` loads just
+the core, without pygame, ``project_buzzkill.Game`` brings in everything and
+an unknown name raises AttributeError without importing anything.
+"""
+import importlib
+
+# Cheapest first: everything before audio runs without pygame
+SUBMODULES = ("core", "assets", "net", "simworker", "audio", "render", "game")
+
+# Each submodule's __all__, kept here so a lookup need not import them to find a name;
+# tests/test_package.py fails when the two drift apart
+EXPORTS = {
+    "core": (
+        "SCREEN_WIDTH", "SCREEN_HEIGHT", "ARENA_SIZE", "FPS", "TICK_TIME", "RENDER_FPS",
+        "MAX_FRAME_TIME", "MAX_TICKS_PER_FRAME", "BACKGROUND_COLOR", "FONT_COLOR", "BORDER_COLOR",
+        "HIGHLIGHT_COLOR", "GAME_VERSION", "SHIP_OUTLINE_COLOR", "BULLET_COLOR", "SHIP_SIZE",
+        "BULLET_SIZE", "UNFIRED_BULLET_COLOR", "SHIP_COLORS", "DEFAULT_SHIP_COLORS", "damage_color",
+        "SOUND_SINK", "play_sound", "P1_CONTROLS", "P2_CONTROLS", "P3_CONTROLS", "P4_CONTROLS",
+        "CONTROLS", "MATCH_MODES", "MAX_SHIPS", "MAX_CHARGE_TIME", "MINE_EXPLOSION_TIME",
+        "CHARGED_MINE_EXPLOSION_TIME", "BULLET_OFFSET", "BULLET_SPACING",
+        "GLOBAL_BULLET_SPEED_MULT", "SHIPS", "MOVE_LINEAR", "MOVE_BOOMERANG", "MOVE_BEAM",
+        "MOVE_MINE", "MOVEMENT_IDS", "BULLET_SHAPES", "PATTERN_LAYOUTS", "WeaponPattern",
+        "ShipSpec", "SHIP_SPECS", "SHIP_SPEC_LIST", "compile_pattern", "compile_ships", "side_zone",
+        "Ship", "MOVE_KERNELS", "segment_hits_box", "boxes_overlap", "swept_hit", "GRID_CELL",
+        "SpatialGrid", "Bullet", "Particle", "KeyMap", "ShipSnapshot", "BulletSnapshot",
+        "WorldSnapshot", "Match", "SimpleBot",
+    ),
+    "assets": (
+        "ROOT_DIR", "LOCAL_ASSETS_DIR", "FLOX_ASSETS_DIR", "DUAL_ASSETS_DIR",
+        "BACKGROUND_CANDIDATES", "assets_dir", "asset_paths", "find_asset", "background_image_path",
+    ),
+    "net": (
+        "SNAPSHOT_INTERVAL", "SEND_QUEUE_MAX_BYTES", "FRAME_HEADER", "MAX_FRAME_SIZE", "INPUT_UP",
+        "INPUT_DOWN", "INPUT_LEFT", "INPUT_RIGHT", "INPUT_FIRE", "INPUT_REDUNDANCY",
+        "INPUT_HEARTBEAT", "INPUT_POLL", "PING_INTERVAL", "NET_STATS_SAMPLES", "CLOCK_SAMPLES",
+        "CLOCK_STEP", "CLOCK_MAX_SLEW", "encode_frame", "encode_message", "pack_input",
+        "input_keymap", "decode_message", "FrameReader", "NetStats", "ClockSync", "SendQueue",
+        "HostClient", "NetworkHost", "NetworkClient",
+    ),
+    "simworker": (
+        "SIM_RING_SLOTS", "SIM_MAX_BULLETS", "SIM_MAX_PARTICLES", "SIM_SOUND_BYTES",
+        "SIM_SYNC_WAIT", "SIM_RING_HEADER", "SIM_SLOT_HEADER", "SIM_SHIP", "SIM_SHIPS_SIZE",
+        "SIM_BULLET", "SIM_PARTICLE", "SIM_SLOT_SIZE", "SIM_STATES", "WorldRing", "run_simulation",
+        "SimulationProcess",
+    ),
+    "audio": (
+        "SOUND_FILES", "SOUNDS", "sfx_volume", "CHANNEL_GROUPS", "VOICE_RULES",
+        "DEFAULT_VOICE_RULE", "sound_path", "safe_load_sound", "load_sounds", "set_sfx_volume",
+        "VoiceManager", "VOICES", "play_sound", "flush",
+    ),
+    "render": (
+        "SPRITE_CACHE", "load_image", "tint_image", "tint_images", "SCALED_CACHE", "scaled_image",
+        "SHIP_SHAPE_ASSET", "SHIP_TYPE_ASSET", "get_ship_sprite", "ship_asset", "warm_ship_colors",
+        "BULLET_SPRITE_MAP", "get_bullet_sprite", "warm_bullet_sprites", "view_scale",
+        "build_background", "parse_resolution", "interpolate_pos", "CAMERA_EASE", "Camera",
+        "ship_extent", "bullet_extent", "particle_extent", "LAYER_SHIPS", "LAYER_BULLETS",
+        "LAYER_PARTICLES", "LAYER_COUNT", "DrawList", "MARK_CACHE", "health_bar", "ship_block",
+        "direction_mark", "PARTICLE_CACHE", "PARTICLE_CACHE_LIMIT", "particle_image", "draw_ship",
+        "SHAPE_CACHE", "SHAPE_CACHE_LIMIT", "cached_shape", "circle_image", "BEAM_CACHE",
+        "DRAW_KERNELS", "draw_bullet", "draw_particle", "QUALITY_LEVELS", "QualityGovernor",
+        "TextureRenderer",
+    ),
+    "game": (
+        "FULLSCREEN", "HELP_BG_COLOR", "HELP_TEXT_COLOR", "SETTINGS_BG_COLOR",
+        "SETTINGS_TEXT_COLOR", "SETTINGS_BAR_BG", "SETTINGS_BAR_FG", "SETTINGS_HIGHLIGHT",
+        "DEFAULT_SETTINGS", "TouchController", "Game",
+    ),
+}
+
+# Public name -> submodule; where two export a name the cheapest one wins
+NAMES = {}
+for _sub in reversed(SUBMODULES):
+    NAMES.update(dict.fromkeys(EXPORTS[_sub], _sub))
+del _sub
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in NAMES:
+        module = importlib.import_module(f"{__name__}.{NAMES[name]}")
+        # Not cached here, so rebinding a module global (core.SOUND_SINK) shows through
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(NAMES))
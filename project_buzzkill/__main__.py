@@ -0,0 +1,5 @@
+"""python -m project_buzzkill starts the game with default options (see 2D-Flox.py)."""
+
+if __name__ == "__main__":
+    from .game import Game  # not at import: spawned workers re-run this module
+    Game().run()
@@ -0,0 +1,61 @@
+"""Asset locations. The directories are probed on first use, not at import."""
+import os
+
+__all__ = [
+    "ROOT_DIR", "LOCAL_ASSETS_DIR", "FLOX_ASSETS_DIR", "DUAL_ASSETS_DIR", "BACKGROUND_CANDIDATES",
+    "assets_dir", "asset_paths", "find_asset", "background_image_path"
+]
+
+# Folder holding the package, the launcher and the asset folders
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Default assets dir (local)
+LOCAL_ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+# Project-specific packaged assets for the new port
+FLOX_ASSETS_DIR = os.path.join(ROOT_DIR, "2d_flox", "assets")
+# Extracted APK assets (user provided)
+DUAL_ASSETS_DIR = os.path.join(ROOT_DIR, "dual", "assets")
+
+# If extracted APK assets exist, prefer a background pattern from them
+BACKGROUND_CANDIDATES = ("BackgroundPattern11.png", "BackgroundPattern.png", "WIFI_Background.png")
+
+_resolved = {}
+
+
+def assets_dir():
+    """ASSETS_DIR in order of preference: packaged FLOX assets -> extracted dual assets -> local assets."""
+    if "assets_dir" not in _resolved:
+        if os.path.exists(FLOX_ASSETS_DIR):
+            _resolved["assets_dir"] = FLOX_ASSETS_DIR
+        elif os.path.exists(DUAL_ASSETS_DIR):
+            _resolved["assets_dir"] = DUAL_ASSETS_DIR
+        else:
+            _resolved["assets_dir"] = LOCAL_ASSETS_DIR
+    return _resolved["assets_dir"]
+
+
+def asset_paths(filename):
+    """Existing copies of filename: the dual assets first, then ASSETS_DIR."""
+    paths = []
+    for folder in (DUAL_ASSETS_DIR, assets_dir()):
+        path = os.path.join(folder, filename)
+        if path not in paths and os.path.exists(path):
+            paths.append(path)
+    return paths
+
+
+def find_asset(filename):
+    """Path of filename in the asset folders, or None."""
+    paths = asset_paths(filename)
+    return paths[0] if paths else None
+
+
+def background_image_path():
+    """Tiled arena background from the extracted APK assets, or None."""
+    if "background" not in _resolved:
+        _resolved["background"] = None
+        for name in BACKGROUND_CANDIDATES:
+            path = os.path.join(DUAL_ASSETS_DIR, name)
+            if os.path.exists(path):
+                _resolved["background"] = path
+                break
+    return _resolved["background"]
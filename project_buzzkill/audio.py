@@ -0,0 +1,225 @@
+"""Sound effects, loaded on first use once the mixer is up (never at import)."""
+import pygame
+
+from . import assets
+
+__all__ = [
+    "SOUND_FILES", "SOUNDS", "sfx_volume", "CHANNEL_GROUPS", "VOICE_RULES", "DEFAULT_VOICE_RULE",
+    "sound_path", "safe_load_sound", "load_sounds", "set_sfx_volume", "VoiceManager", "VOICES",
+    "play_sound", "flush"
+]
+
+# Sound name -> file in the asset folders (closest matches in the APK assets)
+SOUND_FILES = {
+    # Global sounds
+    'menu_click': "sfxButtonPress2.ogg",
+    'background': "mzkDefendAmbient1.ogg",
+    'ship_explosion': "boomboom.ogg",
+
+    # Ship-specific sounds
+    'zaba_shoot': "shoot.ogg",
+    'zaba_hit': "hithh2.ogg",
+    'zaba_charge': "shoot_laser_repeat.ogg",
+
+    'rekin_shoot': "shoot2.ogg",
+    'rekin_hit': "hithh2.ogg",
+    'rekin_charge': "shoot_laser_repeat.ogg",
+
+    'osa_shoot': "shooti2.ogg",
+    'osa_hit': "hithh2.ogg",
+    'osa_charge': "shoot_laser_repeat.ogg",
+
+    'komar_shoot': "shooti4.ogg",
+    'komar_hit': "hithh2.ogg",
+    'komar_charge': "shoot_laser_repeat.ogg",
+    'komar_beam': "shoot_laser_repeat.ogg",
+
+    'kombuz_shoot': "shoot_i1.ogg",
+    'kombuz_hit': "hithh2.ogg",
+    'kombuz_charge': "shoot_i3.ogg",
+    'kombuz_mine_arm': "sfxScaleIn.ogg",
+    'kombuz_mine_explode': "boomboom.ogg",
+
+    # Gwiazdka ship sounds
+    'gwiazdka_shoot': "shoot_i4.ogg",
+    'gwiazdka_hit': "hithh2.ogg",
+    'gwiazdka_charge': "shoot_laser_repeat.ogg",
+    'gwiazdka_nova': "shoott2.ogg",
+
+    # Rift ship sounds
+    'rift_shoot': "shoott2.ogg",
+    'rift_hit': "hithh2.ogg",
+    'rift_charge': "shoot_laser_repeat.ogg",
+    'rift_sweep': "mzkSquareDuel1.ogg",
+
+    # Nexus ship sounds
+    'nexus_shoot': "shoot_i5.ogg",
+    'nexus_hit': "hithh2.ogg",
+    'nexus_charge': "shoot_laser_repeat.ogg",
+    'nexus_cross': "mzkCircleDuel1.ogg"
+}
+
+# name -> pygame.mixer.Sound (None if missing); empty until load_sounds() runs
+SOUNDS = {}
+sfx_volume = None  # applied to every sound as it is loaded
+
+# Mixer channels per group. Each group only plays on its own channels, so a
+# storm of shots can never take the channels explosions and the menu need.
+CHANNEL_GROUPS = (("ui", 1), ("critical", 3), ("sfx", 12))
+# Generic sound name -> (group, max voices of one clip, priority); higher
+# priority steals channels from lower when a group is full
+VOICE_RULES = {
+    'menu_click': ("ui", 1, 3),
+    'ship_explosion': ("critical", 2, 3),
+    'mine_explode': ("critical", 2, 2),
+    'hit': ("sfx", 2, 2),
+    'shoot': ("sfx", 3, 1),
+    'charge': ("sfx", 2, 1),
+    'mine_arm': ("sfx", 1, 1),
+}
+DEFAULT_VOICE_RULE = ("sfx", 2, 1)
+
+
+def sound_path(name):
+    """Path of a named sound in the asset folders, or None."""
+    filename = SOUND_FILES.get(name)
+    return assets.find_asset(filename) if filename else None
+
+
+def safe_load_sound(path):
+    if not path:
+        return None
+    try:
+        sound = pygame.mixer.Sound(path)
+        if sfx_volume is not None:
+            sound.set_volume(sfx_volume)
+        return sound
+    except Exception:
+        return None
+
+
+def load_sounds():
+    """Load every sound once the mixer is initialised; until then SOUNDS stays empty."""
+    if not SOUNDS and pygame.mixer.get_init():
+        SOUNDS.update((name, safe_load_sound(sound_path(name))) for name in SOUND_FILES)
+    return SOUNDS
+
+
+def set_sfx_volume(volume):
+    global sfx_volume
+    sfx_volume = volume
+    for sound in SOUNDS.values():
+        if sound:
+            sound.set_volume(volume)
+
+
+class VoiceManager:
+    """Starts sounds on reserved channel groups with per-clip voice limits.
+
+    request() only queues: repeats of a clip before the next flush() collapse
+    into one voice (a Rekin double tap or three hits of one Kombuz blast are a
+    single sound). flush() starts the queue highest priority first. A clip
+    already at its voice limit restarts its oldest voice; a full group steals
+    its lowest-priority, oldest voice if that is no more important than the
+    newcomer, and drops the newcomer otherwise.
+    """
+    def __init__(self, groups=CHANNEL_GROUPS):
+        self.group_sizes = groups
+        self.groups = {}  # group -> [channel ids]
+        self.channels = []  # pygame.mixer.Channel per id
+        self.voices = {}  # channel id -> (clip, priority, serial)
+        self.pending = {}  # clip -> (sound, group, limit, priority)
+        self.serial = 0
+        self.counts = {"played": 0, "collapsed": 0, "stolen": 0, "dropped": 0}
+
+    def setup(self):
+        """Claim the group channels once the mixer is up; False until then."""
+        if not pygame.mixer.get_init():
+            return False
+        total = sum(size for _, size in self.group_sizes)
+        if len(self.channels) == total and pygame.mixer.get_num_channels() >= total:
+            return True
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # Reserved channels are skipped by a plain Sound.play(), so nothing else lands on ours
+        pygame.mixer.set_reserved(total)
+        self.channels = [pygame.mixer.Channel(i) for i in range(total)]
+        self.groups = {}
+        first = 0
+        for name, size in self.group_sizes:
+            self.groups[name] = list(range(first, first + size))
+            first += size
+        self.voices = {}
+        return True
+
+    def request(self, clip, sound, rule):
+        if clip in self.pending:
+            self.counts["collapsed"] += 1
+            return
+        self.pending[clip] = (sound,) + tuple(rule)
+
+    def flush(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        if not self.setup():
+            return
+        for clip, (sound, group, limit, priority) in sorted(
+                pending.items(), key=lambda item: -item[1][3]):
+            self.start(clip, sound, group, limit, priority)
+
+    def start(self, clip, sound, group, limit, priority):
+        busy = []
+        free = None
+        for cid in self.groups.get(group) or self.groups["sfx"]:
+            if cid in self.voices and self.channels[cid].get_busy():
+                busy.append(cid)
+            elif free is None:
+                free = cid
+        same = [cid for cid in busy if self.voices[cid][0] == clip]
+        if len(same) >= limit:
+            target = min(same, key=lambda cid: self.voices[cid][2])
+        elif free is not None:
+            target = free
+        else:
+            victims = [cid for cid in busy if self.voices[cid][1] <= priority]
+            if not victims:
+                self.counts["dropped"] += 1
+                return
+            target = min(victims, key=lambda cid: self.voices[cid][1:])
+            self.counts["stolen"] += 1
+        try:
+            self.channels[target].play(sound)
+        except Exception:
+            return
+        self.serial += 1
+        self.voices[target] = (clip, priority, self.serial)
+        self.counts["played"] += 1
+
+    def stats(self):
+        active = sum(1 for cid in self.voices if self.channels[cid].get_busy()) if self.channels else 0
+        return dict(self.counts, active=active, pending=len(self.pending))
+
+
+VOICES = VoiceManager()
+
+
+def play_sound(sound_name, ship_type=None):
+    """Queue a sound by name, with optional ship-specific variant; see flush()"""
+    sounds = SOUNDS or load_sounds()
+    rule = VOICE_RULES.get(sound_name, DEFAULT_VOICE_RULE)
+    # If ship type is provided, try to play ship-specific sound first
+    if ship_type:
+        ship_sound_name = f"{ship_type.lower()}_{sound_name}"
+        if sounds.get(ship_sound_name):
+            VOICES.request(ship_sound_name, sounds[ship_sound_name], rule)
+            return
+
+    # Fall back to generic sound if ship-specific one not available
+    if sounds.get(sound_name):
+        VOICES.request(sound_name, sounds[sound_name], rule)
+
+
+def flush():
+    """Start the sounds queued since the last call; the game calls this once per frame."""
+    VOICES.flush()
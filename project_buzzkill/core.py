@@ -0,0 +1,1511 @@
+"""Simulation core: constants, the SHIPS table, ships, bullets and Match.
+
+Imports nothing from pygame, so headless tools (balance sweeps, bot training,
+the simulation worker) load it without a display, mixer or SDL at all.
+"""
+import collections
+import math
+import random
+import time
+
+__all__ = [
+    "SCREEN_WIDTH", "SCREEN_HEIGHT", "ARENA_SIZE", "FPS", "TICK_TIME", "RENDER_FPS",
+    "MAX_FRAME_TIME", "MAX_TICKS_PER_FRAME", "BACKGROUND_COLOR", "FONT_COLOR", "BORDER_COLOR",
+    "HIGHLIGHT_COLOR", "GAME_VERSION", "SHIP_OUTLINE_COLOR", "BULLET_COLOR", "SHIP_SIZE",
+    "BULLET_SIZE", "UNFIRED_BULLET_COLOR", "SHIP_COLORS", "DEFAULT_SHIP_COLORS", "damage_color",
+    "SOUND_SINK", "play_sound", "P1_CONTROLS", "P2_CONTROLS", "P3_CONTROLS", "P4_CONTROLS",
+    "CONTROLS", "MATCH_MODES", "MAX_SHIPS", "MAX_CHARGE_TIME", "MINE_EXPLOSION_TIME",
+    "CHARGED_MINE_EXPLOSION_TIME", "BULLET_OFFSET", "BULLET_SPACING", "GLOBAL_BULLET_SPEED_MULT",
+    "SHIPS", "MOVE_LINEAR", "MOVE_BOOMERANG", "MOVE_BEAM", "MOVE_MINE", "MOVEMENT_IDS",
+    "BULLET_SHAPES", "PATTERN_LAYOUTS", "WeaponPattern", "ShipSpec", "SHIP_SPECS", "SHIP_SPEC_LIST",
+    "compile_pattern", "compile_ships", "side_zone", "Ship", "MOVE_KERNELS", "segment_hits_box",
+    "boxes_overlap", "swept_hit", "GRID_CELL", "SpatialGrid", "Bullet", "Particle", "KeyMap",
+    "ShipSnapshot", "BulletSnapshot", "WorldSnapshot", "Match", "SimpleBot"
+]
+
+# Basic display / timing constants
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+# Default arena: exactly one screen. Larger arenas scroll under a camera.
+ARENA_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+FPS = 60  # simulation tick rate; all gameplay timers count these ticks
+
+# Fixed-timestep loop: the simulation advances in TICK_TIME steps while frames are
+# drawn as often as RENDER_FPS allows (0 = uncapped), interpolating between ticks.
+TICK_TIME = 1.0 / FPS
+RENDER_FPS = 240
+# Spiral-of-death guard: never simulate more than this much time per frame
+MAX_FRAME_TIME = 0.25
+MAX_TICKS_PER_FRAME = 5
+
+# Common colors
+BACKGROUND_COLOR = (10, 10, 20)
+FONT_COLOR = (220, 220, 220)
+BORDER_COLOR = (60, 60, 60)
+HIGHLIGHT_COLOR = (255, 215, 0)
+
+# Game metadata
+GAME_VERSION = "0.9"
+
+# Ship appearance
+SHIP_OUTLINE_COLOR = (255, 255, 255)
+BULLET_COLOR = (255, 255, 255)
+SHIP_SIZE = 40
+BULLET_SIZE = 6
+UNFIRED_BULLET_COLOR = (200, 200, 200)
+
+# Available colors
+SHIP_COLORS = [
+    (255, 165, 0),    # Orange
+    (255, 0, 0),      # Red
+    (0, 0, 255),      # Blue
+    (0, 255, 0),      # Green
+    (128, 0, 128),    # Purple
+    (255, 255, 0),    # Yellow
+    (173, 216, 230),  # Light Blue
+    (144, 238, 144),  # Light Green
+    (255, 20, 147),   # Deep Pink
+    (0, 191, 255),    # Deep Sky Blue
+    (255, 69, 0),     # Red-Orange
+    (138, 43, 226),   # Blue Violet
+    (50, 205, 50),    # Lime Green
+    (255, 140, 0),    # Dark Orange
+    (70, 130, 180),   # Steel Blue
+    (218, 112, 214),  # Orchid
+]
+
+# Default colors per ship
+DEFAULT_SHIP_COLORS = {
+    "Zaba": (50, 205, 50),      # lime green (frog-like)
+    "Rekin": (70, 130, 180),    # steel blue (shark-like)
+    "Komar": (138, 43, 226),    # blue violet (mosquito-like)
+    "Osa": (255, 165, 0),       # orange (wasp-like)
+    "Kombuz": (255, 69, 0),     # red-orange (explosion-themed)
+    "Gwiazdka": (0, 191, 255),  # deep sky blue (star-like)
+    "Rift": (255, 20, 147),     # deep pink (rift-like energy)
+    "Nexus": (218, 112, 214)    # orchid (energy cross)
+}
+
+def damage_color(color, health, max_health):
+    """Ship color darkened in proportion to remaining health (see Ship.take_damage)."""
+    health_ratio = health / max_health
+    return (
+        max(0, int(color[0] * health_ratio)),
+        max(0, int(color[1] * health_ratio)),
+        max(0, int(color[2] * health_ratio))
+    )
+
+# Where play_sound sends (sound_name, ship_type): None drops the sound (headless
+# matches), the game installs audio.play_sound and the simulation worker a list's append
+SOUND_SINK = None
+
+def play_sound(sound_name, ship_type=None):
+    """Route a sound event to SOUND_SINK, with optional ship-specific variant"""
+    if SOUND_SINK is not None:
+        SOUND_SINK(sound_name, ship_type)
+
+# Default controls per side. SDL2 keycodes, the values of pygame's K_w, K_UP and
+# friends, written out so the simulation does not need pygame to name them.
+P1_CONTROLS = {"up": 119, "down": 115, "left": 97, "right": 100, "fire": 32}  # WASD + space
+P2_CONTROLS = {"up": 1073741906, "down": 1073741905, "left": 1073741904,
+               "right": 1073741903, "fire": 13}  # arrows + return
+P3_CONTROLS = {"up": 105, "down": 107, "left": 106, "right": 108, "fire": 117}  # IJKL + U
+P4_CONTROLS = {"up": 1073741920, "down": 1073741917, "left": 1073741916,
+               "right": 1073741918, "fire": 1073741922}  # keypad 8456 + keypad 0
+CONTROLS = (P1_CONTROLS, P2_CONTROLS, P3_CONTROLS, P4_CONTROLS)
+
+# Match modes: one (team, is_left) pair per ship slot. Ships sharing a side
+# split it into horizontal lanes; the match ends when one team is left.
+MATCH_MODES = {
+    "1v1": ((0, True), (1, False)),
+    "2v2": ((0, True), (1, False), (0, True), (1, False)),
+    "ffa": ((0, True), (1, False), (2, True), (3, False)),
+}
+MAX_SHIPS = max(len(slots) for slots in MATCH_MODES.values())
+
+# Game mechanics
+MAX_CHARGE_TIME = 60
+MINE_EXPLOSION_TIME = 3 * FPS
+CHARGED_MINE_EXPLOSION_TIME = 4 * FPS
+BULLET_OFFSET = 20
+BULLET_SPACING = 8
+# Bullet speed multiplier to make bullets feel snappier
+GLOBAL_BULLET_SPEED_MULT = 1.5
+
+# Ship configurations - EVERYTHING IS CONFIGURABLE HERE
+SHIPS = {
+    "Zaba": {
+        # Core stats
+        "health": 7,
+        "bullets": 6,
+        "shape": "square",
+        
+        # Movement configuration
+        "speed": 3,
+        "acceleration": 0.5,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "square",
+        "bullet_size": 6,
+        "bullet_speed": 5,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 20,
+        
+        # Charge attack configuration
+        "charged_bullet_speed": 7,
+        "charged_bullet_size": 12,
+        "charged_damage_multiplier": 2,
+        "charge_rate": 1.0,  # Full charge in MAX_CHARGE_TIME frames
+        
+        # Sound configuration
+        "shoot_sound": "zaba_shoot",
+        "charge_sound": "zaba_charge",
+        "hit_sound": "zaba_hit",
+        
+        # Visual effects
+        "muzzle_flash_size": 4,
+        "muzzle_flash_count": 3,
+        "hit_particle_size": 3,
+        "hit_particle_count": 4,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 5,  # Frames between particles
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "linear",
+        "tap_pattern": {"layout": "column", "count": 1},
+        "charged_pattern": {"layout": "column", "count": 1,
+                            "particles": 6, "particle_lifetime": 20, "particle_size": 4},
+        
+        "description": "Square ship with charged block attack"
+    },
+    "Rekin": {
+        # Core stats
+        "health": 6,
+        "bullets": 6,
+        "shape": "triangle",
+        
+        # Movement configuration
+        "speed": 5,
+        "acceleration": 0.8,
+        "deceleration": 0.4,
+        
+        # Bullet configuration
+        "bullet_shape": "triangle",
+        "bullet_size": 5,
+        "bullet_speed": 6,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 25,
+        "bullet_spread": 8,  # Spacing for dual shot
+        
+        # Charge attack configuration
+        "charged_bullet_speed": 8,
+        "charged_bullet_size": 10,
+        "charged_damage_multiplier": 1.5,
+        "charge_rate": 1.2,  # Faster charge than other ships
+        "spread_angle": 15,  # Degrees between spread shots
+        
+        # Sound configuration
+        "shoot_sound": "rekin_shoot",
+        "charge_sound": "rekin_charge",
+        "hit_sound": "rekin_hit",
+        
+        # Visual effects
+        "muzzle_flash_size": 3,
+        "muzzle_flash_count": 4,
+        "hit_particle_size": 3,
+        "hit_particle_count": 5,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 4,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "linear",
+        "tap_cost": 2,  # Bullets consumed per tap
+        "tap_pattern": {"layout": "column", "count": 2, "spacing": 16,
+                        "particles": 1, "particle_lifetime": 10, "particle_size": 2},
+        "charged_pattern": {"layout": "column", "count": 3, "scale_with_charge": True, "spacing": 12,
+                            "particles": 4, "particle_lifetime": 15, "particle_size": 3},
+        
+        "description": "Fast triangular ship with triple shot"
+    },
+    "Osa": {
+        # Core stats
+        "health": 5,
+        "bullets": 16,
+        "shape": "circle",
+        
+        # Movement configuration
+        "speed": 4,
+        "acceleration": 0.6,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "circle",
+        "bullet_size": 4,
+        "bullet_speed": 7,
+        "bullet_damage": 0.5,  # Lower damage but rapid fire
+        "bullet_recharge_time": 15,
+        
+        # Charge attack configuration
+        "charged_bullet_speed": 12,
+        "charged_bullet_size": 8,
+        "charged_damage_multiplier": 1.5,
+        "charge_rate": 1.5,  # Fastest charge
+        "spread_count": 5,  # Number of bullets in spread
+        
+        # Sound configuration
+        "shoot_sound": "osa_shoot",
+        "charge_sound": "osa_charge",
+        "hit_sound": "osa_hit",
+        
+        # Visual effects
+        "muzzle_flash_size": 2,
+        "muzzle_flash_count": 2,
+        "hit_particle_size": 2,
+        "hit_particle_count": 3,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 3,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "linear",
+        "tap_pattern": {"layout": "column", "count": 1},
+        # Capped so a full charge does not turn into a clustered wall of bullets
+        "charged_pattern": {"layout": "column", "count": 7, "scale_with_charge": True, "spacing": 8,
+                            "particles": 2, "particle_lifetime": 10, "particle_size": 2},
+        
+        "description": "Rapid-fire circular ship"
+    },
+    "Komar": {
+        # Core stats
+        "health": 5,
+        "bullets": 4,
+        "shape": "kite",
+        
+        # Movement configuration
+        "speed": 4,
+        "acceleration": 0.5,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "line",
+        "bullet_size": 4,
+        "bullet_speed": 8,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 30,
+        "bullet_length": 30,  # Length of laser line
+        "side_line_length": 40,  # Length of side indicator lines
+        "front_line_width": 15,  # Width of front indicator line
+        
+        # Charge attack configuration (beam)
+        "charged_bullet_speed": 6,
+        "charged_beam_width": 8,
+        "charged_damage_multiplier": 2,
+        "charge_rate": 0.8,
+        "beam_fade_time": 15,  # Frames for beam to fade
+        "beam_damage_delay": 3,  # Frames between damage ticks
+        
+        # Sound configuration
+        "shoot_sound": "komar_shoot",
+        "charge_sound": "komar_charge",
+        "hit_sound": "komar_hit",
+        "beam_sound": "komar_beam",
+        
+        # Visual effects
+        "muzzle_flash_size": 6,
+        "muzzle_flash_count": 6,
+        "hit_particle_size": 4,
+        "hit_particle_count": 8,
+        "charge_particle_size": 3,
+        "charge_particle_rate": 6,
+        "beam_particle_rate": 2,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "linear",
+        "tap_pattern": {"layout": "column", "count": 1},
+        "charged_pattern": {"layout": "column", "count": 1, "movement": "beam",
+                            "particles": 6, "particle_lifetime": 30, "particle_size": 6},
+        
+        "description": "Laser-based kite ship"
+    },
+    "Kombuz": {
+        # Core stats
+        "health": 7,
+        "bullets": 6,
+        "shape": "hexagon",
+        
+        # Movement configuration
+        "speed": 3,
+        "acceleration": 0.4,
+        "deceleration": 0.2,
+        
+        # Mine configuration
+        "bullet_shape": "hexagon",
+        "bullet_size": 8,
+        "bullet_speed": 4,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 40,
+        "bullet_count": 4,  # Number of hexagonal bullets
+        
+        # Mine behavior
+        "mine_arm_time": 90,  # Frames before mine can explode (1.5 seconds)
+        "mine_pulse_rate": 8,  # Faster pulse rate
+        "mine_pulse_size": 12,  # Larger pulse outline
+        # Reasonable travel fraction so mines settle before crossing entire screen
+        "mine_travel_distance": 0.60,  # Goes into enemy territory (fraction of screen width)
+        "aim_outline_size": 16,  # Size of aiming outline
+        "aim_rotation_speed": 0.1,  # Speed of outline rotation
+        "mine_explosion_time": 30,  # Frames for explosion animation
+        
+        # Charge attack configuration (super mine)
+        "charged_bullet_speed": 5,
+        "charged_bullet_size": 12,
+        "charged_damage_multiplier": 2,
+        "charge_rate": 0.7,  # Slower charge
+        "charged_mine_arm_time": 120,  # 2 seconds
+        "charged_explosion_radius": 150,
+        "damage_falloff": 0.5,  # Damage reduction per distance unit
+        
+        # Sound configuration
+        "shoot_sound": "kombuz_shoot",
+        "charge_sound": "kombuz_charge",
+        "hit_sound": "kombuz_hit",
+        "mine_arm_sound": "kombuz_mine_arm",
+        "mine_explode_sound": "kombuz_mine_explode",
+        
+        # Visual effects
+        "muzzle_flash_size": 4,
+        "muzzle_flash_count": 3,
+        "hit_particle_size": 3,
+        "hit_particle_count": 6,
+        "charge_particle_size": 3,
+        "charge_particle_rate": 8,
+        "explosion_particle_count": 12,
+        "explosion_particle_speed": 5,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "mine",
+        "tap_pattern": {"layout": "column", "count": 1},
+        "charged_pattern": {"layout": "column", "count": 1},
+        
+        "description": "Hexagonal mine-layer ship"
+    },
+    
+    "Gwiazdka": {
+        # Core stats
+        "health": 6,
+        "bullets": 8,
+        "shape": "star",
+        
+        # Movement configuration
+        "speed": 4,
+        "acceleration": 0.6,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "star",
+        "bullet_size": 5,
+        "bullet_speed": 6,
+        "bullet_damage": 0.75,
+        "bullet_recharge_time": 25,
+        "scatter_angle": 30,  # Degree spread for scatter shot
+        
+        # Charge attack configuration (nova burst)
+        "charged_bullet_speed": 8,
+        "charged_bullet_size": 8,
+        "charged_damage_multiplier": 1.5,
+        "charge_rate": 1.0,
+        "nova_rays": 8,  # Number of bullets in charged nova burst
+        "nova_delay": 5,  # Frames between each ray in nova sequence
+        
+        # Sound configuration
+        "shoot_sound": "gwiazdka_shoot",
+        "charge_sound": "gwiazdka_charge",
+        "hit_sound": "gwiazdka_hit",
+        "nova_sound": "gwiazdka_nova",
+        
+        # Visual effects
+        "muzzle_flash_size": 4,
+        "muzzle_flash_count": 5,
+        "hit_particle_size": 3,
+        "hit_particle_count": 5,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 6,
+        "nova_particle_count": 16,
+        "nova_particle_speed": 4,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        # (string values refer to other keys of this ship, e.g. "scatter_angle")
+        "movement": "linear",
+        "tap_pattern": {"layout": "fan", "count": 3, "spread": "scatter_angle",
+                        "particles": 1, "particle_lifetime": 10, "particle_size": 2, "particle_offset": 10},
+        "charged_pattern": {"layout": "ring", "count": "nova_rays", "sound": "nova",
+                            "particles": 3, "particle_lifetime": 15, "particle_size": 3, "particle_offset": 10},
+        
+        "description": "Star ship with scatter shot and nova burst"
+    },
+    
+    "Rift": {
+        # Core stats
+        "health": 5,
+        "bullets": 8,
+        "shape": "boomerang",
+        
+        # Movement configuration
+        "speed": 4,
+        "acceleration": 0.6,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "boomerang",
+        "bullet_size": 8,
+        "bullet_speed": 6,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 25,
+        
+        # Charge attack configuration
+        "charged_bullet_speed": 8,
+        "charged_bullet_size": 12,
+        "charged_damage_multiplier": 1.5,
+        "charge_rate": 1.2,
+        "sweep_angle": 120,  # Degrees for charged sweep attack
+        
+        # Sound configuration
+        "shoot_sound": "rift_shoot",
+        "charge_sound": "rift_charge",
+        "hit_sound": "rift_hit",
+        "sweep_sound": "rift_sweep",
+        
+        # Visual effects
+        "muzzle_flash_size": 4,
+        "muzzle_flash_count": 4,
+        "hit_particle_size": 3,
+        "hit_particle_count": 5,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 6,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "boomerang",
+        "tap_pattern": {"layout": "column", "count": 3, "spacing": 15,
+                        "particles": 1, "particle_lifetime": 10, "particle_size": 2},
+        # Arc shots fly straight out and do not return
+        "charged_pattern": {"layout": "fan", "count": 5, "scale_with_charge": True, "spread": "sweep_angle",
+                            "movement": "linear", "sound": "sweep",
+                            "particles": 1, "particle_lifetime": 15, "particle_size": 3, "particle_offset": 10},
+        
+        "description": "Boomerang ship with returning projectiles",
+        
+        # Boomerang behavior
+        "return_distance": 300,  # Distance before boomerang returns
+        "return_speed": 4,      # Speed during return flight
+        "return_damage": 1.5    # Damage multiplier when hit during return
+    },
+    
+    "Nexus": {
+        # Core stats
+        "health": 6,
+        "bullets": 8,  # Increased to 8 bullets
+        "shape": "nexus",
+        
+        # Movement configuration
+        "speed": 4,
+        "acceleration": 0.5,
+        "deceleration": 0.3,
+        
+        # Bullet configuration
+        "bullet_shape": "diamond",  # Changed to diamond shape
+        "bullet_size": 6,
+        "bullet_speed": 6,
+        "bullet_damage": 1,
+        "bullet_recharge_time": 25,
+        "dual_shot_spacing": 20,  # Spacing between dual shots
+        "front_line_width": 15,  # Width of front indicator line
+        
+        # Charge attack configuration
+        "charged_bullet_speed": 7,
+        "charged_bullet_size": 10,
+        "charged_damage_multiplier": 2,
+        "charge_rate": 1.0,
+        "cross_pattern_size": 4,  # Number of bullets in cross pattern
+        "cross_pattern_spread": 30,  # Degrees between cross shots
+        
+        # Sound configuration
+        "shoot_sound": "nexus_shoot",
+        "charge_sound": "nexus_charge",
+        "hit_sound": "nexus_hit",
+        "cross_sound": "nexus_cross",
+        
+        # Visual effects
+        "muzzle_flash_size": 4,
+        "muzzle_flash_count": 4,
+        "hit_particle_size": 3,
+        "hit_particle_count": 5,
+        "charge_particle_size": 2,
+        "charge_particle_rate": 6,
+        
+        # Weapon patterns: what a tap / charged release emits (compiled by compile_ships)
+        "movement": "linear",
+        "tap_pattern": {"layout": "column", "count": 2, "spacing": "dual_shot_spacing"},
+        "charged_pattern": {"layout": "fan", "count": "cross_pattern_size", "angle_step": "cross_pattern_spread",
+                            "sound": "cross", "particles": 1, "particle_lifetime": 15, "particle_size": 3,
+                            "particle_offset": 10},
+        
+        "description": "X-shaped ship with cross-pattern attacks"
+    }
+}
+
+# ----------------- Compiled ship / weapon specs -----------------
+# SHIPS is the editable source of truth; compile_ships() turns it into
+# immutable specs so the per-shot and per-tick code never touches the dicts.
+
+# Bullet movement kernels, dispatched by integer id (see MOVE_KERNELS below)
+MOVE_LINEAR = 0     # straight line along the shot angle
+MOVE_BOOMERANG = 1  # flies out, turns around after return_distance
+MOVE_BEAM = 2       # static, hits on the first tick (Komar laser)
+MOVE_MINE = 3       # travels, settles in enemy territory, explodes on a timer
+MOVEMENT_IDS = {"linear": MOVE_LINEAR, "boomerang": MOVE_BOOMERANG,
+                "beam": MOVE_BEAM, "mine": MOVE_MINE}
+
+# Fallback vector shapes for fired bullets, indexed by ShipSpec.shape_id
+BULLET_SHAPES = ("circle", "square", "triangle", "line", "hexagon", "boomerang", "diamond", "star")
+
+PATTERN_LAYOUTS = ("column", "fan", "ring")
+
+# One emission pattern (tap or charged). emissions[n] holds the (dy, angle)
+# of every bullet when n bullets are fired.
+WeaponPattern = collections.namedtuple("WeaponPattern", [
+    "count", "scale_with_charge", "movement", "emissions", "sound",
+    "particles", "particle_lifetime", "particle_size", "particle_offset",
+])
+
+ShipSpec = collections.namedtuple("ShipSpec", [
+    "id", "name", "bullet_shape", "shape_id", "bullet_speed", "charged_bullet_speed",
+    "bullet_damage", "spawn_forward", "tap_cost", "movement",
+    "return_distance", "return_speed", "return_damage", "mine_travel_distance",
+    "tap", "charged",
+])
+
+# name -> ShipSpec, and the same specs indexed by ShipSpec.id
+SHIP_SPECS = {}
+SHIP_SPEC_LIST = []
+
+
+def _pattern_emissions(layout, n, spacing, spread):
+    """(dy, angle) for each of n bullets in a column / fan / ring layout."""
+    if layout == "column":
+        return tuple(((i - (n - 1) / 2.0) * spacing, 0.0) for i in range(n))
+    if layout == "fan":
+        if n == 1:
+            return ((0.0, 0.0),)
+        return tuple((0.0, -spread / 2.0 + spread * i / (n - 1)) for i in range(n))
+    return tuple((0.0, 2 * math.pi * i / n) for i in range(n))
+
+
+def compile_pattern(name, config, pattern, default_movement):
+    # String values refer to another key of the same ship ("spread": "sweep_angle")
+    def value(key, default=0):
+        v = pattern.get(key, default)
+        if isinstance(v, str):
+            if v not in config:
+                raise ValueError(f"{name}: pattern {key!r} refers to missing key {v!r}")
+            v = config[v]
+        return v
+
+    layout = pattern.get("layout", "column")
+    if layout not in PATTERN_LAYOUTS:
+        raise ValueError(f"{name}: unknown pattern layout {layout!r}")
+    movement = pattern.get("movement", default_movement)
+    if movement not in MOVEMENT_IDS:
+        raise ValueError(f"{name}: unknown movement {movement!r}")
+    count = max(1, int(value("count", 1)))
+    spacing = float(value("spacing", 0))
+    if "angle_step" in pattern:
+        spread = math.radians(value("angle_step")) * (count - 1)
+    else:
+        spread = math.radians(value("spread", 0))
+    # Scaled patterns fire fewer bullets on a short charge, so lay out every count
+    emissions = tuple(_pattern_emissions(layout, n, spacing, spread) if n else ()
+                      for n in range(count + 1))
+    return WeaponPattern(
+        count=count,
+        scale_with_charge=bool(pattern.get("scale_with_charge", False)),
+        movement=MOVEMENT_IDS[movement],
+        emissions=emissions,
+        sound=pattern.get("sound"),
+        particles=int(value("particles", 0)),
+        particle_lifetime=int(value("particle_lifetime", 20)),
+        particle_size=value("particle_size", 6),
+        particle_offset=float(value("particle_offset", 0)),
+    )
+
+
+def compile_ships(ships=None):
+    """(Re)build SHIP_SPECS from SHIPS; call again after editing SHIPS at runtime."""
+    ships = SHIPS if ships is None else ships
+    specs = []
+    for i, (name, config) in enumerate(ships.items()):
+        movement = config.get("movement", "linear")
+        if movement not in MOVEMENT_IDS:
+            raise ValueError(f"{name}: unknown movement {movement!r}")
+        bullet_shape = config.get("bullet_shape", "circle")
+        specs.append(ShipSpec(
+            id=i,
+            name=name,
+            bullet_shape=bullet_shape,
+            shape_id=BULLET_SHAPES.index(bullet_shape) if bullet_shape in BULLET_SHAPES else 0,
+            bullet_speed=config["bullet_speed"] * GLOBAL_BULLET_SPEED_MULT,
+            charged_bullet_speed=config["charged_bullet_speed"] * GLOBAL_BULLET_SPEED_MULT,
+            bullet_damage=config.get("bullet_damage", 1),
+            spawn_forward=config.get("spawn_forward", 15),
+            tap_cost=config.get("tap_cost", 1),
+            movement=MOVEMENT_IDS[movement],
+            return_distance=config.get("return_distance", 0),
+            return_speed=config.get("return_speed", 0),
+            return_damage=config.get("return_damage", 1),
+            mine_travel_distance=config.get("mine_travel_distance", 0),
+            tap=compile_pattern(name, config, config.get("tap_pattern", {}), movement),
+            charged=compile_pattern(name, config, config.get("charged_pattern", {}), movement),
+        ))
+    # Update in place so modules holding a reference see the new specs
+    SHIP_SPECS.clear()
+    SHIP_SPECS.update((spec.name, spec) for spec in specs)
+    SHIP_SPEC_LIST[:] = specs
+    return SHIP_SPECS
+
+
+compile_ships()
+
+def side_zone(is_left, lane=0, lanes=1, arena=ARENA_SIZE):
+    """Movement bounds (min_x, max_x, min_y, max_y) of a ship's lane on its side."""
+    width, height = arena
+    if is_left:
+        min_x, max_x = 50, width//2 - 50
+    else:
+        min_x, max_x = width//2 + 50, width - 50
+    top = height * lane // lanes
+    bottom = height * (lane + 1) // lanes
+    return min_x, max_x, top + 50, bottom - 50
+
+class Ship:
+    def __init__(self, x, y, ship_type, color, controls, is_left):
+        config = SHIPS[ship_type]
+        self.x = x
+        self.y = y
+        # position at the start of the current tick, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        self.type = ship_type
+        self.color = color
+        self.original_color = color
+        self.controls = controls
+        self.is_left = is_left
+        # slot in Match.ships, team and movement bounds; Match.new_team_match
+        # overrides them, a lone ship gets its whole half of the screen
+        self.index = 0 if is_left else 1
+        self.team = self.index
+        self.zone = side_zone(is_left)
+        self.width = SHIP_SIZE
+        self.height = SHIP_SIZE
+        self.speed = config["speed"]
+        self.health = config["health"]
+        self.max_health = config["health"]
+        self.bullets = config["bullets"]
+        self.max_bullets = config["bullets"]
+        self.bullet_shape = config["bullet_shape"]
+        self.shape = config["shape"]
+        self.bullet_speed = config["bullet_speed"]
+        self.charged_bullet_speed = config["charged_bullet_speed"]
+        self.bullet_cooldown = 0
+        self.bullet_recharge_time = config["bullet_recharge_time"]
+        self.charging = False
+        self.charge_time = 0
+        self.max_charge_time = MAX_CHARGE_TIME
+        self.charging_consumed = 0  # bullets consumed progressively while charging
+        self.fire_held = False  # level-driven fire state (remote input, bots)
+        self.bullets_visible = []
+        
+        self.update_bullet_positions()
+        # runtime refs
+        self.game = None
+        
+    def update_bullet_positions(self):
+        # Generalize bullet placement: place bullets symmetrically on left and right sides
+        # from the ship's perspective so they appear outside the hull and do not overlap.
+        self.bullets_visible = []
+        if self.bullets <= 0:
+            return
+        # split counts so extra bullet goes to the right side for visual balance
+        half = self.bullets // 2
+        left_count = half
+        right_count = self.bullets - half
+
+        # compute horizontal offsets allowing per-ship override
+        side_offset = getattr(self, 'bullet_side_offset', 0)
+        left_x = int(self.x - (self.width // 2) - BULLET_OFFSET - side_offset)
+        right_x = int(self.x + (self.width // 2) + BULLET_OFFSET + side_offset)
+
+        # Distribute bullets evenly along the ship height, but with a minimum spacing
+        def y_for(index, count):
+            if count <= 0:
+                return int(self.y)
+            padding = max(6, int(self.height * 0.15))
+            usable = max(1, self.height - padding * 2)
+            step = float(usable) / (count + 1)
+            return int(self.y - usable/2 + (index + 1) * step)
+
+        for i in range(left_count):
+            self.bullets_visible.append((left_x, y_for(i, left_count)))
+
+        for i in range(right_count):
+            self.bullets_visible.append((right_x, y_for(i, right_count)))
+    
+    def move(self, keys, ticks=1):
+        # ticks > 1 advances several ticks at once (coarse headless stepping)
+        self.prev_x = self.x
+        self.prev_y = self.y
+        # Knockback tilt decays per tick so it looks the same at any frame rate
+        for _ in range(ticks):
+            if getattr(self, 'tilt_timer', 0) <= 0:
+                break
+            self.tilt_timer -= 1
+            self.tilt = int(self.tilt * 0.85)
+            if abs(self.tilt) < 1:
+                self.tilt = 0
+
+        # Movement with boundary checking
+        step = self.speed * ticks
+        min_x, max_x, min_y, max_y = self.zone
+        if keys[self.controls["up"]] and self.y > min_y:
+            self.y = max(self.y - step, min_y - self.speed)
+        if keys[self.controls["down"]] and self.y < max_y:
+            self.y = min(self.y + step, max_y + self.speed)
+        if keys[self.controls["left"]] and self.x > min_x:
+            self.x = max(self.x - step, min_x - self.speed)
+        if keys[self.controls["right"]] and self.x < max_x:
+            self.x = min(self.x + step, max_x + self.speed)
+                
+        self.update_bullet_positions()
+        
+        # Bullet recharge with cooldown (do NOT recharge while actively charging)
+        for _ in range(ticks):
+            if hasattr(self, 'bullet_cooldown') and self.bullet_cooldown > 0:
+                self.bullet_cooldown -= 1
+            elif self.bullets < self.max_bullets and not getattr(self, 'charging', False):
+                self.bullets += 1
+                self.update_bullet_positions()
+                # reset cooldown using per-ship config
+                self.bullet_cooldown = getattr(self, 'bullet_recharge_time', 20)
+        # If charging, produce particles but DO NOT consume bullets while holding.
+        if self.charging:
+            if hasattr(self, 'game') and self.charge_time % 5 < ticks:  # Every 5 frames
+                charge_x = self.x + (self.width//2 if self.is_left else -self.width//2)
+                self.game.spawn_particle(charge_x, self.y, self.color, lifetime=8, size=2)
+    
+    def start_charging(self):
+        if self.bullets > 0 and not self.charging:
+            self.charging = True
+            self.charge_time = 0
+            # do not consume bullets while charging; compute on release
+            play_sound('charge', self.type)  # Ship-specific charge sound
+            
+            # Add charging start particle effect
+            if hasattr(self, 'game'):  # Need to pass game reference for particles
+                config = SHIPS[self.type]
+                particle_x = self.x + (self.width//2 if self.is_left else -self.width//2)
+                for _ in range(config['muzzle_flash_count']):
+                    self.game.spawn_particle(particle_x, self.y, self.color, lifetime=15, size=config['charge_particle_size'])
+    
+    def stop_charging(self):
+        if self.charging:
+            self.charging = False
+            # Compute bullets used based on charge_time proportion of max_charge_time
+            config = SHIPS[self.type]
+            max_bullets = getattr(self, 'max_bullets', self.bullets)
+            charge_ratio = min(1.0, self.charge_time / float(self.max_charge_time))
+            # At minimum use 1, at maximum use up to current bullets or ship's max
+            bullets_used = max(1, int(round(charge_ratio * max_bullets)))
+            bullets_used = min(bullets_used, self.bullets)
+            # consume bullets now
+            self.bullets -= bullets_used
+            self.update_bullet_positions()
+            return bullets_used
+        return 0
+    
+    def update_charge(self, ticks=1):
+        if self.charging and self.charge_time < self.max_charge_time:
+            self.charge_time = min(self.max_charge_time, self.charge_time + ticks)
+    
+    def shoot_single(self):
+        # Different ships consume a different number of bullets for a single tap
+        if self.bullets <= 0:
+            return 0
+        used = min(self.bullets, SHIP_SPECS[self.type].tap_cost)
+        self.bullets -= used
+        self.update_bullet_positions()
+        return used
+    
+    def get_box(self):
+        """Hull as a (left, top, right, bottom) box in whole pixels."""
+        left, top = int(self.x - self.width//2), int(self.y - self.height//2)
+        return left, top, left + int(self.width), top + int(self.height)
+
+    def take_damage(self):
+        self.health -= 1
+        self.color = damage_color(self.original_color, self.health, self.max_health)
+        return self.health <= 0
+    
+
+# ----------------- Bullet movement kernels -----------------
+# Each kernel handles one movement type; Bullet.move looks it up by
+# bullet.kernel. A kernel returns True when the bullet is finished.
+
+def _move_linear(b, ticks):
+    b.x += b.vx * ticks
+    b.y += b.vy * ticks
+    return False
+
+
+def _move_boomerang(b, ticks):
+    spec = b.spec
+    if not b.is_returning and b.distance_traveled > spec.return_distance:
+        b.is_returning = True
+        b.direction = -b.direction  # Reverse direction
+        b.vx = b.direction * spec.return_speed
+        b.vy = -b.vy
+        b.damage = b.base_damage * spec.return_damage
+        # Visual effect for return
+        if b.game is not None:
+            for _ in range(4):
+                b.game.spawn_particle(b.x, b.y, b.color, lifetime=10, size=4)
+    b.x += b.vx * ticks
+    b.y += b.vy * ticks
+    if not b.is_returning:
+        b.distance_traveled += b.speed * ticks
+    return False
+
+
+def _move_beam(b, ticks):
+    # Komar charged laser is an instant beam; it stays where it was fired
+    return False
+
+
+def _move_mine(b, ticks):
+    if not b.settled:
+        b.x += b.vx * ticks
+        b.y += b.vy * ticks
+    explosion_time = CHARGED_MINE_EXPLOSION_TIME if b.is_charged else MINE_EXPLOSION_TIME
+    if b.timer > explosion_time:
+        b.exploding = True
+        b.explosion_timer += min(ticks, b.timer - explosion_time)
+    if b.exploding and b.explosion_timer > FPS//2:
+        return True
+
+    # Mines settle when reaching desired distance into enemy territory
+    if not b.settled:
+        travel = b.spec.mine_travel_distance
+        if b.direction == 1:  # Moving right
+            settle_x = b.arena[0] * travel
+            settled = b.x > settle_x
+        else:  # Moving left
+            settle_x = b.arena[0] * (1 - travel)
+            settled = b.x < settle_x
+        if settled:
+            # Same resting spot whatever the step size
+            b.x = settle_x
+            b.settled = True
+            b.speed = 0
+            b.vx = b.vy = 0
+            play_sound('mine_arm', b.ship_type)  # Play arming sound
+    return False
+
+
+# Indexed by the MOVE_* ids
+MOVE_KERNELS = (_move_linear, _move_boomerang, _move_beam, _move_mine)
+
+
+def segment_hits_box(x0, y0, x1, y1, left, top, right, bottom):
+    """True if the segment (x0, y0)-(x1, y1) touches the box (slab test)."""
+    t0, t1 = 0.0, 1.0
+    for start, delta, lo, hi in ((x0, x1 - x0, left, right), (y0, y1 - y0, top, bottom)):
+        if delta == 0:
+            if start < lo or start > hi:
+                return False
+            continue
+        ta = (lo - start) / delta
+        tb = (hi - start) / delta
+        if ta > tb:
+            ta, tb = tb, ta
+        t0 = max(t0, ta)
+        t1 = min(t1, tb)
+        if t0 > t1:
+            return False
+    return True
+
+
+def boxes_overlap(a, b):
+    """True if two (left, top, right, bottom) boxes overlap, like Rect.colliderect."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def swept_hit(bullet, ship):
+    """Swept AABB test of a bullet against a ship over the last tick.
+
+    The bullet's box is swept from its previous to its current position,
+    relative to the ship's own movement, so fast bullets (or coarse steps)
+    cannot tunnel through a ship between two ticks.
+    """
+    # Minkowski sum: grow the ship box by the bullet's half size, sweep the bullet's center
+    half_w = (ship.width + bullet.width) / 2.0
+    half_h = (ship.height + bullet.height) / 2.0
+    # Relative motion: where the bullet started as seen from the ship's current position
+    x0 = bullet.prev_x + (ship.x - ship.prev_x)
+    y0 = bullet.prev_y + (ship.y - ship.prev_y)
+    x1, y1 = bullet.x, bullet.y
+    # Cheap reject first: most bullets are nowhere near the ship
+    if (x0 < ship.x - half_w and x1 < ship.x - half_w) or (x0 > ship.x + half_w and x1 > ship.x + half_w):
+        return False
+    if (y0 < ship.y - half_h and y1 < ship.y - half_h) or (y0 > ship.y + half_h and y1 > ship.y + half_h):
+        return False
+    return segment_hits_box(x0, y0, x1, y1,
+                            ship.x - half_w, ship.y - half_h, ship.x + half_w, ship.y + half_h)
+
+
+GRID_CELL = 128  # broad-phase cell size in pixels, about three ship widths
+
+
+class SpatialGrid:
+    """Uniform grid broad-phase over (left, top, right, bottom) boxes.
+
+    Items are bucketed into every cell their box touches, so a query only
+    looks at what lies near it and the cost follows entity density instead
+    of growing with ships x bullets.
+    """
+    def __init__(self, cell=GRID_CELL):
+        self.cell = cell
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item, left, top, right, bottom):
+        cell, cells = self.cell, self.cells
+        for cx in range(int(left // cell), int(right // cell) + 1):
+            for cy in range(int(top // cell), int(bottom // cell) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def query(self, left, top, right, bottom):
+        """Items in the cells the box touches, each once, in first-seen order."""
+        cell, cells = self.cell, self.cells
+        found = []
+        seen = set()
+        for cx in range(int(left // cell), int(right // cell) + 1):
+            for cy in range(int(top // cell), int(bottom // cell) + 1):
+                for item in cells.get((cx, cy), ()):
+                    if id(item) not in seen:
+                        seen.add(id(item))
+                        found.append(item)
+        return found
+
+
+class Bullet:
+    def __init__(self, x, y, direction, ship_type, is_charged=False, charge_level=1,
+                 angle=0.0, kernel=None):
+        spec = SHIP_SPECS[ship_type]
+        self.spec = spec
+        self.x = x
+        self.y = y
+        # position at the start of the current tick, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        self.direction = direction
+        # side that fired it (1 = left player); direction flips for boomerangs
+        self.side = direction
+        # index and team of the ship that fired it, set by Match.shoot_bullet
+        self.owner = None
+        self.team = None
+        self.ship_type = ship_type
+        self.color = None
+        self.game = None
+        self.arena = ARENA_SIZE  # (width, height) of the match it flies in, set by add_bullet
+        self.is_charged = is_charged
+        self.charge_level = charge_level
+        self.kernel = spec.movement if kernel is None else kernel
+        self.angle = angle
+        self.speed = spec.charged_bullet_speed if is_charged else spec.bullet_speed
+        # per-tick velocity, mirrored for right-side shots
+        self.vx = direction * self.speed * math.cos(angle)
+        self.vy = direction * self.speed * math.sin(angle)
+        self.base_damage = spec.bullet_damage
+        self.damage = spec.bullet_damage
+        self.timer = 0
+        
+        # Set size based on charge level
+        # Size scaling: charged bullets grow but capped to avoid massive bullets
+        base_size = BULLET_SIZE * 2
+        if is_charged:
+            extra = (charge_level - 1)
+            self.width = base_size + extra * BULLET_SIZE
+            self.height = base_size + extra * BULLET_SIZE
+            if spec.bullet_shape == "line":
+                # Komar beam is tall but cap it
+                self.height = min(200, base_size + extra * BULLET_SIZE * 4)
+        else:
+            self.width = base_size
+            self.height = base_size
+            if spec.bullet_shape == "line":
+                self.height = 30
+        
+        # boomerang state
+        self.distance_traveled = 0
+        self.is_returning = False
+        # mine state
+        self.exploding = False
+        self.explosion_timer = 0
+        # for mines: whether it has settled (stops moving) in enemy area
+        self.settled = False
+        # flag to ensure area damage (mine explosion, beam) is applied once
+        self.explosion_applied = False
+    
+    def move(self, ticks=1):
+        self.timer += ticks
+        if MOVE_KERNELS[self.kernel](self, ticks):
+            return True
+        width, height = self.arena
+        if self.x < -200 or self.x > width + 200 or self.y < -200 or self.y > height + 200:
+            return True
+        return False
+
+
+class Particle:
+    def __init__(self, x, y, color, lifetime=20, size=6):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.lifetime = lifetime
+        self.age = 0
+        self.size = size
+
+    def update(self, ticks=1):
+        self.age += ticks
+        return self.age >= self.lifetime
+
+
+class KeyMap:
+    """Key-state lookup over a {key: pressed} dict, a stand-in for
+    pygame.key.get_pressed() when input comes from the network or a bot."""
+    def __init__(self, mapping=None):
+        self.mapping = mapping or {}
+
+    def __getitem__(self, key):
+        return self.mapping.get(key, False)
+
+
+# Frozen view of the world that Match publishes at the end of every tick;
+# time is the time.perf_counter() it was taken at
+ShipSnapshot = collections.namedtuple("ShipSnapshot", "x y health bullets type color")
+BulletSnapshot = collections.namedtuple("BulletSnapshot", "x y w h ship_type is_charged owner")
+WorldSnapshot = collections.namedtuple("WorldSnapshot", "tick state ship1 ship2 bullets ships time")
+
+
+class Match:
+    """Headless match: ships in slot order, bullets, particles and the rules.
+
+    Needs no display, so tools (balance sweeps, bot training) can run it
+    directly; Game builds the windowed game on top of it.
+    """
+    player1_name = "Player 1"
+    player2_name = "Player 2"
+
+    def __init__(self):
+        self.state = "idle"
+        self.mode = "1v1"
+        self.arena = ARENA_SIZE  # (width, height) in world units, at least one screen
+        self.ships = []  # indexed by Ship.index
+        self.bullets = []
+        self.particles = []
+        self.winner = None
+        self.winner_team = None  # None with a winner set means nobody survived
+        self.tick = 0
+        self.next_bullet_id = 1
+        self.snapshot = None  # WorldSnapshot of the last finished tick
+        # tap-vs-hold threshold (frames) to distinguish single tap vs charged shot
+        self.tap_threshold = 6
+        # Fraction of cosmetic particles actually spawned (quality governor, headless runs)
+        self.particle_density = 1.0
+        self.particle_credit = 0.0
+        # Broad-phase over the live ships, rebuilt every tick
+        self.grid = SpatialGrid()
+
+    @property
+    def ship1(self):
+        return self.ships[0] if self.ships else None
+
+    @property
+    def ship2(self):
+        return self.ships[1] if len(self.ships) > 1 else None
+
+    def new_match(self, ship1_type, ship1_color, ship2_type, ship2_color):
+        """Reset the arena for a one-on-one match."""
+        self.new_team_match([(ship1_type, ship1_color), (ship2_type, ship2_color)])
+
+    def new_team_match(self, players, mode="1v1"):
+        """Reset the arena with one ship per (ship_type, color) in players.
+
+        Ships take the slots of MATCH_MODES[mode] in order; ships on the same
+        side each get a lane of it, and slot i is steered by CONTROLS[i].
+        The arena is self.arena; ships start a screen's width apart around its
+        middle, so a larger arena opens with everyone in view.
+        """
+        slots = MATCH_MODES[mode][:len(players)]
+        self.mode = mode
+        self.ships = []
+        for index, ((ship_type, color), (team, is_left)) in enumerate(zip(players, slots)):
+            side = [i for i, slot in enumerate(slots) if slot[1] == is_left]
+            zone = side_zone(is_left, side.index(index), len(side), self.arena)
+            x = self.arena[0] // 2 + (100 - SCREEN_WIDTH // 2 if is_left else SCREEN_WIDTH // 2 - 100)
+            ship = Ship(x, (zone[2] + zone[3]) // 2, ship_type, color,
+                        dict(CONTROLS[index]), is_left)
+            ship.index, ship.team, ship.zone = index, team, zone
+            # give ships a back-reference to the match for particles/effects
+            ship.game = self
+            self.ships.append(ship)
+
+        self.bullets = []
+        self.particles = []
+        self.winner = None
+        self.winner_team = None
+        self.tick = 0
+        self.state = "playing"
+        self.publish()
+
+    def publish(self):
+        """Publish an immutable WorldSnapshot of the current tick.
+
+        Swapping self.snapshot is a single assignment, so other threads
+        (network, replay, telemetry) read it without locks and never see a
+        tick half done. Each snapshot is new rather than a reused buffer
+        because readers may hold on to it for several ticks.
+        """
+        ships = tuple([ShipSnapshot(s.x, s.y, s.health, s.bullets, s.type, s.original_color)
+                       for s in self.ships])
+        self.snapshot = WorldSnapshot(
+            self.tick, self.state, ships[0], ships[1],
+            tuple([BulletSnapshot(b.x, b.y, b.width, b.height, b.ship_type, b.is_charged,
+                                  b.owner) for b in self.bullets]),
+            ships, time.perf_counter())
+
+    def player_name(self, index):
+        """Display name of the pilot in ship slot index."""
+        if index < 2:
+            return (self.player1_name, self.player2_name)[index]
+        return f"Player {index + 1}"
+
+    def team_name(self, team):
+        """A lone pilot's own name, otherwise "Team N"."""
+        members = [ship for ship in self.ships if ship.team == team]
+        if len(members) == 1:
+            return self.player_name(members[0].index)
+        return f"Team {team + 1}"
+
+    def spawn_particle(self, x, y, color, lifetime=20, size=6):
+        """Add a cosmetic particle, thinned out evenly to particle_density."""
+        self.particle_credit += self.particle_density
+        if self.particle_credit < 1.0:
+            return
+        self.particle_credit -= 1.0
+        self.particles.append(Particle(x, y, color, lifetime=lifetime, size=size))
+
+    def press_fire(self, ship):
+        # Start charging on press (we'll decide tap vs hold on release)
+        if not ship.charging:
+            ship.start_charging()
+            # ensure ship has reference to game
+            ship.game = self
+
+    def release_fire(self, ship):
+        if not ship.charging:
+            return
+        # decide tap vs hold
+        if ship.charge_time < self.tap_threshold:
+            # tap: single shot if available
+            ship.charging = False
+            bullets_used = ship.shoot_single()
+            if bullets_used > 0:
+                self.shoot_bullet(ship, bullets_used, False)
+        else:
+            bullets_used = ship.stop_charging()
+            if bullets_used > 0:
+                self.shoot_bullet(ship, bullets_used, True)
+
+    def set_fire(self, ship, pressed):
+        """Drive fire from a held level (remote input, bots) instead of key events."""
+        if pressed and not ship.fire_held:
+            self.press_fire(ship)
+        elif not pressed and ship.fire_held:
+            self.release_fire(ship)
+        ship.fire_held = pressed
+
+    def add_bullet(self, b):
+        """Helper to append a bullet and assign game reference for in-bullet effects."""
+        # Stable id so a process mirroring the match can follow each bullet
+        b.id = self.next_bullet_id
+        self.next_bullet_id += 1
+        self.bullets.append(b)
+        b.arena = self.arena
+        try:
+            b.game = self
+        except Exception:
+            pass
+    
+    def shoot_bullet(self, ship, bullets_used, is_charged):
+        # Play ship-specific shoot sound
+        play_sound('shoot', ship.type)
+        # Everything about the shot comes from the compiled weapon pattern
+        spec = SHIP_SPECS[ship.type]
+        pattern = spec.charged if is_charged else spec.tap
+        direction = 1 if ship.is_left else -1
+        bullet_x = ship.x + (ship.width//2 + spec.spawn_forward) * direction
+        charge_level = bullets_used if is_charged else 1
+        count = min(pattern.count, bullets_used) if pattern.scale_with_charge else pattern.count
+        for dy, angle in pattern.emissions[count]:
+            bullet_y = ship.y + dy
+            b = Bullet(bullet_x, bullet_y, direction, ship.type, is_charged, charge_level,
+                       angle=angle, kernel=pattern.movement)
+            b.color = ship.color
+            b.owner = ship.index
+            b.team = ship.team
+            self.add_bullet(b)
+            if pattern.particles:
+                px = bullet_x + math.cos(angle) * pattern.particle_offset
+                py = bullet_y + math.sin(angle) * pattern.particle_offset
+                for _ in range(pattern.particles):
+                    self.spawn_particle(px, py, ship.color, lifetime=pattern.particle_lifetime,
+                                        size=pattern.particle_size)
+        if pattern.sound:
+            play_sound(pattern.sound, ship.type)
+    
+    def damage_ship(self, ship):
+        """Take one hit off ship; True if that destroyed it.
+
+        The match ends once at most one team has ships left.
+        """
+        if not ship.take_damage():
+            return False
+        play_sound('ship_explosion')  # Fatal hit sound
+        teams = set(s.team for s in self.ships if s.health > 0)
+        if len(teams) <= 1:
+            self.winner_team = teams.pop() if teams else None
+            self.winner = "Nobody" if self.winner_team is None else self.team_name(self.winner_team)
+            self.state = "game_over"
+        else:
+            self.balance_sides()
+        return True
+
+    def balance_sides(self):
+        """Keep ships on both sides while several teams are alive.
+
+        Bullets only fly across the middle, so once a side is cleared (free
+        for all) the last ship on the other side moves over. Survivors then
+        share their side's lanes again.
+        """
+        live = [ship for ship in self.ships if ship.health > 0]
+        left = [ship for ship in live if ship.is_left]
+        if not left or len(left) == len(live):
+            crosser = (left or live)[-1]
+            crosser.is_left = not crosser.is_left
+            crosser.x = crosser.prev_x = self.arena[0] - crosser.x
+        for is_left in (True, False):
+            side = [ship for ship in live if ship.is_left == is_left]
+            for lane, ship in enumerate(side):
+                ship.zone = min_x, max_x, min_y, max_y = side_zone(is_left, lane, len(side), self.arena)
+                ship.x = min(max(ship.x, min_x), max_x)
+                ship.y = min(max(ship.y, min_y), max_y)
+                self.index_ship(ship)
+
+    def index_ship(self, ship):
+        """(Re)insert ship into the broad-phase grid.
+
+        Its box is widened by how far it moved this step, which covers every
+        start point swept_hit can test the ship against, plus a pixel spare
+        for get_box rounding.
+        """
+        half_w = ship.width / 2.0 + 1 + abs(ship.x - ship.prev_x)
+        half_h = ship.height / 2.0 + 1 + abs(ship.y - ship.prev_y)
+        self.grid.insert(ship, ship.x - half_w, ship.y - half_h, ship.x + half_w, ship.y + half_h)
+
+    def step(self, keys1, keys2, ticks=1, others=()):
+        """Advance the match; keys1/keys2 are key-state lookups for ships 1 and 2,
+        others the lookups for any further ships in slot order.
+
+        ticks > 1 advances that many ticks in one coarse step (headless runs);
+        collisions are swept over the whole step, so nothing tunnels.
+        """
+        if self.state != "playing":
+            return
+        self.tick += ticks
+        keys = (keys1, keys2) + tuple(others)
+        live = [ship for ship in self.ships if ship.health > 0]
+        for ship in live:
+            ship.move(keys[ship.index], ticks)
+        for ship in live:
+            ship.update_charge(ticks)
+
+        # Ships only move again on knockback, so index them once per tick
+        grid = self.grid
+        grid.clear()
+        for ship in live:
+            self.index_ship(ship)
+        bullets_to_remove = []
+        for i, bullet in enumerate(self.bullets):
+            bullet.prev_x = bullet.x
+            bullet.prev_y = bullet.y
+            if bullet.move(ticks):
+                bullets_to_remove.append(i)
+
+            # Swept test over the bullet's whole path this step, against nearby ships only
+            half_w, half_h = bullet.width / 2.0, bullet.height / 2.0
+            nearby = grid.query(min(bullet.prev_x, bullet.x) - half_w, min(bullet.prev_y, bullet.y) - half_h,
+                                max(bullet.prev_x, bullet.x) + half_w, max(bullet.prev_y, bullet.y) + half_h)
+            nearby.sort(key=lambda ship: ship.index)
+            for ship in nearby:
+                if ship.team == bullet.team or ship.health <= 0 or not swept_hit(bullet, ship):
+                    continue
+                # Apply damage and visual/physics feedback
+                self.damage_ship(ship)
+                bullets_to_remove.append(i)
+                play_sound('hit', bullet.ship_type)  # Ship-specific hit sound
+                # Knockback and tilt, away from the middle of the arena
+                push = -12 if ship.is_left else 12
+                ship.x += push
+                ship.tilt = -8 if ship.is_left else 8
+                ship.tilt_timer = 18
+                self.index_ship(ship)
+                # Hit particles
+                for _ in range(8):
+                    angle = random.random() * 2 * math.pi
+                    px = ship.x + math.cos(angle) * 8
+                    py = ship.y + math.sin(angle) * 8
+                    self.spawn_particle(px, py, ship.color, lifetime=25, size=3)
+                break
+
+            # Komar charged beam: instant full-screen beam with immediate damage
+            if bullet.kernel == MOVE_BEAM:
+                # Create beam box that spans from bullet origin to the arena edge
+                if bullet.direction == 1:  # Right-facing beam
+                    beam_box = (int(bullet.x), 0) + self.arena
+                else:  # Left-facing beam
+                    beam_box = (0, 0, int(bullet.x), self.arena[1])
+
+                # Apply instant damage on the first tick only
+                if not bullet.explosion_applied:
+                    bullet.explosion_applied = True
+                    targets = grid.query(*beam_box)
+                    targets.sort(key=lambda ship: ship.index)
+                    for ship in targets:
+                        if (ship.team != bullet.team and ship.health > 0
+                                and boxes_overlap(beam_box, ship.get_box())):
+                            self.damage_ship(ship)
+
+                # Remove beam after a short display time
+                if bullet.timer >= FPS//4:  # Show beam for 1/4 second
+                    bullets_to_remove.append(i)
+
+            # Kombuz explosion handling with distance-based damage (hurts every ship in reach)
+            if bullet.kernel == MOVE_MINE and bullet.exploding and not bullet.explosion_applied:
+                radius = bullet.explosion_timer * 4  # Match visual radius
+                nearby = grid.query(bullet.x - radius, bullet.y - radius, bullet.x + radius, bullet.y + radius)
+                nearby.sort(key=lambda ship: ship.index)
+                for ship in nearby:
+                    if ship.health <= 0:
+                        continue
+                    dist = math.hypot(bullet.x - ship.x, bullet.y - ship.y)
+                    if dist <= radius:
+                        # Damage scales with distance (more damage closer to center)
+                        damage_scale = 1.0 - (dist / radius)
+                        hits = max(1, int(3 * damage_scale))  # 1-3 hits based on distance
+
+                        # Create particle effects for hit visualization
+                        for _ in range(hits * 2):  # 2 particles per hit
+                            angle = random.random() * 2 * math.pi
+                            speed = random.randint(2, 5)
+                            particle_x = ship.x + math.cos(angle) * 10
+                            particle_y = ship.y + math.sin(angle) * 10
+                            self.spawn_particle(particle_x, particle_y, ship.color, lifetime=20, size=3)
+
+                        # Apply damage hits
+                        for _ in range(hits):
+                            if self.damage_ship(ship):
+                                break
+
+                # Play Kombuz-specific mine explosion sound
+                bullet.explosion_applied = True
+                play_sound('mine_explode', 'Kombuz')
+
+        # a bullet can be flagged twice (hit and expired), so dedupe first
+        for i in sorted(set(bullets_to_remove), reverse=True):
+            if i < len(self.bullets):
+                self.bullets.pop(i)
+
+        # Update particles
+        particles_to_remove = []
+        for pi, p in enumerate(self.particles):
+            if p.update(ticks):
+                particles_to_remove.append(pi)
+        for pi in sorted(particles_to_remove, reverse=True):
+            self.particles.pop(pi)
+        self.publish()
+
+
+class SimpleBot:
+    """Scripted pilot for headless matches (balance sweeps, training opponents).
+
+    Follows the enemy's height with some aim jitter, wanders inside its own
+    half and mixes taps with charged shots. All randomness comes from its own
+    random.Random so a seeded match always plays out the same way.
+    """
+    def __init__(self, ship, enemy, seed=None, charge_chance=0.35):
+        self.ship = ship
+        self.enemy = enemy
+        self.rng = random.Random(seed)
+        self.charge_chance = charge_chance
+        self.aim_offset = 0.0
+        self.drift = 0
+        self.retarget_in = 0
+        self.hold = 0  # ticks left with fire held
+        self.cooldown = 0
+
+    def think(self, ticks=1):
+        """Return (keys, fire_pressed) for the next step of ticks ticks."""
+        ship, rng = self.ship, self.rng
+        if self.retarget_in <= 0:
+            self.aim_offset = rng.uniform(-30, 30)
+            self.drift = rng.choice((-1, 0, 1))
+            self.retarget_in = rng.randint(15, 45)
+        self.retarget_in -= ticks
+
+        dy = self.enemy.y + self.aim_offset - ship.y
+        controls = ship.controls
+        keys = KeyMap({
+            controls["up"]: dy < -ship.speed,
+            controls["down"]: dy > ship.speed,
+            controls["left"]: self.drift < 0,
+            controls["right"]: self.drift > 0,
+        })
+
+        if self.hold > 0:
+            self.hold -= ticks
+            return keys, self.hold > 0
+        if self.cooldown > 0:
+            self.cooldown -= ticks
+        elif ship.bullets > 0 and abs(dy) < 60:
+            if rng.random() < self.charge_chance:
+                self.hold = rng.randint(15, MAX_CHARGE_TIME)
+            else:
+                self.hold = rng.randint(1, 3)
+            self.cooldown = rng.randint(5, 25)
+            return keys, True
+        return keys, False
+
@@ -0,0 +1,1553 @@
+"""Windowed game: menus, settings, input handling, networking glue and the main loop."""
+import collections
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+import pygame
+from pygame.locals import *
+
+from . import audio, core
+from .core import (SCREEN_WIDTH, SCREEN_HEIGHT, TICK_TIME, RENDER_FPS, MAX_FRAME_TIME,
+                   MAX_TICKS_PER_FRAME, BACKGROUND_COLOR, FONT_COLOR, BORDER_COLOR,
+                   HIGHLIGHT_COLOR, GAME_VERSION, SHIP_SIZE, BULLET_SIZE,
+                   SHIP_COLORS, SHIPS, MATCH_MODES, MAX_SHIPS, Ship, Match, SpatialGrid, boxes_overlap,
+                   damage_color)
+from .net import INPUT_FIRE, NetworkHost, NetworkClient, pack_input, input_keymap
+from .render import (QUALITY_LEVELS, QualityGovernor, TextureRenderer, load_image,
+                     get_ship_sprite, get_bullet_sprite, warm_ship_colors, warm_bullet_sprites,
+                     view_scale, build_background, parse_resolution, draw_ship, draw_bullet,
+                     draw_particle, Camera, ship_extent, bullet_extent, particle_extent, DrawList,
+                     LAYER_SHIPS, LAYER_BULLETS, circle_image)
+from .simworker import SIM_SYNC_WAIT, SimulationProcess
+
+__all__ = [
+    "FULLSCREEN", "HELP_BG_COLOR", "HELP_TEXT_COLOR", "SETTINGS_BG_COLOR", "SETTINGS_TEXT_COLOR",
+    "SETTINGS_BAR_BG", "SETTINGS_BAR_FG", "SETTINGS_HIGHLIGHT", "DEFAULT_SETTINGS",
+    "TouchController", "Game"
+]
+
+# Fullscreen flag shorthand (used when toggling)
+FULLSCREEN = pygame.FULLSCREEN
+
+
+# Help / UI palette
+HELP_BG_COLOR = (8, 10, 20)
+HELP_TEXT_COLOR = (230, 230, 230)
+
+# Settings UI colors and defaults
+SETTINGS_BG_COLOR = (30, 30, 30)
+SETTINGS_TEXT_COLOR = (230, 230, 230)
+SETTINGS_BAR_BG = (60, 60, 60)
+SETTINGS_BAR_FG = (120, 180, 220)
+SETTINGS_HIGHLIGHT = (100, 100, 180)
+
+
+# Default settings (volumes + key bindings)
+DEFAULT_SETTINGS = {
+    "music_volume": 0.5,
+    "sfx_volume": 0.8,
+    # Player 1 keys
+    "p1_up": K_w,
+    "p1_down": K_s,
+    "p1_left": K_a,
+    "p1_right": K_d,
+    "p1_fire": K_SPACE,
+    # Player 2 keys
+    "p2_up": K_UP,
+    "p2_down": K_DOWN,
+    "p2_left": K_LEFT,
+    "p2_right": K_RIGHT,
+    "p2_fire": K_RETURN,
+}
+
+
+class TouchController:
+    """Simple on-screen joystick + fire button for touch input (mouse-friendly)."""
+    def __init__(self, x, y, radius=60, fire_x=None, fire_y=None, fire_radius=36):
+        self.cx = x
+        self.cy = y
+        self.radius = radius
+        self.knob_x = x
+        self.knob_y = y
+        self.active = False
+        self.dx = 0.0
+        self.dy = 0.0
+        # fire button
+        self.fire_x = fire_x if fire_x is not None else x + 160
+        self.fire_y = fire_y if fire_y is not None else y
+        self.fire_radius = fire_radius
+        self.fire_pressed = False
+
+    def draw(self, screen):
+        # base circle
+        pygame.draw.circle(screen, (40,40,40), (self.cx, self.cy), self.radius)
+        pygame.draw.circle(screen, (120,120,120), (self.cx, self.cy), self.radius, 3)
+        # knob
+        pygame.draw.circle(screen, (200,200,200), (int(self.knob_x), int(self.knob_y)), int(self.radius*0.45))
+        # fire button
+        fcol = (200,60,60) if self.fire_pressed else (120,30,30)
+        pygame.draw.circle(screen, fcol, (self.fire_x, self.fire_y), self.fire_radius)
+        pygame.draw.circle(screen, (255,160,160), (self.fire_x, self.fire_y), int(self.fire_radius*0.6))
+
+    def start(self, x, y):
+        # if touch inside joystick
+        if math.hypot(x - self.cx, y - self.cy) <= self.radius:
+            self.active = True
+            self.update(x, y)
+            return 'joystick'
+        if math.hypot(x - self.fire_x, y - self.fire_y) <= self.fire_radius:
+            self.fire_pressed = True
+            return 'fire'
+        return None
+
+    def update(self, x, y):
+        if not self.active:
+            return
+        ox = x - self.cx
+        oy = y - self.cy
+        dist = math.hypot(ox, oy)
+        if dist > self.radius:
+            ox = ox / dist * self.radius
+            oy = oy / dist * self.radius
+        self.knob_x = self.cx + ox
+        self.knob_y = self.cy + oy
+        # normalized -1..1
+        self.dx = ox / float(self.radius)
+        self.dy = oy / float(self.radius)
+
+    def stop(self):
+        self.active = False
+        self.knob_x = self.cx
+        self.knob_y = self.cy
+        self.dx = 0.0
+        self.dy = 0.0
+        self.fire_pressed = False
+
+
+class Game(Match):
+    def __init__(self, renderer=None, resolution=None, sim_process=None, mode=None, arena=None):
+        super().__init__()
+        # Display, fonts and mixer come up with the game, never on import
+        pygame.init()
+        # Sounds raised by the simulation are played through the mixer
+        core.SOUND_SINK = audio.play_sound
+        # "software" draws straight to the display Surface; "texture" uses TextureRenderer
+        renderer = renderer or os.environ.get("FLOX_RENDERER", "software")
+        self.renderer = None
+        if renderer == "texture":
+            try:
+                self.renderer = TextureRenderer((SCREEN_WIDTH, SCREEN_HEIGHT))
+            except Exception:
+                self.renderer = None  # fall back to software rendering
+        # Internal resolution of the arena (e.g. "960x540"); None renders at the window's size
+        if resolution is None:
+            resolution = os.environ.get("FLOX_RESOLUTION")
+        if isinstance(resolution, str):
+            try:
+                resolution = parse_resolution(resolution)
+            except ValueError:
+                resolution = None
+        self.resolution = resolution
+        # Run the simulation in a worker process (FLOX_SIM_PROCESS=1) so it gets its own core
+        if sim_process is None:
+            sim_process = os.environ.get("FLOX_SIM_PROCESS", "") not in ("", "0")
+        self.sim_process = sim_process
+        # Match mode (a MATCH_MODES key, or $FLOX_MODE); the menu cycles through them
+        mode = mode or os.environ.get("FLOX_MODE", "1v1")
+        self.mode = mode if mode in MATCH_MODES else "1v1"
+        # Arena size (e.g. "2560x1440", or $FLOX_ARENA); larger than the screen scrolls
+        if arena is None:
+            arena = os.environ.get("FLOX_ARENA")
+        if isinstance(arena, str):
+            try:
+                arena = parse_resolution(arena)
+            except ValueError:
+                arena = None
+        if arena:
+            self.arena = (max(SCREEN_WIDTH, arena[0]), max(SCREEN_HEIGHT, arena[1]))
+        self.camera = Camera()
+        # Culling index over what draw_world can paint, rebuilt once per published tick
+        self.scene_grid = SpatialGrid()
+        self.scene_snapshot = None
+        self.draw_list = DrawList()  # reused by draw_world every frame
+        self.sim = None  # SimulationProcess while a match runs in a worker
+        self.window = None
+        if self.renderer:
+            self.screen = self.renderer.overlay
+        else:
+            self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.setup_view()
+        pygame.display.set_caption("2D-Flox")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont(None, 36)
+        self.small_font = pygame.font.SysFont(None, 24)
+        
+        # Game state
+        self.state = "menu"  # menu, playing, game_over, help
+        
+        # Settings
+        self.settings = DEFAULT_SETTINGS.copy()
+        self.settings_open = False
+        self.remapping_key = None  # Tracks which key is being remapped
+        self.apply_volume_settings()
+        # Preload background music if available
+        bg_path = audio.sound_path('background')
+        if bg_path:
+            try:
+                pygame.mixer.music.load(bg_path)
+            except Exception:
+                pass
+        
+        # Player information
+        self.player1_name = "Player 1"
+        self.player2_name = "Player 2"
+        self.player1_ship = "Zaba"
+        self.player2_ship = "Zaba"
+        self.player1_color = SHIP_COLORS[0]
+        self.player2_color = SHIP_COLORS[1]
+        self.player1_color_index = 0
+        self.player2_color_index = 1
+        
+        # Ship selection
+        self.ship_names = list(SHIPS.keys())
+        self.player1_ship_index = 0
+        # Default player2 to a different ship so Nexus and others appear in menu
+        self.player2_ship_index = 1 if len(self.ship_names) > 1 else 0
+        # Ensure selected ship names reflect indices
+        self.player1_ship = self.ship_names[self.player1_ship_index]
+        self.player2_ship = self.ship_names[self.player2_ship_index]
+        
+        # Input handling defaults
+        self.input_active = "player1"  # which menu field is active
+        self.fullscreen = False
+        
+        # interactive state
+        self.dragging_volume = None  # 'music' | 'sfx' | None
+        # How far the current frame is between the last two ticks (0..1)
+        self.render_alpha = 1.0
+        # Adaptive quality: sheds particles/effects/resolution when frames run long
+        self.quality = QualityGovernor()
+        self.scene = None  # reduced-resolution arena canvas, created on demand
+        self.fonts = {}  # (size, scale) -> font for HUD text on scaled canvases
+        self.backgrounds = {}  # (canvas size, arena) -> pre-composited arena background
+        # Menu previews cycle through every ship and color; tint them all up front
+        self.warm_menu_sprites()
+        # Networking state
+        self.network_role = None  # None | 'host' | 'client'
+        self.network_peer = None
+        self.remote_state = None
+        # For smoother client rendering we interpolate towards the authoritative target
+        self.remote_state_target = None
+        self.remote_state_interp = None
+        self.remote_state_time = 0.0
+        self.remote_state_tick = None  # host tick the target snapshot was taken on
+        self.interp_alpha = 0.22  # smoothing factor (0 - no interp, 1 - snap)
+        # host: client input bits in arrival order, and the input applied last tick, per ship slot
+        self.remote_inputs = [collections.deque() for _ in range(MAX_SHIPS)]
+        self.remote_input_bits = [None] * MAX_SHIPS
+        self.show_net_stats = False  # F3 overlay
+        # FLOX_NET_STATS=path dumps the connection statistics there as JSON once a second
+        self.net_stats_path = os.environ.get("FLOX_NET_STATS")
+        self.net_stats_dumped = 0.0
+        # Menu connect IP buffer
+        self.connect_ip = ""
+        # Connection UI/status
+        self.connect_status = None
+        self.connect_error = None
+        # menu clickable regions (populated by draw_menu)
+        self.menu_regions = {}
+        # Input mode: 'keyboard' or 'touch'
+        self.input_mode = 'keyboard'
+        # Touch controllers will be created when needed (placed relative to screen)
+        self.touch_left = None
+        self.touch_right = None
+        # Previous fire states for touch controllers to detect press/release
+        self.touch_left_prev_fire = False
+        self.touch_right_prev_fire = False
+        
+    def apply_volume_settings(self):
+        """Apply volume settings to pygame mixer"""
+        try:
+            pygame.mixer.music.set_volume(self.settings["music_volume"])
+        except pygame.error:
+            pass  # no audio device
+        # Apply to sound effects (now, and to the ones loaded later)
+        audio.set_sfx_volume(self.settings["sfx_volume"])
+                
+    def draw_settings_icon(self):
+        """Draw gear icon in top left corner"""
+        center = (30, 30)
+        radius = 15
+        pygame.draw.circle(self.screen, SETTINGS_TEXT_COLOR, center, radius, 2)
+        # Draw gear teeth
+        for i in range(8):
+            angle = i * math.pi / 4
+            x = center[0] + math.cos(angle) * radius
+            y = center[1] + math.sin(angle) * radius
+            pygame.draw.line(self.screen, SETTINGS_TEXT_COLOR,
+                           (x, y),
+                           (x + math.cos(angle) * 5, y + math.sin(angle) * 5),
+                           2)
+                           
+    def draw_volume_bar(self, x, y, width, height, value, label):
+        """Draw a volume control bar with label and percentage"""
+        # Draw label
+        text = self.small_font.render(label, True, SETTINGS_TEXT_COLOR)
+        self.screen.blit(text, (x, y - 20))
+        
+        # Draw bar background with border
+        pygame.draw.rect(self.screen, SETTINGS_BAR_BG, (x, y, width, height))
+        pygame.draw.rect(self.screen, SETTINGS_TEXT_COLOR, (x, y, width, height), 1)
+        
+        # Draw filled portion
+        if value > 0:
+            pygame.draw.rect(self.screen, SETTINGS_BAR_FG, 
+                           (x, y, width * value, height))
+        
+        # Draw percentage
+        percentage = f"{int(value * 100)}%"
+        percent_text = self.small_font.render(percentage, True, SETTINGS_TEXT_COLOR)
+        self.screen.blit(percent_text, (x + width + 10, y - 3))
+        
+    def handle_settings_click(self, pos):
+        """Handle clicks in settings menu"""
+        x, y = pos
+        if not self.settings_open:
+            # Check if settings icon clicked
+            if (x - 30)**2 + (y - 30)**2 <= 15**2:
+                self.settings_open = True
+                return True
+        else:
+            # Handle volume bar clicks (compute positions to match draw_settings_menu)
+            panel_width = 700
+            panel_height = 520
+            panel_x = SCREEN_WIDTH//2 - panel_width//2
+            panel_y = 40
+            title_y = panel_y + 20
+            volume_y = title_y + 70
+            bar_width = 400
+            bar_height = 15
+            bar_x = panel_x + (panel_width - bar_width) // 2
+            music_y = volume_y + 50
+            sfx_y = music_y + 60
+
+            music_bar = pygame.Rect(bar_x, music_y, bar_width, bar_height)
+            sfx_bar = pygame.Rect(bar_x, sfx_y, bar_width, bar_height)
+
+            if music_bar.collidepoint(pos):
+                self.settings["music_volume"] = max(0.0, min(1.0, (x - music_bar.x) / music_bar.width))
+                self.apply_volume_settings()
+                self.dragging_volume = 'music'
+                return True
+
+            if sfx_bar.collidepoint(pos):
+                self.settings["sfx_volume"] = max(0.0, min(1.0, (x - sfx_bar.x) / sfx_bar.width))
+                self.apply_volume_settings()
+                self.dragging_volume = 'sfx'
+                return True
+                
+            # Check reset button
+            reset_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, 500, 200, 40)
+            if reset_rect.collidepoint(pos):
+                self.settings = DEFAULT_SETTINGS.copy()
+                self.apply_volume_settings()
+                return True
+                
+            # Check for key remap buttons
+            key_areas = self.get_key_remap_areas()
+            for key, rect in key_areas.items():
+                if rect.collidepoint(pos):
+                    self.remapping_key = key
+                    return True
+            # Close button area (top-right of panel)
+            panel_x = SCREEN_WIDTH//2 - 350
+            panel_width = 700
+            panel_y = 40
+            close_rect = pygame.Rect(panel_x + panel_width - 34, panel_y + 6, 28, 28)
+            if close_rect.collidepoint(pos):
+                self.settings_open = False
+                self.dragging_volume = None
+                return True
+
+            return False
+
+    def handle_menu_click(self, pos):
+        # keep legacy behavior but also handle host/join areas
+        x, y = pos
+        # check host/join special areas first
+        if hasattr(self, 'menu_regions') and self.menu_regions:
+            if 'host' in self.menu_regions and self.menu_regions['host'].collidepoint(pos):
+                # start hosting
+                try:
+                    self.start_host()
+                    self.connect_error = None
+                    self.settings_open = False
+                except Exception:
+                    pass
+                return
+            if 'join' in self.menu_regions and self.menu_regions['join'].collidepoint(pos):
+                # If IP already entered, try to connect; otherwise focus entry
+                if self.connect_ip:
+                    try:
+                        self.connect_to(self.connect_ip)
+                        self.connect_error = None
+                    except Exception as e:
+                        self.connect_error = f"Connect failed: {str(e) or 'error'}"
+                else:
+                    self.input_active = 'connect_ip'
+                return
+            if 'ip_field' in self.menu_regions and self.menu_regions['ip_field'].collidepoint(pos):
+                self.input_active = 'connect_ip'
+                return
+            if 'mode' in self.menu_regions and self.menu_regions['mode'].collidepoint(pos):
+                modes = list(MATCH_MODES)
+                self.mode = modes[(modes.index(self.mode) + 1) % len(modes)]
+                return
+            # Start / Info / Stop buttons
+            if 'start' in self.menu_regions and self.menu_regions['start'].collidepoint(pos):
+                try:
+                    self.start_game()
+                except Exception:
+                    pass
+                return
+            if 'info' in self.menu_regions and self.menu_regions['info'].collidepoint(pos):
+                self.state = 'help'
+                return
+            if 'stop' in self.menu_regions and self.menu_regions['stop'].collidepoint(pos):
+                # Stop hosting or disconnect client
+                try:
+                    self.stop_network()
+                    self.connect_error = None
+                except Exception as e:
+                    self.connect_error = f"Stop failed: {str(e)}"
+                return
+
+        # Fallback to existing simple click areas
+        # Player 1 area (left side)
+        if x < SCREEN_WIDTH // 2:
+            # Name field
+            if 150 <= y <= 180:
+                self.input_active = "player1"
+            # Ship selection
+            elif 220 <= y <= 250:
+                self.input_active = "ship1"
+            # Color selection
+            elif 290 <= y <= 320:
+                self.input_active = "color1"
+
+        # Player 2 area (right side)
+        else:
+            # Name field
+            if 150 <= y <= 180:
+                self.input_active = "player2"
+            # Ship selection
+            elif 220 <= y <= 250:
+                self.input_active = "ship2"
+            # Color selection
+            elif 290 <= y <= 320:
+                self.input_active = "color2"
+
+        # Start button
+        if 450 <= y <= 490 and SCREEN_WIDTH//2 - 100 <= x <= SCREEN_WIDTH//2 + 100:
+            self.start_game()
+        
+        # Help button
+        if 520 <= y <= 560 and SCREEN_WIDTH//2 - 100 <= x <= SCREEN_WIDTH//2 + 100:
+            self.state = "help"
+    
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                self.stop_simulation()
+                pygame.quit()
+                sys.exit()
+
+            # Mouse handling: unified branch for clicking/dragging
+            elif event.type == MOUSEBUTTONDOWN:
+                if event.button == 1:  # Left click
+                    # If settings overlay open, let it handle clicks first
+                    # UI is hit-tested in logical coordinates, not window pixels
+                    pos = self.window_to_logical(event.pos)
+                    if self.settings_open:
+                        if self.handle_settings_click(pos):
+                            continue
+                    # Otherwise, if we're in menu, handle menu clicks
+                    if self.state == 'menu':
+                        self.handle_menu_click(pos)
+                        continue
+                    # In-game: allow clicks for future UI (none currently)
+
+            elif event.type == MOUSEBUTTONUP:
+                # stop dragging volume when mouse released
+                if event.button == 1:
+                    self.dragging_volume = None
+                    # No touch-release handling: mouse releases are ignored for gameplay (keyboard-only controls)
+
+            elif event.type == MOUSEMOTION:
+                # If dragging a volume slider, update value dynamically
+                if self.settings_open and self.dragging_volume:
+                    mx, my = self.window_to_logical(event.pos)
+                    panel_width = 700
+                    panel_x = SCREEN_WIDTH//2 - panel_width//2
+                    bar_width = 400
+                    bar_x = panel_x + (panel_width - bar_width) // 2
+                    # compute y positions consistent with draw_settings_menu
+                    panel_y = 40
+                    title_y = panel_y + 20
+                    volume_y = title_y + 70
+                    music_y = volume_y + 50
+                    sfx_y = music_y + 60
+                    if self.dragging_volume == 'music':
+                        rel = (mx - bar_x) / bar_width
+                        self.settings['music_volume'] = max(0.0, min(1.0, rel))
+                        self.apply_volume_settings()
+                    elif self.dragging_volume == 'sfx':
+                        rel = (mx - bar_x) / bar_width
+                        self.settings['sfx_volume'] = max(0.0, min(1.0, rel))
+                        self.apply_volume_settings()
+                # Mouse motion currently only used for UI dragging (volume sliders)
+
+            elif event.type == KEYDOWN:
+                # Handle key remapping
+                if self.remapping_key:
+                    self.settings[self.remapping_key] = event.key
+                    self.remapping_key = None
+                    continue
+                if self.state == "menu":
+                    # Use keyboard in menu for text input/backspace only; mouse handles selection
+                    if event.key == K_BACKSPACE:
+                        if self.input_active == "player1":
+                            self.player1_name = self.player1_name[:-1]
+                        elif self.input_active == "player2":
+                            self.player2_name = self.player2_name[:-1]
+                        elif self.input_active == 'connect_ip':
+                            self.connect_ip = self.connect_ip[:-1]
+                    else:
+                        if event.unicode and event.unicode.isprintable():
+                            if self.input_active == "player1" and len(self.player1_name) < 24:
+                                self.player1_name += event.unicode
+                            elif self.input_active == "player2" and len(self.player2_name) < 24:
+                                self.player2_name += event.unicode
+                            elif self.input_active == 'connect_ip' and len(self.connect_ip) < 64:
+                                self.connect_ip += event.unicode
+                            # If user pressed Enter while entering IP, try to connect
+                            if event.key == K_RETURN and self.input_active == 'connect_ip':
+                                try:
+                                    self.connect_to(self.connect_ip)
+                                    self.input_active = None
+                                except Exception:
+                                    pass
+                    # Input mode toggle removed: game is keyboard-only for ship controls
+
+                elif self.state == "playing":
+                    if event.key == K_f:
+                        self.toggle_fullscreen()
+                    elif event.key == K_F3:
+                        self.show_net_stats = not self.show_net_stats
+                    elif event.key == K_ESCAPE:
+                        self.stop_simulation()
+                        self.state = "menu"
+
+                    # Start charging on keydown (we'll decide tap vs hold on keyup)
+                    for ship in self.ships:
+                        if event.key == ship.controls["fire"] and ship.health > 0:
+                            self.press_fire(ship)
+
+                elif self.state == "game_over" or self.state == "help":
+                    if event.key == K_RETURN or event.key == K_ESCAPE:
+                        self.stop_simulation()
+                        self.state = "menu"
+                    elif event.key == K_f:
+                        self.toggle_fullscreen()
+            
+            elif event.type == KEYUP:
+                if self.state == "playing":
+                    for ship in self.ships:
+                        if event.key == ship.controls["fire"]:
+                            self.release_fire(ship)
+
+            elif event.type == MOUSEBUTTONDOWN:
+                if self.state == "menu":
+                    self.handle_menu_click(self.window_to_logical(event.pos))
+    
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.renderer:
+            self.renderer.set_fullscreen(self.fullscreen)
+            return
+        if self.fullscreen:
+            # Desktop resolution; the frame is scaled up in present()
+            self.window = pygame.display.set_mode((0, 0), FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.setup_view()
+        if self.ship1 and self.state == "playing":
+            self.warm_sprites()  # native resolution may have changed the sprite sizes
+
+    def setup_view(self):
+        """Fit the logical screen into the window and (re)create the render canvases.
+
+        self.screen is the logical SCREEN_WIDTH x SCREEN_HEIGHT surface the menus
+        are laid out on; self.canvas is the arena at the internal resolution.
+        Either is the window itself when no scaling is needed.
+        """
+        # Backgrounds are per canvas size; rebuild lazily for the new sizes
+        self.backgrounds = {}
+        if self.renderer:
+            # SDL scales the renderer's logical size to the window (and maps the mouse)
+            self.view_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.canvas = self.screen
+            return
+        win_w, win_h = self.window.get_size()
+        # Letterbox: keep the logical aspect ratio inside any window size
+        fit = min(win_w / SCREEN_WIDTH, win_h / SCREEN_HEIGHT)
+        w, h = max(1, int(SCREEN_WIDTH * fit)), max(1, int(SCREEN_HEIGHT * fit))
+        self.view_rect = pygame.Rect((win_w - w)//2, (win_h - h)//2, w, h)
+        self.window.fill((0, 0, 0))
+        self.view_surface = self.window.subsurface(self.view_rect)
+        whole_window = self.view_rect.size == (win_w, win_h)
+
+        if whole_window and self.view_rect.size == (SCREEN_WIDTH, SCREEN_HEIGHT):
+            self.screen = self.window
+        else:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        size = tuple(self.resolution or self.view_rect.size)
+        if whole_window and size == (win_w, win_h):
+            self.canvas = self.window
+        elif size == self.screen.get_size():
+            self.canvas = self.screen
+        else:
+            self.canvas = pygame.Surface(size).convert()
+        self.scene = None
+
+    def present(self, surface):
+        """Scale a finished frame into the window once and flip."""
+        if surface is not self.window:
+            if surface.get_size() == self.view_rect.size:
+                self.window.blit(surface, self.view_rect)
+            else:
+                pygame.transform.scale(surface, self.view_rect.size, self.view_surface)
+        pygame.display.flip()
+
+    def window_to_logical(self, pos):
+        """Map a window pixel (mouse event) to logical SCREEN_WIDTH x SCREEN_HEIGHT coordinates."""
+        r = self.view_rect
+        return (int((pos[0] - r.x) * SCREEN_WIDTH / r.w), int((pos[1] - r.y) * SCREEN_HEIGHT / r.h))
+
+    def background(self, size):
+        """Arena background for a canvas size, built on first use."""
+        key = (tuple(size), tuple(self.arena))
+        bg = self.backgrounds.get(key)
+        if bg is None:
+            bg = self.backgrounds[key] = build_background(*key)
+        return bg
+
+    def scrolling(self):
+        """True when the arena is larger than the screen, so the camera moves."""
+        return tuple(self.arena) != (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def update_camera(self):
+        """Ease the camera toward the live ships (a client's from its snapshot)."""
+        if self.network_role == 'client' and (self.remote_state_interp or self.remote_state):
+            state = self.remote_state_interp or self.remote_state
+            points = [(s.get('x', 0), s.get('y', 0)) for s in state.get('ships', ())
+                      if s.get('health', 1) > 0]
+        else:
+            points = [(ship.x, ship.y) for ship in self.ships if ship.health > 0]
+        k = view_scale(self.canvas)
+        view = (SCREEN_WIDTH, self.canvas.get_height() / k)
+        self.camera.follow(points, view, self.arena, self.clock.get_time() / 1000.0)
+
+    def view_origin(self, surface):
+        """World point at surface's top-left, snapped to its pixels so the
+        background and the sprites scroll together."""
+        if not self.scrolling():
+            return 0, 0
+        k = view_scale(surface)
+        return round(self.camera.x * k) / k, round(self.camera.y * k) / k
+
+    def background_area(self, surface):
+        """Rect of the cached background that shows on surface."""
+        k = view_scale(surface)
+        ox, oy = self.view_origin(surface)
+        return pygame.Rect(round(ox * k), round(oy * k), *surface.get_size())
+
+    def index_scene(self):
+        """Rebuild the culling grid from the ships, bullets and particles.
+
+        Items are (layer, index, entity) so a query sorts back into draw order.
+        """
+        grid = self.scene_grid
+        grid.clear()
+        for ship in self.ships:
+            if ship.health > 0:
+                grid.insert((0, ship.index, ship), *ship_extent(ship))
+        for i, bullet in enumerate(self.bullets):
+            grid.insert((1, i, bullet), *bullet_extent(bullet))
+        for i, particle in enumerate(self.particles):
+            grid.insert((2, i, particle), *particle_extent(particle))
+        self.scene_snapshot = self.snapshot
+
+    def scaled_font(self, size, k):
+        key = (size, round(k, 3))
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(None, max(8, int(size * k)))
+        return self.fonts[key]
+    
+    def players(self):
+        """(ship_type, color) per slot of the current mode.
+
+        Players 3 and 4 fly player 1's and player 2's ships, in the first
+        colors nobody else has picked.
+        """
+        players = [(self.player1_ship, self.player1_color), (self.player2_ship, self.player2_color)]
+        spare = [color for color in SHIP_COLORS if color not in (self.player1_color, self.player2_color)]
+        for index in range(2, len(MATCH_MODES[self.mode])):
+            players.append((players[index - 2][0], spare[index - 2]))
+        return players
+
+    def remote_slots(self):
+        """Ship slots LAN clients can take, in the order they are handed out."""
+        return list(range(1, len(MATCH_MODES[self.mode])))
+
+    def start_game(self):
+        self.new_team_match(self.players(), self.mode)
+        self.camera.follow([(ship.x, ship.y) for ship in self.ships], self.camera.view, self.arena)
+        self.start_simulation()
+        self.warm_sprites()
+
+        # Start theme music when game starts
+        try:
+            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+        except Exception:
+            pass
+
+    def start_simulation(self):
+        """Hand the new match to a worker process when sim_process mode is on."""
+        self.stop_simulation()
+        if not self.sim_process or self.network_role == 'client':
+            return
+        try:
+            self.sim = SimulationProcess(self)
+        except Exception:
+            self.sim = None  # no shared memory or processes here: simulate in-process
+
+    def stop_simulation(self):
+        if self.sim:
+            self.sim.stop()
+            self.sim = None
+
+    def press_fire(self, ship):
+        if self.sim:
+            self.sim.fire(ship.index, True)
+        else:
+            super().press_fire(ship)
+
+    def release_fire(self, ship):
+        if self.sim:
+            self.sim.fire(ship.index, False)
+        else:
+            super().release_fire(ship)
+
+    def warm_sprites(self):
+        """Pre-tint every ship's damage ramp on a background thread.
+
+        Every hit darkens the ship (and its bullets), which used to mean a
+        smoothscale + tint in the middle of a fight. Covers every render
+        scale the quality governor can pick, every charge size of the
+        bullets, and the mirrored sprite for right-side ships.
+        """
+        if self.renderer:
+            return  # textures are tinted by the renderer at draw time
+        # Same arithmetic as draw_game's scene canvas and Ship/Bullet.draw, for the
+        # arena canvas and the logical screen (game over / settings overlay)
+        widths = {self.canvas.get_width(), SCREEN_WIDTH}
+        scales = sorted({max(1, int(width * level["render_scale"])) / SCREEN_WIDTH
+                         for width in widths for level in QUALITY_LEVELS})
+        sizes = [int(SHIP_SIZE * k) for k in scales]
+        jobs = []
+        for ship in self.ships:
+            colors = [damage_color(ship.original_color, h, ship.max_health)
+                      for h in range(int(ship.max_health), -1, -1)]
+            widths = [BULLET_SIZE * 2 + level * BULLET_SIZE for level in range(ship.max_bullets)]
+            bullet_sizes = sorted({max(4, int(w * k)) for w in widths for k in scales})
+            jobs.append((ship, colors, bullet_sizes))
+
+        def work():
+            try:
+                for ship, colors, bullet_sizes in jobs:
+                    for size in sizes:
+                        warm_ship_colors(ship.type, colors, size, not ship.is_left)
+                    warm_bullet_sprites(ship.bullet_shape, colors, bullet_sizes)
+            except Exception:
+                pass
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def warm_menu_sprites(self):
+        """Tint every ship in every menu color for the selection previews, in the background."""
+        ship_names = list(self.ship_names)
+
+        def work():
+            try:
+                for ship_type in ship_names:
+                    warm_ship_colors(ship_type, SHIP_COLORS, 120)
+            except Exception:
+                pass
+
+        threading.Thread(target=work, daemon=True).start()
+
+    # Networking helpers
+    def snapshot_state(self, snapshot=None):
+        """Serializable dict of a published WorldSnapshot (default: the latest).
+
+        Safe to call from any thread: it only reads the frozen snapshot.
+        """
+        snapshot = snapshot or self.snapshot
+        if snapshot is None:
+            return {}
+        return {
+            'ship1': snapshot.ship1._asdict(),
+            'ship2': snapshot.ship2._asdict(),
+            'ships': [s._asdict() for s in snapshot.ships],
+            'bullets': [b._asdict() for b in snapshot.bullets],
+            'arena': list(self.arena),
+        }
+
+    def start_host(self, port=50007):
+        if self.network_peer:
+            try:
+                self.network_peer.stop()
+            except Exception:
+                pass
+        self.network_peer = NetworkHost(self, port)
+        self.network_role = 'host'
+
+    def connect_to(self, host_ip, port=50007):
+        if self.network_peer:
+            try:
+                self.network_peer.stop()
+            except Exception:
+                pass
+        self.network_peer = NetworkClient(self, host_ip, port)
+        self.network_role = 'client'
+
+    def stop_network(self):
+        if self.network_peer:
+            try:
+                self.network_peer.stop()
+            except Exception:
+                pass
+        self.network_peer = None
+        self.network_role = None
+
+    def net_stats(self):
+        """Statistics of the current connection as a dict, or None when offline."""
+        peer = self.network_peer
+        if not peer:
+            return None
+        try:
+            stats = peer.stats()
+        except Exception:
+            return None
+        stats["role"] = self.network_role
+        return stats
+
+    def dump_net_stats(self):
+        stats = self.net_stats()
+        if stats is None:
+            return
+        try:
+            tmp = self.net_stats_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(stats, f, indent=2)
+            os.replace(tmp, self.net_stats_path)
+        except Exception:
+            pass
+
+    def update(self):
+        if self.net_stats_path and self.network_peer and time.time() - self.net_stats_dumped >= 1.0:
+            self.net_stats_dumped = time.time()
+            self.dump_net_stats()
+        if self.state == "playing":
+            # Keyboard-only input: read key state directly
+            keys = pygame.key.get_pressed()
+
+            # Networking: if client, send local input to host and skip local physics
+            if self.network_role == 'client':
+                try:
+                    self.network_peer.record_input(pack_input(
+                        keys[K_UP], keys[K_DOWN], keys[K_LEFT], keys[K_RIGHT], keys[K_RETURN]))
+                except Exception:
+                    pass
+
+                # Perform interpolation towards latest authoritative snapshot for smooth visuals
+                try:
+                    target = getattr(self, 'remote_state_target', None)
+                    if target:
+                        self.arena = tuple(target.get('arena', self.arena))
+                        # Hosts that predate team matches only send ship1/ship2
+                        ships = target.get('ships') or [target.get('ship1', {}), target.get('ship2', {})]
+                        if not self.remote_state_interp or len(self.remote_state_interp['ships']) != len(ships):
+                            # Initialize interp with a shallow copy of the target
+                            self.remote_state_interp = {'ships': [dict(s) for s in ships],
+                                                        'bullets': list(target.get('bullets', []))}
+                        else:
+                            # Interpolate ship positions
+                            for tgt, cur in zip(ships, self.remote_state_interp['ships']):
+                                if not tgt or not cur:
+                                    continue
+                                for coord in ('x', 'y'):
+                                    try:
+                                        tval = float(tgt.get(coord, cur.get(coord, 0)))
+                                        cval = float(cur.get(coord, tval))
+                                        cur[coord] = cval + (tval - cval) * self.interp_alpha
+                                    except Exception:
+                                        pass
+                                # Snap health and bullets to authoritative values
+                                try:
+                                    cur['health'] = tgt.get('health', cur.get('health'))
+                                    cur['bullets'] = tgt.get('bullets', cur.get('bullets'))
+                                except Exception:
+                                    pass
+                            # Replace bullets array (interpolating bullets is expensive; use direct snapshot)
+                            try:
+                                self.remote_state_interp['bullets'] = list(target.get('bullets', []))
+                            except Exception:
+                                pass
+                        self.remote_state_time = time.time()
+                except Exception:
+                    pass
+
+                # Do not run authoritative physics locally; rendering will use interpolated snapshot below
+                return
+
+            # If host, apply remote client inputs (if any) to the ships they steer
+            ship_keys = [keys] * len(self.ships)
+            if self.network_role == 'host':
+                for ship in self.ships[1:]:
+                    # Apply every change the client sent since last tick in order, so a
+                    # tap whose press and release arrive together still fires;
+                    # None means the client left
+                    inputs = self.remote_inputs[ship.index]
+                    while inputs:
+                        bits = self.remote_input_bits[ship.index] = inputs.popleft()
+                        self.set_fire(ship, bits is not None and bool(bits & INPUT_FIRE))
+                    if self.remote_input_bits[ship.index] is not None:
+                        ship_keys[ship.index] = input_keymap(self.remote_input_bits[ship.index],
+                                                             ship.controls)
+
+            if self.sim and not self.sim.alive():
+                # Worker died: carry on in-process from the last mirrored tick
+                self.stop_simulation()
+            if self.sim:
+                self.sim.tick(self, ship_keys)
+                self.sim.sync(self, wait=SIM_SYNC_WAIT)
+            else:
+                self.step(ship_keys[0], ship_keys[1], others=ship_keys[2:])
+    
+    def draw(self):
+        if self.sim and self.state == "playing":
+            self.sim.sync(self)
+        # Sounds of the ticks since the last frame, duplicates collapsed
+        audio.flush()
+        # The arena renders at the internal resolution; menus and overlays on the logical screen
+        in_play = self.state == "playing" and not self.settings_open
+        target = self.canvas if in_play else self.screen
+        # The arena screens paint their own cached background in draw_game
+        arena = self.state in ("playing", "game_over")
+        if arena and self.scrolling():
+            self.update_camera()
+        if self.renderer:
+            # Background is a texture under the sprites; the arena overlay stays transparent
+            self.renderer.begin(BACKGROUND_COLOR, self.background(self.screen.get_size()) if arena else None,
+                                self.background_area(self.screen) if arena and self.scrolling() else None)
+            if not arena:
+                self.screen.fill(BACKGROUND_COLOR)
+        elif not arena:
+            target.fill(BACKGROUND_COLOR)
+        
+        if self.state == "menu":
+            self.draw_menu()
+        elif self.state == "playing":
+            self.draw_game(target)
+        elif self.state == "game_over":
+            self.draw_game_over()
+        elif self.state == "help":
+            self.draw_help()
+        
+        # Draw settings overlay if open
+        if self.settings_open:
+            self.draw_settings_menu()
+        
+        if self.renderer:
+            self.renderer.present()
+        else:
+            self.present(target)
+    
+    def draw_settings_menu(self):
+        """Draw the settings menu overlay"""
+        # Semi-transparent background
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        self.screen.blit(overlay, (0, 0))
+        
+        # Settings panel with border
+        panel_width = 700
+        panel_height = 520
+        panel_x = SCREEN_WIDTH//2 - panel_width//2
+        panel_y = 40
+        
+        # Draw panel with border
+        pygame.draw.rect(self.screen, SETTINGS_BG_COLOR, 
+                        (panel_x, panel_y, panel_width, panel_height))
+        pygame.draw.rect(self.screen, SETTINGS_TEXT_COLOR, 
+                        (panel_x, panel_y, panel_width, panel_height), 2)
+        
+        # Title with underline
+        title = self.font.render("Settings", True, SETTINGS_TEXT_COLOR)
+        title_x = SCREEN_WIDTH//2 - title.get_width()//2
+        title_y = panel_y + 20
+        self.screen.blit(title, (title_x, title_y))
+        
+        # Underline
+        pygame.draw.line(self.screen, SETTINGS_TEXT_COLOR,
+                        (panel_x + 50, title_y + 35),
+                        (panel_x + panel_width - 50, title_y + 35), 2)
+        
+        # Volume section title
+        volume_title = self.font.render("Volume Controls", True, SETTINGS_TEXT_COLOR)
+        volume_y = title_y + 70
+        self.screen.blit(volume_title, (panel_x + 50, volume_y))
+        
+        # Volume controls with consistent spacing
+        bar_width = 400
+        bar_height = 15
+        bar_x = panel_x + (panel_width - bar_width) // 2
+        
+        # Music volume with label and percentage
+        music_y = volume_y + 50
+        self.draw_volume_bar(bar_x, music_y, bar_width, bar_height, 
+                           self.settings["music_volume"], "Background Music")
+        
+        # Sound effects volume
+        sfx_y = music_y + 60
+        self.draw_volume_bar(bar_x, sfx_y, bar_width, bar_height,
+                           self.settings["sfx_volume"], "Sound Effects")
+        
+        # Key bindings
+        self.draw_key_bindings()
+        
+        # Reset button
+        pygame.draw.rect(self.screen, (100, 100, 100), 
+                        (SCREEN_WIDTH//2 - 100, 500, 200, 40))
+        reset_text = self.font.render("Reset to Default", True, SETTINGS_TEXT_COLOR)
+        self.screen.blit(reset_text, 
+                        (SCREEN_WIDTH//2 - reset_text.get_width()//2, 510))
+        # Close (X) button at top-left of settings panel
+        close_rect = pygame.Rect(panel_x + panel_width - 34, panel_y + 6, 28, 28)
+        pygame.draw.rect(self.screen, (180, 60, 60), close_rect)
+        x_text = self.font.render("X", True, (255, 255, 255))
+        self.screen.blit(x_text, (close_rect.x + (close_rect.w - x_text.get_width())//2, close_rect.y + (close_rect.h - x_text.get_height())//2))
+    
+    def draw_key_bindings(self):
+        """Draw key binding options in two columns"""
+        panel_x = SCREEN_WIDTH//2 - 350  # Align with panel
+        base_y = 280  # Start below volume controls
+        spacing = 35
+        section_spacing = 20
+        
+        # Controls section title
+        controls_title = self.font.render("Controls", True, SETTINGS_TEXT_COLOR)
+        self.screen.blit(controls_title, (panel_x + 50, base_y))
+        base_y += 50
+        
+        # Column headers
+        p1_title = self.font.render("Player 1", True, SETTINGS_TEXT_COLOR)
+        p2_title = self.font.render("Player 2", True, SETTINGS_TEXT_COLOR)
+        self.screen.blit(p1_title, (panel_x + 150 - p1_title.get_width()//2, base_y))
+        self.screen.blit(p2_title, (panel_x + 500 - p2_title.get_width()//2, base_y))
+        base_y += 30
+        
+        # Draw separating line
+        pygame.draw.line(self.screen, SETTINGS_TEXT_COLOR,
+                        (panel_x + 325, base_y - 20),
+                        (panel_x + 325, base_y + spacing * 5), 1)
+        
+        # Key bindings in two columns
+        keys = [("Up", "_up"), ("Down", "_down"), ("Left", "_left"), 
+                ("Right", "_right"), ("Fire", "_fire")]
+        
+        for i, (label, suffix) in enumerate(keys):
+            y = base_y + (spacing + section_spacing) * i
+            # Player 1 controls (left column)
+            self.draw_key_option(label, "p1" + suffix, panel_x + 100, y)
+            # Player 2 controls (right column)
+            self.draw_key_option(label, "p2" + suffix, panel_x + 450, y)
+    
+    def draw_key_option(self, label, key, x, y):
+        """Draw a single key binding option with improved visuals"""
+        # Label
+        text = self.small_font.render(f"{label}: ", True, SETTINGS_TEXT_COLOR)
+        text_x = x - text.get_width()
+        self.screen.blit(text, (text_x, y + 2))  # Vertical align with button
+        
+        # Key button with border
+        button_width = 120
+        button_height = 25
+        button_color = SETTINGS_HIGHLIGHT if self.remapping_key == key else SETTINGS_BAR_BG
+        
+        # Draw button background
+        pygame.draw.rect(self.screen, button_color, 
+                        (x, y, button_width, button_height))
+        # Draw button border
+        pygame.draw.rect(self.screen, SETTINGS_TEXT_COLOR, 
+                        (x, y, button_width, button_height), 1)
+        
+        # Key name centered in button
+        key_name = pygame.key.name(self.settings[key]).upper()
+        key_text = self.small_font.render(key_name, True, SETTINGS_TEXT_COLOR)
+        text_x = x + (button_width - key_text.get_width()) // 2
+        text_y = y + (button_height - key_text.get_height()) // 2
+        self.screen.blit(key_text, (text_x, text_y))
+        
+        # Visual indicator if being remapped
+        if self.remapping_key == key:
+            pygame.draw.rect(self.screen, SETTINGS_TEXT_COLOR, 
+                           (x, y, button_width, button_height), 2)
+    
+    def get_key_remap_areas(self):
+        """Get rectangles for all key remap buttons"""
+        areas = {}
+        panel_x = SCREEN_WIDTH//2 - 350
+        # Match draw_key_bindings layout: after title+headers the first key y is 360
+        base_y = 360
+        button_width = 120
+        button_height = 25
+        row_spacing = 55  # spacing + section_spacing in draw_key_bindings
+
+        p1_x = panel_x + 100
+        p2_x = panel_x + 450
+
+        keys_p1 = ["p1_up", "p1_down", "p1_left", "p1_right", "p1_fire"]
+        keys_p2 = ["p2_up", "p2_down", "p2_left", "p2_right", "p2_fire"]
+
+        for i, key in enumerate(keys_p1):
+            areas[key] = pygame.Rect(p1_x, base_y + row_spacing * i, button_width, button_height)
+
+        for i, key in enumerate(keys_p2):
+            areas[key] = pygame.Rect(p2_x, base_y + row_spacing * i, button_width, button_height)
+
+        return areas
+    
+    def draw_menu(self):
+        # Title: prefer APK title image if available
+        title_img = load_image('Title_Fill_A.png') or load_image('Title_Fill_L.png')
+        if title_img:
+            img = pygame.transform.smoothscale(title_img, (min(600, title_img.get_width()), int(title_img.get_height() * 600 / max(1, title_img.get_width()))))
+            self.screen.blit(img, (SCREEN_WIDTH//2 - img.get_width()//2, 20))
+            title_y = 20 + img.get_height() + 8
+        else:
+            # Fallback text title
+            title_font = pygame.font.SysFont(None, 72)
+            title = title_font.render("2D-Flox", True, FONT_COLOR)
+            self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
+            title_y = 50 + title.get_height() + 8
+        
+        # Settings icon
+        self.draw_settings_icon()
+        
+        # Version number
+        version_text = self.small_font.render(f"v{GAME_VERSION}", True, (150, 150, 150))
+        self.screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, 10))
+        
+        # Draw divider line
+        pygame.draw.line(self.screen, BORDER_COLOR, (SCREEN_WIDTH//2, 100), (SCREEN_WIDTH//2, SCREEN_HEIGHT - 100), 2)
+        
+        # Player 1 section (left)
+        p1_title = self.font.render("PLAYER 1", True, self.player1_color)
+        self.screen.blit(p1_title, (SCREEN_WIDTH//4 - p1_title.get_width()//2, title_y + 10))
+        
+        # Player 1 name
+        p1_name_text = self.font.render("Name: " + self.player1_name, True, 
+                                       HIGHLIGHT_COLOR if self.input_active == "player1" else FONT_COLOR)
+        self.screen.blit(p1_name_text, (SCREEN_WIDTH//4 - p1_name_text.get_width()//2, 150))
+        
+        # Player 1 ship and preview
+        p1_ship_text = self.font.render("Ship: " + self.player1_ship, True, 
+                                       HIGHLIGHT_COLOR if self.input_active == "ship1" else FONT_COLOR)
+        self.screen.blit(p1_ship_text, (SCREEN_WIDTH//4 - p1_ship_text.get_width()//2, title_y + 80))
+        # preview sprite
+        p1_preview = get_ship_sprite(self.player1_ship, self.player1_color, 120)
+        if p1_preview:
+            r = p1_preview.get_rect(center=(SCREEN_WIDTH//4, title_y + 80 + 80))
+            self.screen.blit(p1_preview, r)
+        
+        # Player 1 color
+        pygame.draw.rect(self.screen, self.player1_color, (SCREEN_WIDTH//4 - 50, 290, 100, 30))
+        pygame.draw.rect(self.screen, HIGHLIGHT_COLOR if self.input_active == "color1" else FONT_COLOR, 
+                        (SCREEN_WIDTH//4 - 50, 290, 100, 30), 2)
+        
+        # Player 2 section (right)
+        p2_title = self.font.render("PLAYER 2", True, self.player2_color)
+        self.screen.blit(p2_title, (3*SCREEN_WIDTH//4 - p2_title.get_width()//2, title_y + 10))
+        
+        # Player 2 name
+        p2_name_text = self.font.render("Name: " + self.player2_name, True, 
+                                       HIGHLIGHT_COLOR if self.input_active == "player2" else FONT_COLOR)
+        self.screen.blit(p2_name_text, (3*SCREEN_WIDTH//4 - p2_name_text.get_width()//2, 150))
+        
+        # Player 2 ship and preview
+        p2_ship_text = self.font.render("Ship: " + self.player2_ship, True, 
+                                       HIGHLIGHT_COLOR if self.input_active == "ship2" else FONT_COLOR)
+        self.screen.blit(p2_ship_text, (3*SCREEN_WIDTH//4 - p2_ship_text.get_width()//2, title_y + 80))
+        p2_preview = get_ship_sprite(self.player2_ship, self.player2_color, 120)
+        if p2_preview:
+            r2 = p2_preview.get_rect(center=(3*SCREEN_WIDTH//4, title_y + 80 + 80))
+            self.screen.blit(p2_preview, r2)
+        
+        # Player 2 color
+        pygame.draw.rect(self.screen, self.player2_color, (3*SCREEN_WIDTH//4 - 50, 290, 100, 30))
+        pygame.draw.rect(self.screen, HIGHLIGHT_COLOR if self.input_active == "color2" else FONT_COLOR, 
+                        (3*SCREEN_WIDTH//4 - 50, 290, 100, 30), 2)
+        
+        # Host / Join controls (use icons if available)
+        host_w = 220
+        host_h = 48
+        host_x = SCREEN_WIDTH//2 - host_w - 20
+        host_y = SCREEN_HEIGHT - 160
+        join_x = SCREEN_WIDTH//2 + 20
+        join_y = host_y
+
+        # Draw host button
+        host_rect = pygame.Rect(host_x, host_y, host_w, host_h)
+        pygame.draw.rect(self.screen, (30,130,200), host_rect)
+        host_text = self.small_font.render("Host (WiFi)", True, (255,255,255))
+        self.screen.blit(host_text, (host_x + 12, host_y + host_h//2 - host_text.get_height()//2))
+
+        # draw join button and IP field
+        join_rect = pygame.Rect(join_x, join_y, host_w, host_h)
+        pygame.draw.rect(self.screen, (50,150,50), join_rect)
+        join_text = self.small_font.render("Join (IP)", True, (255,255,255))
+        self.screen.blit(join_text, (join_x + 12, join_y + host_h//2 - join_text.get_height()//2))
+
+        # IP input field under join
+        ip_field = pygame.Rect(join_x, join_y + host_h + 8, host_w, 34)
+        pygame.draw.rect(self.screen, (20,20,20), ip_field)
+        pygame.draw.rect(self.screen, FONT_COLOR if self.input_active == 'connect_ip' else (100,100,100), ip_field, 2)
+        ip_text = self.small_font.render(self.connect_ip or "Enter host IP...", True, (200,200,200))
+        self.screen.blit(ip_text, (ip_field.x + 8, ip_field.y + 6))
+
+        # store regions for click handling
+        self.menu_regions['host'] = host_rect
+        self.menu_regions['join'] = join_rect
+        self.menu_regions['ip_field'] = ip_field
+
+        # Preview panels (compact)
+        panel_width = 150
+        panel_height = 150
+        panel_y = 380
+        
+        # Left preview panel - 30% from left edge
+        left_panel_x = SCREEN_WIDTH * 0.3 - panel_width//2
+        pygame.draw.rect(self.screen, (0, 0, 0), 
+                        (left_panel_x, panel_y, panel_width, panel_height))
+        pygame.draw.rect(self.screen, (50, 50, 50),  # subtle border
+                        (left_panel_x, panel_y, panel_width, panel_height), 2)
+        left_ship = Ship(left_panel_x + panel_width//2, panel_y + panel_height//2, 
+                        self.player1_ship, self.player1_color, {}, True)
+        draw_ship(left_ship, self.screen)
+        
+        # Right preview panel - 70% from left edge
+        right_panel_x = SCREEN_WIDTH * 0.7 - panel_width//2
+        pygame.draw.rect(self.screen, (0, 0, 0),
+                        (right_panel_x, panel_y, panel_width, panel_height))
+        pygame.draw.rect(self.screen, (50, 50, 50),  # subtle border
+                        (right_panel_x, panel_y, panel_width, panel_height), 2)
+        right_ship = Ship(right_panel_x + panel_width//2, panel_y + panel_height//2,
+                         self.player2_ship, self.player2_color, {}, False)
+        draw_ship(right_ship, self.screen)
+        # Minimal descriptions below previews (avoid overlap)
+        left_config = SHIPS[self.player1_ship]
+        right_config = SHIPS[self.player2_ship]
+        left_panel_center_x = SCREEN_WIDTH * 0.3
+        right_panel_center_x = SCREEN_WIDTH * 0.7
+        left_desc = self.small_font.render(left_config.get("description", ""), True, FONT_COLOR)
+        right_desc = self.small_font.render(right_config.get("description", ""), True, FONT_COLOR)
+        self.screen.blit(left_desc, (left_panel_center_x - left_desc.get_width()//2, panel_y + panel_height + 8))
+        self.screen.blit(right_desc, (right_panel_center_x - right_desc.get_width()//2, panel_y + panel_height + 8))
+        
+        # Match mode button (click to cycle)
+        mode_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, 400, 200, 36)
+        pygame.draw.rect(self.screen, (60, 60, 90), mode_rect)
+        mode_text = self.small_font.render("MODE: " + self.mode.upper(), True, FONT_COLOR)
+        self.screen.blit(mode_text, (mode_rect.centerx - mode_text.get_width()//2,
+                                     mode_rect.centery - mode_text.get_height()//2))
+        self.menu_regions['mode'] = mode_rect
+
+        # Start button
+        pygame.draw.rect(self.screen, (0, 150, 0), (SCREEN_WIDTH//2 - 100, 450, 200, 40))
+        start_text = self.font.render("START GAME", True, FONT_COLOR)
+        self.screen.blit(start_text, (SCREEN_WIDTH//2 - start_text.get_width()//2, 460))
+        
+        # Info button
+        pygame.draw.rect(self.screen, (100, 100, 100), (SCREEN_WIDTH//2 - 100, 520, 200, 40))
+        info_text = self.font.render("INFO", True, FONT_COLOR)
+        self.screen.blit(info_text, (SCREEN_WIDTH//2 - info_text.get_width()//2, 530))
+        
+        # Instructions
+        instr_text = self.small_font.render("Use TAB to navigate, LEFT/RIGHT to change selection, ENTER to confirm", True, (150, 150, 150))
+        self.screen.blit(instr_text, (SCREEN_WIDTH//2 - instr_text.get_width()//2, SCREEN_HEIGHT - 30))
+    
+    def draw_game(self, surface=None):
+        surface = surface or self.screen
+        scale = self.quality.settings["render_scale"]
+        if scale < 1.0 and not self.renderer:
+            # Under load: render the arena at reduced resolution and scale it up
+            width, height = surface.get_size()
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            if self.scene is None or self.scene.get_size() != size:
+                self.scene = pygame.Surface(size).convert()
+            self.scene.blit(self.background(size), (0, 0), self.background_area(self.scene))
+            self.draw_world(self.scene)
+            pygame.transform.scale(self.scene, surface.get_size(), surface)
+        else:
+            if not self.renderer:
+                # One opaque copy replaces the fill + divider redraw
+                surface.blit(self.background(surface.get_size()), (0, 0), self.background_area(surface))
+            self.draw_world(surface)
+
+        # Draw player names only - health indicated by ship color dimming
+        k = view_scale(surface)
+        font = self.small_font if k == 1 else self.scaled_font(24, k)
+        p1_name = font.render(self.player1_name, True, self.player1_color)
+        p2_name = font.render(self.player2_name, True, self.player2_color)
+        surface.blit(p1_name, (int(20 * k), int(20 * k)))
+        surface.blit(p2_name, (surface.get_width() - p2_name.get_width() - int(20 * k), int(20 * k)))
+        # Players 3 and 4 go under the name on their side
+        for ship in self.ships[2:]:
+            name = font.render(self.player_name(ship.index), True, ship.original_color)
+            x = int(20 * k) if ship.is_left else surface.get_width() - name.get_width() - int(20 * k)
+            surface.blit(name, (x, int(20 * k) + font.get_linesize() * (ship.index // 2)))
+        # No on-screen touch controls rendered (keyboard-only mode)
+        if self.show_net_stats and self.network_peer:
+            self.draw_net_stats(surface)
+
+    def draw_net_stats(self, surface):
+        """Connection statistics overlay (F3), bottom-left of the arena."""
+        stats = self.net_stats()
+        if not stats:
+            return
+        ms = lambda v: "-" if v is None else f"{v:.1f} ms"
+        lines = [
+            f"{self.network_role}: {'connected' if stats.get('connected') else 'waiting'}",
+            f"RTT {ms(stats['rtt_ms'])}  min {ms(stats['rtt_min_ms'])}  jitter {ms(stats['jitter_ms'])}",
+            f"in {stats['in_bytes_per_s'] / 1024:.1f} KB/s  out {stats['out_bytes_per_s'] / 1024:.1f} KB/s",
+        ]
+        if self.network_role == 'client':
+            tick = stats.get('host_tick')
+            lines.append(f"clock offset {ms(stats.get('clock_offset_ms'))}  "
+                         f"host tick {'-' if tick is None else int(tick)}")
+            lines.append(f"snapshot every {ms(stats['snapshot_interval_ms'])} "
+                         f"(+/- {ms(stats['snapshot_interval_dev_ms'])})  "
+                         f"age {ms(stats['snapshot_age_ms'])}, max {ms(stats['snapshot_age_max_ms'])}")
+        else:
+            lines.append(f"send queue {stats.get('queued_bytes', 0)} B  "
+                         f"stale snapshots dropped {stats.get('dropped', 0)}")
+        k = view_scale(surface)
+        font = self.small_font if k == 1 else self.scaled_font(24, k)
+        step = font.get_linesize()
+        y = surface.get_height() - int(20 * k) - step * len(lines)
+        for line in lines:
+            surface.blit(font.render(line, True, FONT_COLOR), (int(20 * k), y))
+            y += step
+
+    def draw_world(self, surface):
+        """Draw ships, bullets and particles onto surface (any resolution).
+
+        The background and divider come from the cached layer (see background()).
+        On a scrolling arena only what overlaps the camera's view is drawn.
+        """
+        k = view_scale(surface)
+        ox, oy = origin = self.view_origin(surface)
+        view = (ox, oy, ox + surface.get_width() / k, oy + surface.get_height() / k)
+        # Blits are queued here and go down one Surface.blits per layer
+        batch = self.draw_list
+
+        # Network client: render authoritative snapshot received from host
+        # Prefer interpolated state for smoother visuals, fallback to last raw state
+        if self.network_role == 'client' and (self.remote_state_interp or self.remote_state):
+            try:
+                state = self.remote_state_interp if self.remote_state_interp else self.remote_state
+                peer = self.network_peer
+                peer.net_stats.add_render(peer.snapshot_age())
+                # Draw remote ships, in the host's colors when it sends them
+                ships = state.get('ships') or [state.get('ship1', {}), state.get('ship2', {})]
+                colors = [tuple(s.get('color') or (self.player1_color, self.player2_color)[index % 2])
+                          for index, s in enumerate(ships)]
+                for index, s in enumerate(ships):
+                    if s.get('health', 1) <= 0:
+                        continue
+                    x = s.get('x', 100 if index % 2 == 0 else SCREEN_WIDTH - 100)
+                    y = s.get('y', SCREEN_HEIGHT//2)
+                    if not boxes_overlap(view, (x - SHIP_SIZE, y - SHIP_SIZE, x + SHIP_SIZE, y + SHIP_SIZE)):
+                        continue
+                    img = get_ship_sprite(s.get('type','Zaba'), colors[index], int(SHIP_SIZE * k))
+                    if img:
+                        r = img.get_rect(center=(int((x - ox) * k), int((y - oy) * k)))
+                        batch.add(LAYER_SHIPS, img, r)
+
+                # Draw bullets from snapshot, tinted like the ship that fired them
+                for b in state.get('bullets', []):
+                    half = max(b.get('w', 8), b.get('h', 8))
+                    if not boxes_overlap(view, (b.get('x', 0) - half, b.get('y', 0) - half,
+                                                b.get('x', 0) + half, b.get('y', 0) + half)):
+                        continue
+                    bx = (b.get('x', 0) - ox) * k
+                    by = (b.get('y', 0) - oy) * k
+                    btype = b.get('ship_type', 'Zaba')
+                    bshape = SHIPS.get(btype, {}).get('bullet_shape', 'circle')
+                    owner = b.get('owner')
+                    bcolor = colors[owner] if owner is not None and owner < len(colors) else self.player1_color
+                    bsprite = get_bullet_sprite(bshape, max(4, int(b.get('w', 8) * k)), bcolor)
+                    if bsprite:
+                        rect = bsprite.get_rect(center=(int(bx), int(by)))
+                        batch.add(LAYER_BULLETS, bsprite, rect)
+                    else:
+                        img, (cx, cy) = circle_image(int(max(2, b.get('w', 6) * k//2)), bcolor)
+                        batch.add(LAYER_BULLETS, img, (int(bx) - cx, int(by) - cy))
+                batch.flush(surface)
+                return
+            except Exception:
+                pass
+
+        # Draw ships and bullets blended between the last two ticks
+        alpha = self.render_alpha if self.state == "playing" else 1.0
+        # Sprites go through the texture renderer when drawing at full size
+        renderer = self.renderer if self.renderer and surface is self.renderer.overlay else None
+        if self.scrolling():
+            # Cull through the grid: only entities whose drawing can reach the view
+            if self.scene_snapshot is not self.snapshot:
+                self.index_scene()
+            visible = self.scene_grid.query(*view)
+            visible.sort(key=lambda item: item[:2])
+            ships = [entity for layer, _, entity in visible if layer == 0]
+            bullets = [entity for layer, _, entity in visible if layer == 1]
+            particles = [entity for layer, _, entity in visible if layer == 2]
+        else:
+            ships = [ship for ship in self.ships if ship.health > 0]
+            bullets, particles = self.bullets, self.particles
+        for ship in ships:
+            draw_ship(ship, surface, alpha, renderer, origin, batch)
+        # Beams draw straight away (one shared surface), so put the ships down first
+        batch.flush(surface)
+
+        # Draw bullets
+        for bullet in bullets:
+            draw_bullet(bullet, surface, alpha, renderer, origin, batch)
+        for particle in particles:
+            draw_particle(particle, surface, origin, batch)
+        batch.flush(surface)
+    
+    def draw_game_over(self):
+        self.draw_game()
+        
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        self.screen.blit(overlay, (0, 0))
+        
+        winner_font = pygame.font.SysFont(None, 72)
+        winner_text = winner_font.render(f"{self.winner} WINS!", True, HIGHLIGHT_COLOR)
+        self.screen.blit(winner_text, (SCREEN_WIDTH//2 - winner_text.get_width()//2, SCREEN_HEIGHT//2 - 50))
+        
+        restart_text = self.font.render("Press ENTER to return to menu", True, FONT_COLOR)
+        self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT//2 + 50))
+    
+    def draw_help(self):
+        # Fill with help screen background color
+        self.screen.fill(HELP_BG_COLOR)
+        
+        title_font = pygame.font.SysFont(None, 72)
+        title = title_font.render("INFO", True, HELP_TEXT_COLOR)
+        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 30))
+        
+        help_lines = [
+            "CONTROLS:",
+            "Player 1: WASD to move, SPACE to shoot (tap for single, hold for charged)",
+            "Player 2: ARROW KEYS to move, ENTER to shoot (tap for single, hold for charged)",
+            "Players 3 / 4 (2V2, FFA): IJKL + U / NUMPAD 8456 + 0",
+            "",
+            "GAMEPLAY:",
+            "- Ships cannot cross the center line",
+            "- Bullets can pass through the center line",
+            "- Health decreases when hit by bullets",
+            "- Ships dim in color as they take damage",
+            "- The last team with a ship left wins",
+            "",
+            "SHIP TYPES:",
+            "- Zaba: Square ship with charged block attack",
+            "- Rekin: Fast triangle ship with triple shot", 
+            "- Osa: Rapid-fire circular ship",
+            "- Komar: Laser-based kite ship",
+            "- Kombuz: Hexagonal mine-layer ship",
+            "",
+            "=== CREDITS ===",
+            "Author: Voltsparx (AKA Niyor Kalita)",
+            "Contact: voltsparx@gmail.com",
+            "",
+            "Dedication:",
+            "Dedicated to the Voltros Community",
+            "Especially dedicated to the person named Lovely Thakuria.",
+            "",
+            "=== AUDIO CREDITS ===",
+            "Background Music: Redlight_Chill",
+            "Menu Sound Effects: Voltsparx",
+            "",
+            f"2D-Flox v{GAME_VERSION}",
+            "Based on DUAL! by Seabaa",
+            "",
+            "Press ENTER or ESC to return to menu"
+        ]
+        
+        # Draw text with better vertical spacing
+        for i, line in enumerate(help_lines):
+            # Headers in bold (implement via larger font)
+            if line.startswith("==="):
+                text = self.font.render(line, True, HELP_TEXT_COLOR)
+                y_offset = 100 + i * 22  # slightly tighter spacing
+            else:
+                text = self.small_font.render(line, True, HELP_TEXT_COLOR)
+                y_offset = 100 + i * 22  # slightly tighter spacing
+            self.screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, y_offset))
+    
+    def run(self):
+        # Fixed timestep: real time feeds an accumulator that is drained in TICK_TIME
+        # steps, so the game runs at the same speed on slow and fast machines, and
+        # frames in between ticks are interpolated.
+        previous = time.perf_counter()
+        accumulator = 0.0
+        while True:
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+
+            self.handle_events()
+            ticks = 0
+            while accumulator >= TICK_TIME and ticks < MAX_TICKS_PER_FRAME:
+                self.update()
+                accumulator -= TICK_TIME
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME:
+                # Still behind: drop the backlog rather than spiral
+                accumulator = min(accumulator, TICK_TIME)
+
+            self.render_alpha = accumulator / TICK_TIME
+            self.draw()
+            # Busy time of this frame (before the idle wait) drives the quality governor
+            if self.quality.record(time.perf_counter() - now):
+                self.particle_density = self.quality.settings["particles"]
+            self.clock.tick(RENDER_FPS)
@@ -0,0 +1,719 @@
+"""LAN networking: message framing, input packets, host and client threads."""
+import collections
+import json
+import math
+import select
+import socket
+import struct
+import threading
+import time
+
+from .core import FPS, MAX_SHIPS, KeyMap
+
+__all__ = [
+    "SNAPSHOT_INTERVAL", "SEND_QUEUE_MAX_BYTES", "FRAME_HEADER", "MAX_FRAME_SIZE", "INPUT_UP",
+    "INPUT_DOWN", "INPUT_LEFT", "INPUT_RIGHT", "INPUT_FIRE", "INPUT_REDUNDANCY", "INPUT_HEARTBEAT",
+    "INPUT_POLL", "PING_INTERVAL", "NET_STATS_SAMPLES", "CLOCK_SAMPLES", "CLOCK_STEP",
+    "CLOCK_MAX_SLEW", "encode_frame", "encode_message", "pack_input", "input_keymap",
+    "decode_message", "FrameReader", "NetStats", "ClockSync", "SendQueue", "HostClient",
+    "NetworkHost", "NetworkClient"
+]
+
+# Host sends a state snapshot this often
+SNAPSHOT_INTERVAL = 0.05
+# Outbound bytes allowed to pile up for one peer before it counts as stalled
+SEND_QUEUE_MAX_BYTES = 64 * 1024
+# Every message is a 4-byte big-endian length followed by that many bytes of JSON
+FRAME_HEADER = struct.Struct("!I")
+# Larger frames mean a corrupt stream or a misbehaving peer
+MAX_FRAME_SIZE = 256 * 1024
+# Client input is one int of these bits, sent with the tick it changed on
+INPUT_UP = 1
+INPUT_DOWN = 2
+INPUT_LEFT = 4
+INPUT_RIGHT = 8
+INPUT_FIRE = 16
+# Unacknowledged input changes repeated in every input packet
+INPUT_REDUNDANCY = 8
+# Seconds between input packets while nothing changes
+INPUT_HEARTBEAT = 0.25
+# Longest the client waits for host data before checking for new input
+INPUT_POLL = 1.0 / FPS
+# Seconds between client pings
+PING_INTERVAL = 0.5
+# Recent samples kept for snapshot interval and age statistics
+NET_STATS_SAMPLES = 120
+# Ping exchanges the clock offset estimate picks its best sample from
+CLOCK_SAMPLES = 8
+# Offset errors above this are stepped at once, smaller ones slewed
+CLOCK_STEP = 0.01
+# Most the offset in use moves per exchange while slewing (seconds)
+CLOCK_MAX_SLEW = 0.0005
+
+
+def encode_frame(payload):
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_message(msg):
+    return encode_frame(json.dumps(msg, separators=(",", ":")).encode("utf-8"))
+
+
+def pack_input(up, down, left, right, fire):
+    return ((INPUT_UP if up else 0) | (INPUT_DOWN if down else 0) | (INPUT_LEFT if left else 0)
+            | (INPUT_RIGHT if right else 0) | (INPUT_FIRE if fire else 0))
+
+
+def input_keymap(bits, controls):
+    """KeyMap holding the movement keys in bits for a ship with these controls."""
+    return KeyMap({
+        controls['up']: bool(bits & INPUT_UP),
+        controls['down']: bool(bits & INPUT_DOWN),
+        controls['left']: bool(bits & INPUT_LEFT),
+        controls['right']: bool(bits & INPUT_RIGHT),
+    })
+
+
+def decode_message(frame):
+    """Parse a frame (memoryview) as JSON without copying it to bytes first."""
+    return json.loads(str(frame, "utf-8"))
+
+
+class FrameReader:
+    """Reassembles length-prefixed frames from a stream socket.
+
+    Data is received straight into one preallocated buffer with recv_into and
+    frames come back as memoryview slices of it, so they are only valid until
+    the next recv(). A frame may arrive across any number of recv() calls.
+    """
+    def __init__(self, max_frame=MAX_FRAME_SIZE):
+        self.max_frame = max_frame
+        self.buf = bytearray(FRAME_HEADER.size + max_frame)
+        self.view = memoryview(self.buf)
+        self.start = 0  # first unparsed byte
+        self.end = 0  # end of received data
+
+    def recv(self, sock):
+        """Read whatever sock has into the buffer; returns the byte count, 0 on EOF."""
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.start and len(self.buf) - self.end < len(self.buf) // 4:
+            # Move the partial frame to the front to make room
+            pending = self.end - self.start
+            self.buf[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+        n = sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def frames(self):
+        """Yield each complete frame received so far; ValueError if one is oversized."""
+        header = FRAME_HEADER.size
+        while self.end - self.start >= header:
+            size, = FRAME_HEADER.unpack_from(self.buf, self.start)
+            if size > self.max_frame:
+                raise ValueError(f"frame of {size} bytes exceeds {self.max_frame}")
+            begin = self.start + header
+            if self.end - begin < size:
+                break
+            self.start = begin + size
+            yield self.view[begin:self.start]
+
+
+class NetStats:
+    """Rolling statistics for one connection, updated from any thread.
+
+    Times are time.perf_counter() seconds; as_dict() reports milliseconds
+    and bytes per second over the last completed second.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rtt = None
+        self.rtt_min = None
+        self.jitter = 0.0  # smoothed RTT variation, as in RFC 3550
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.rate_in = 0.0
+        self.rate_out = 0.0
+        self.rate_start = time.perf_counter()
+        self.rate_marks = (0, 0)  # byte totals at rate_start
+        self.snapshots = 0
+        self.last_snapshot = None
+        self.snapshot_gaps = collections.deque(maxlen=NET_STATS_SAMPLES)
+        self.render_ages = collections.deque(maxlen=NET_STATS_SAMPLES)
+
+    def _roll(self, now):
+        elapsed = now - self.rate_start
+        if elapsed >= 1.0:
+            self.rate_in = (self.bytes_in - self.rate_marks[0]) / elapsed
+            self.rate_out = (self.bytes_out - self.rate_marks[1]) / elapsed
+            self.rate_start = now
+            self.rate_marks = (self.bytes_in, self.bytes_out)
+
+    def count_in(self, n):
+        with self.lock:
+            self.bytes_in += n
+            self._roll(time.perf_counter())
+
+    def count_out(self, n):
+        with self.lock:
+            self.bytes_out += n
+            self._roll(time.perf_counter())
+
+    def add_rtt(self, rtt):
+        with self.lock:
+            if self.rtt is not None:
+                self.jitter += (abs(rtt - self.rtt) - self.jitter) / 16.0
+            self.rtt = rtt
+            self.rtt_min = rtt if self.rtt_min is None else min(self.rtt_min, rtt)
+
+    def add_snapshot(self):
+        now = time.perf_counter()
+        with self.lock:
+            if self.last_snapshot is not None:
+                self.snapshot_gaps.append(now - self.last_snapshot)
+            self.last_snapshot = now
+            self.snapshots += 1
+
+    def add_render(self, age=None):
+        """Note the age of the newest snapshot at the moment a frame shows it.
+
+        age defaults to the time since it arrived, which leaves out its transit.
+        """
+        with self.lock:
+            if age is None and self.last_snapshot is not None:
+                age = time.perf_counter() - self.last_snapshot
+            if age is not None:
+                self.render_ages.append(age)
+
+    def as_dict(self):
+        ms = lambda v: None if v is None else round(v * 1000.0, 2)
+        with self.lock:
+            self._roll(time.perf_counter())
+            gaps = list(self.snapshot_gaps)
+            ages = list(self.render_ages)
+            gap_mean = sum(gaps) / len(gaps) if gaps else None
+            gap_dev = (math.sqrt(sum((g - gap_mean) ** 2 for g in gaps) / len(gaps))
+                       if gaps else None)
+            return {
+                "rtt_ms": ms(self.rtt),
+                "rtt_min_ms": ms(self.rtt_min),
+                "jitter_ms": ms(self.jitter),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "in_bytes_per_s": round(self.rate_in, 1),
+                "out_bytes_per_s": round(self.rate_out, 1),
+                "snapshots": self.snapshots,
+                "snapshot_interval_ms": ms(gap_mean),
+                "snapshot_interval_dev_ms": ms(gap_dev),
+                "snapshot_age_ms": ms(sum(ages) / len(ages)) if ages else None,
+                "snapshot_age_max_ms": ms(max(ages)) if ages else None,
+            }
+
+
+class ClockSync:
+    """NTP-style estimate of the host clock from ping/pong timestamps.
+
+    Each exchange gives offset = ((t1 - t0) + (t2 - t3)) / 2 and delay =
+    (t3 - t0) - (t2 - t1), where t0/t3 are client send/receive times and
+    t1/t2 host receive/send times, all time.perf_counter(). The sample with
+    the smallest delay of the last few is the least skewed by queueing and
+    becomes the target; the offset in use slews towards it so the shared
+    timebase never jumps, unless it is off by more than CLOCK_STEP.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = collections.deque(maxlen=CLOCK_SAMPLES)  # (delay, offset)
+        self.offset = None  # host clock minus local clock
+
+    def add(self, t0, t1, t2, t3):
+        """Add one exchange; returns its round-trip delay."""
+        delay = (t3 - t0) - (t2 - t1)
+        with self.lock:
+            self.samples.append((delay, ((t1 - t0) + (t2 - t3)) / 2.0))
+            target = min(self.samples)[1]
+            if self.offset is None or abs(target - self.offset) > CLOCK_STEP:
+                self.offset = target
+            else:
+                self.offset += max(-CLOCK_MAX_SLEW, min(CLOCK_MAX_SLEW, target - self.offset))
+        return delay
+
+    def host_time(self, local=None):
+        """Host clock now (or at local perf_counter time local); None before syncing."""
+        if self.offset is None:
+            return None
+        return (time.perf_counter() if local is None else local) + self.offset
+
+
+class SendQueue:
+    """Bounded outbound queue for one peer, drained with non-blocking sends.
+
+    'state' messages are snapshots that the next one supersedes, so only
+    the newest queued snapshot is kept; every other kind (input acks,
+    control messages) is always delivered. push() returns False when those
+    undroppable messages alone pass max_bytes: the peer is not keeping up.
+    """
+    def __init__(self, sock, max_bytes=SEND_QUEUE_MAX_BYTES, stats=None):
+        self.sock = sock
+        self.max_bytes = max_bytes
+        self.net_stats = stats  # NetStats counting the bytes sent
+        self.pending = collections.deque()  # [kind, payload] not started yet
+        self.current = None  # memoryview of the message being sent
+        self.current_kind = None
+        self.queued_bytes = 0
+        self.reliable_bytes = 0  # queued bytes of messages that are never dropped
+        self.sent_bytes = 0
+        self.sent_messages = 0
+        self.dropped = 0
+        self.dropped_bytes = 0
+
+    def push(self, payload, kind="state"):
+        if kind == "state":
+            # A snapshot still waiting in the queue is stale now
+            for entry in list(self.pending):
+                if entry[0] == "state":
+                    self.pending.remove(entry)
+                    self.queued_bytes -= len(entry[1])
+                    self.dropped += 1
+                    self.dropped_bytes += len(entry[1])
+        self.pending.append((kind, payload))
+        self.queued_bytes += len(payload)
+        if kind != "state":
+            self.reliable_bytes += len(payload)
+        return self.reliable_bytes <= self.max_bytes
+
+    def flush(self):
+        """Send as much as the socket takes without blocking; True when empty."""
+        while True:
+            if self.current is None:
+                if not self.pending:
+                    return True
+                self.current_kind, payload = self.pending.popleft()
+                self.current = memoryview(payload)
+            try:
+                sent = self.sock.send(self.current)
+            except (BlockingIOError, InterruptedError, socket.timeout):
+                return False
+            self.sent_bytes += sent
+            self.queued_bytes -= sent
+            if self.net_stats:
+                self.net_stats.count_out(sent)
+            if self.current_kind != "state":
+                self.reliable_bytes -= sent
+            self.current = self.current[sent:]
+            if not len(self.current):
+                self.current = None
+                self.sent_messages += 1
+
+    def has_pending(self):
+        return self.current is not None or bool(self.pending)
+
+    def stats(self):
+        return {
+            "queued_bytes": self.queued_bytes,
+            "reliable_bytes": self.reliable_bytes,
+            "sent_bytes": self.sent_bytes,
+            "sent_messages": self.sent_messages,
+            "dropped": self.dropped,
+            "dropped_bytes": self.dropped_bytes,
+        }
+
+
+class HostClient:
+    """A client connected to NetworkHost and the ship slot it steers."""
+    def __init__(self, sock, slot):
+        self.sock = sock
+        self.slot = slot
+        self.net_stats = NetStats()
+        self.outbox = SendQueue(sock, stats=self.net_stats)
+        self.reader = FrameReader()
+        self.input_tick = 0  # newest client input tick applied
+        self.rtt = None  # (rtt, rtt_min, jitter) the client measured, sent with its pings
+
+
+class NetworkHost(threading.Thread):
+    """Serves the match to LAN clients, one ship slot each (Game.remote_slots)."""
+    def __init__(self, game, port=50007):
+        super().__init__(daemon=True)
+        self.game = game
+        self.port = port
+        self.sock = None
+        self.clients = []  # HostClient per connection, in join order
+        self.last_client = None  # keeps the statistics once everyone has left
+        self.stalled = 0  # clients dropped for not draining their queue
+        self.running = True
+        self.start()
+
+    def accept_client(self):
+        sock, addr = self.sock.accept()
+        taken = [client.slot for client in self.clients]
+        free = [slot for slot in self.game.remote_slots() if slot not in taken]
+        if not free:
+            sock.close()  # every remote ship already has a pilot
+            return
+        # Non-blocking: a slow client must never stall this loop
+        sock.setblocking(False)
+        # Small messages go out at once instead of waiting on delayed ACKs
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.clients.append(HostClient(sock, free[0]))
+
+    def drop_client(self, client):
+        try:
+            client.sock.close()
+        except Exception:
+            pass
+        if client in self.clients:
+            self.clients.remove(client)
+            # Forget its input: the game thread lets go of fire on the None
+            # and the ship stops steering (also for whoever takes the slot next)
+            inputs = self.game.remote_inputs[client.slot]
+            inputs.clear()
+            inputs.append(None)
+            self.game.remote_input_bits[client.slot] = None
+        self.last_client = client
+
+    def receive_from(self, client):
+        """Read what client sent; False once it has to be dropped.
+
+        That includes a client whose replies (pongs, acks) pile up past the
+        send queue's cap because it stopped reading.
+        """
+        room = True
+        try:
+            received = client.reader.recv(client.sock)
+            arrived = time.perf_counter()
+            if not received:
+                return False
+            client.net_stats.count_in(received)
+            for frame in client.reader.frames():
+                try:
+                    msg = decode_message(frame)
+                    if msg.get('type') == 'input':
+                        room = self.receive_input(msg, client) and room
+                    elif msg.get('type') == 'ping':
+                        # Echo straight back with our receive and send times;
+                        # pongs are never dropped
+                        client.rtt = (msg.get('rtt'), msg.get('rtt_min'), msg.get('jitter'))
+                        room = client.outbox.push(encode_message({'type':'pong','t':msg.get('t'),
+                                                                  'rx':arrived,
+                                                                  'tx':time.perf_counter()}),
+                                                  'pong') and room
+                except Exception:
+                    pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception:
+            # Socket error or a corrupt stream
+            return False
+        if not room:
+            self.stalled += 1
+            return False
+        return True
+
+    def run(self):
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.sock.bind(('0.0.0.0', self.port))
+            self.sock.listen(MAX_SHIPS)
+            next_snapshot = time.time()
+            while self.running:
+                # Wait for a new client, input, room to send, or the next snapshot,
+                # whichever is first
+                clients = list(self.clients)
+                wait = max(0.0, next_snapshot - time.time()) if clients else 1.0
+                try:
+                    readable, writable, _ = select.select(
+                        [self.sock] + [client.sock for client in clients],
+                        [client.sock for client in clients if client.outbox.has_pending()], [], wait)
+                except Exception:
+                    for client in clients:
+                        self.drop_client(client)
+                    continue
+                if self.sock in readable:
+                    try:
+                        self.accept_client()
+                    except Exception:
+                        pass
+
+                # Receive client inputs
+                for client in clients:
+                    if client.sock in readable and not self.receive_from(client):
+                        self.drop_client(client)
+                if not self.clients:
+                    continue
+
+                # Periodically queue authoritative state for the clients
+                if time.time() >= next_snapshot:
+                    next_snapshot = time.time() + SNAPSHOT_INTERVAL
+                    # The published snapshot is frozen, so encoding it never races the game loop
+                    snapshot = getattr(self.game, 'snapshot', None)
+                    # Host tick and the time the tick was published let the client place
+                    # the snapshot in time, queueing delay here included
+                    message = encode_message({'type':'state','tick':snapshot.tick if snapshot else 0,
+                                              'time':snapshot.time if snapshot else time.perf_counter(),
+                                              'state':self.game.snapshot_state(snapshot)})
+                    for client in list(self.clients):
+                        if not client.outbox.push(message, 'state'):
+                            self.stalled += 1
+                            self.drop_client(client)
+
+                for client in list(self.clients):
+                    try:
+                        client.outbox.flush()
+                    except Exception:
+                        self.drop_client(client)
+        finally:
+            try:
+                for client in self.clients:
+                    client.sock.close()
+                if self.sock:
+                    self.sock.close()
+            except Exception:
+                pass
+
+    def receive_input(self, msg, client):
+        """Queue client's input changes newer than the last one seen and acknowledge them.
+
+        inputs is a flat [tick, bits, tick, bits, ...] list; repeats of changes
+        already applied are skipped, so redundant copies are harmless.
+        Returns False if the ack no longer fits the client's send queue.
+        """
+        inputs = msg.get('inputs') or []
+        queue = self.game.remote_inputs[client.slot]
+        for i in range(0, len(inputs) - 1, 2):
+            tick, bits = int(inputs[i]), int(inputs[i + 1])
+            if tick > client.input_tick:
+                client.input_tick = tick
+                queue.append(bits)
+        # Acks are never dropped, so the client can stop repeating these
+        return client.outbox.push(encode_message({'type':'ack','tick':client.input_tick}), 'ack')
+
+    def stats(self):
+        """Connection statistics plus outbound queue counters for the first client
+        (or the last one seen, once nobody is connected)."""
+        clients = list(self.clients)
+        client = clients[0] if clients else self.last_client
+        stats = (client.net_stats if client else NetStats()).as_dict()
+        # The host does not ping; the client reports the RTT it measures
+        if client and client.rtt is not None:
+            for key, value in zip(("rtt_ms", "rtt_min_ms", "jitter_ms"), client.rtt):
+                stats[key] = None if value is None else round(value * 1000.0, 2)
+        if clients:
+            stats.update(client.outbox.stats())
+        stats["connected"] = bool(clients)
+        stats["clients"] = len(clients)
+        stats["stalled_clients"] = self.stalled
+        return stats
+
+    def stop(self):
+        self.running = False
+
+
+class NetworkClient(threading.Thread):
+    def __init__(self, game, host_ip, port=50007):
+        super().__init__(daemon=True)
+        self.game = game
+        self.host_ip = host_ip
+        self.port = port
+        self.sock = None
+        self.running = True
+        self.reader = FrameReader()
+        # Local input, written by the game every tick and sent by this thread
+        self.input_lock = threading.Lock()
+        self.input_tick = 0
+        self.input_bits = None
+        self.input_changed_tick = 0
+        self.unacked = collections.deque(maxlen=INPUT_REDUNDANCY)  # (tick, bits) changes
+        self.input_dirty = False
+        self.last_input_send = 0.0
+        self.last_ping = 0.0
+        self.net_stats = NetStats()
+        self.clock = ClockSync()
+        self.snapshot_tick = None  # host tick and host time of the newest snapshot
+        self.snapshot_time = None
+        self.connected = False
+        self.connecting = False
+        self.should_reconnect = True
+        self.reconnect_delay = 1.0
+        self.reconnect_max = 8.0
+        self.last_error = None
+        self.start()
+
+    def run(self):
+        try:
+            # Main client loop: attempt to connect and, on failure, retry with exponential backoff
+            while self.running and self.should_reconnect:
+                try:
+                    self.connecting = True
+                    self.last_error = None
+                    self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    self.sock.settimeout(5.0)
+                    self.sock.connect((self.host_ip, self.port))
+                    self.sock.settimeout(0.5)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.reader = FrameReader()
+                    self.net_stats = NetStats()
+                    self.clock = ClockSync()
+                    self.snapshot_tick = self.snapshot_time = None
+                    self.connected = True
+                    self.connecting = False
+                    self.reconnect_delay = 1.0
+                    # notify game
+                    try:
+                        self.game.connect_error = None
+                        self.game.connect_status = 'connected'
+                    except Exception:
+                        pass
+
+                    while self.running and self.connected:
+                        # Send local input when it changes, plus a periodic heartbeat
+                        packets = []
+                        packet = self.input_packet()
+                        if packet:
+                            packets.append(encode_message(packet))
+                        if time.perf_counter() - self.last_ping >= PING_INTERVAL:
+                            self.last_ping = time.perf_counter()
+                            stats = self.net_stats
+                            packets.append(encode_message({'type':'ping','t':self.last_ping,
+                                                           'rtt':stats.rtt, 'rtt_min':stats.rtt_min,
+                                                           'jitter':stats.jitter}))
+                        if packets:
+                            try:
+                                payload = b"".join(packets)
+                                self.sock.sendall(payload)
+                                self.net_stats.count_out(len(payload))
+                            except Exception:
+                                # broken pipe -> mark disconnected and break to reconnect
+                                self.connected = False
+                                break
+
+                        # Receive authoritative state, waking at least once a tick for input
+                        try:
+                            readable, _, _ = select.select([self.sock], [], [], INPUT_POLL)
+                            if not readable:
+                                continue
+                            received = self.reader.recv(self.sock)
+                            arrived = time.perf_counter()
+                            if not received:
+                                raise ConnectionError("host closed the connection")
+                            self.net_stats.count_in(received)
+                            for frame in self.reader.frames():
+                                try:
+                                    msg = decode_message(frame)
+                                    if msg.get('type') == 'state':
+                                        self.net_stats.add_snapshot()
+                                        self.snapshot_tick = msg.get('tick')
+                                        self.snapshot_time = msg.get('time')
+                                        # store as target for interpolation
+                                        try:
+                                            self.game.remote_state_target = msg.get('state')
+                                            self.game.remote_state_time = time.time()
+                                            self.game.remote_state_tick = self.snapshot_tick
+                                        except Exception:
+                                            self.game.remote_state = msg.get('state')
+                                    elif msg.get('type') == 'ack':
+                                        self.acknowledge(int(msg.get('tick', 0)))
+                                    elif msg.get('type') == 'pong':
+                                        self.net_stats.add_rtt(self.clock.add(
+                                            float(msg['t']), float(msg['rx']), float(msg['tx']), arrived))
+                                except Exception:
+                                    pass
+                        except socket.timeout:
+                            pass
+                        except Exception as e:
+                            # Connection lost; break to reconnect
+                            self.last_error = str(e)
+                            self.connected = False
+                            break
+
+                except Exception as e:
+                    # Connection attempt failed
+                    self.last_error = str(e)
+                    try:
+                        self.game.connect_error = f"Connect failed: {self.last_error}"
+                        self.game.connect_status = 'disconnected'
+                    except Exception:
+                        pass
+                    # exponential backoff before retry
+                    time.sleep(self.reconnect_delay)
+                    self.reconnect_delay = min(self.reconnect_delay * 2.0, self.reconnect_max)
+                finally:
+                    try:
+                        if self.sock:
+                            self.sock.close()
+                    except Exception:
+                        pass
+                    self.connected = False
+                    self.connecting = False
+                    # short pause before next attempt if still running
+                    time.sleep(0.2)
+        finally:
+            try:
+                if self.sock:
+                    self.sock.close()
+            except Exception:
+                pass
+
+    def record_input(self, bits):
+        """Record this tick's local input bits; called by the game once per tick."""
+        with self.input_lock:
+            self.input_tick += 1
+            if bits != self.input_bits:
+                self.input_bits = bits
+                self.input_changed_tick = self.input_tick
+                self.unacked.append((self.input_tick, bits))
+                self.input_dirty = True
+
+    def input_packet(self):
+        """Input message to send now, or None while idle between heartbeats."""
+        now = time.time()
+        with self.input_lock:
+            if self.input_bits is None:
+                return None
+            if not self.input_dirty and now - self.last_input_send < INPUT_HEARTBEAT:
+                return None
+            # Heartbeats restate the current input so a fresh host connection picks it up
+            changes = self.unacked or [(self.input_changed_tick, self.input_bits)]
+            self.input_dirty = False
+            self.last_input_send = now
+            return {'type':'input','tick':self.input_tick,
+                    'inputs':[value for change in changes for value in change]}
+
+    def acknowledge(self, tick):
+        with self.input_lock:
+            while self.unacked and self.unacked[0][0] <= tick:
+                self.unacked.popleft()
+
+    def host_tick(self):
+        """Estimated host simulation tick right now (fractional), or None until synced."""
+        host_now = self.clock.host_time()
+        if host_now is None or self.snapshot_tick is None or self.snapshot_time is None:
+            return None
+        return self.snapshot_tick + (host_now - self.snapshot_time) * FPS
+
+    def snapshot_age(self):
+        """Seconds since the host took the newest snapshot, in the host's timebase."""
+        host_now = self.clock.host_time()
+        if host_now is None or self.snapshot_time is None:
+            return None
+        return host_now - self.snapshot_time
+
+    def stats(self):
+        stats = self.net_stats.as_dict()
+        stats["connected"] = self.connected
+        offset = self.clock.offset
+        stats["clock_offset_ms"] = None if offset is None else round(offset * 1000.0, 3)
+        stats["host_tick"] = self.host_tick()
+        with self.input_lock:
+            stats["unacked_inputs"] = len(self.unacked)
+        return stats
+
+    def stop(self):
+        self.should_reconnect = False
+        self.running = False
+        try:
+            if self.sock:
+                self.sock.close()
+        except Exception:
+            pass
@@ -0,0 +1,846 @@
+"""Rendering: sprite loading and caches, entity drawing, quality and backends."""
+import math
+
+import pygame
+
+from . import assets
+from .core import (SCREEN_WIDTH, SCREEN_HEIGHT, ARENA_SIZE, TICK_TIME, BACKGROUND_COLOR, BORDER_COLOR,
+                   SHIP_OUTLINE_COLOR, BULLET_COLOR, BULLET_SIZE, BULLET_OFFSET, UNFIRED_BULLET_COLOR,
+                   SHIPS, MOVE_BEAM, MOVE_MINE, MINE_EXPLOSION_TIME, CHARGED_MINE_EXPLOSION_TIME)
+
+__all__ = [
+    "SPRITE_CACHE", "load_image", "tint_image", "tint_images", "SCALED_CACHE", "scaled_image",
+    "SHIP_SHAPE_ASSET", "SHIP_TYPE_ASSET", "get_ship_sprite", "ship_asset", "warm_ship_colors",
+    "BULLET_SPRITE_MAP", "get_bullet_sprite", "warm_bullet_sprites", "view_scale",
+    "build_background", "parse_resolution", "interpolate_pos", "CAMERA_EASE", "Camera",
+    "ship_extent", "bullet_extent", "particle_extent", "LAYER_SHIPS", "LAYER_BULLETS",
+    "LAYER_PARTICLES", "LAYER_COUNT", "DrawList", "MARK_CACHE", "health_bar", "ship_block",
+    "direction_mark", "PARTICLE_CACHE", "PARTICLE_CACHE_LIMIT", "particle_image", "draw_ship",
+    "SHAPE_CACHE", "SHAPE_CACHE_LIMIT", "cached_shape", "circle_image", "BEAM_CACHE",
+    "DRAW_KERNELS", "draw_bullet", "draw_particle", "QUALITY_LEVELS", "QualityGovernor",
+    "TextureRenderer"
+]
+
+# ----------------- Image / Sprite Loading Helpers -----------------
+# Load images preferring extracted APK assets then local assets directory.
+SPRITE_CACHE = {}
+def load_image(filename, alpha=True):
+    # Try dual assets then local assets
+    for p in assets.asset_paths(filename):
+        try:
+            img = pygame.image.load(p)
+        except Exception:
+            continue
+        try:
+            if alpha:
+                return img.convert_alpha()
+            return img.convert()
+        except pygame.error:
+            # No display surface (texture renderer): the raw image still works
+            return img
+    return None
+
+def tint_image(img, color):
+    if img is None:
+        return None
+    # Create a tinted copy using BLEND_MULT
+    try:
+        tinted = img.copy()
+        tint_surf = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
+        tint_surf.fill(color + (0,))
+        tinted.blit(tint_surf, (0,0), special_flags=pygame.BLEND_RGB_MULT)
+        return tinted
+    except Exception:
+        return img
+
+def tint_images(img, colors):
+    """Tint one sprite with many colors at once; returns a list aligned with colors.
+
+    Same result as tint_image per color, but the tint surface is made once
+    and reused, and callers pass an already scaled base so the PNG is
+    decoded and smoothscaled once for all variants.
+    """
+    if img is None:
+        return [None] * len(colors)
+    try:
+        tint_surf = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+        out = []
+        for color in colors:
+            tinted = img.copy()
+            tint_surf.fill(tuple(color) + (0,))
+            tinted.blit(tint_surf, (0,0), special_flags=pygame.BLEND_RGB_MULT)
+            out.append(tinted)
+        return out
+    except Exception:
+        return [tint_image(img, color) for color in colors]
+
+# Untinted sprites scaled to a given size, shared by every color variant
+SCALED_CACHE = {}
+def scaled_image(filename, size):
+    key = (filename, size)
+    if key not in SCALED_CACHE:
+        img = load_image(filename)
+        if img:
+            img = pygame.transform.smoothscale(img, (int(size), int(size)))
+        SCALED_CACHE[key] = img
+    return SCALED_CACHE[key]
+
+# Preload ship sprite filenames by shape
+SHIP_SHAPE_ASSET = {
+    'square': 'shipSquareBodyFill.png',
+    'triangle': 'shipTriangleBodyFill.png',
+    'circle': 'shipCircleBodyFill.png',
+    'hexagon': 'shipHexagonBodyFill.png',
+    'kite': 'shipKiteBodyFill.png',
+    'star': 'shipStarBodyFill.png',
+    'chevron': 'shipChevronBodyFill.png',
+    'cross': 'shipCrossBodyFill.png',
+    'nexus': 'shipCrossBodyFill.png',
+    'boomerang': 'shipChevronBodyFill.png'
+}
+
+# Direct mapping from ship type names to asset filenames (from APK assets)
+SHIP_TYPE_ASSET = {
+    'Zaba': 'shipSquareBodyFill.png',
+    'Rekin': 'shipTriangleBodyFill.png',
+    'Komar': 'shipKiteBodyFill.png',
+    'Osa': 'shipChevronBodyFill.png',
+    'Kombuz': 'shipCircleBodyFill.png',
+    'Gwiazdka': 'shipStarBodyFill.png',
+    'Rift': 'shipHexagonBodyFill.png',
+    'Nexus': 'shipCrossBodyFill.png'
+}
+
+def get_ship_sprite(ship_type, color, size, flipped=False):
+    key = (ship_type, color, size, flipped)
+    if key in SPRITE_CACHE:
+        return SPRITE_CACHE[key]
+    if flipped:
+        # Right-side ships face left: mirror the cached upright sprite once
+        img = get_ship_sprite(ship_type, color, size)
+        if img:
+            img = pygame.transform.flip(img, True, False)
+        SPRITE_CACHE[key] = img
+        return img
+    img = tint_image(scaled_image(ship_asset(ship_type), size), color)
+    SPRITE_CACHE[key] = img
+    return img
+
+def ship_asset(ship_type):
+    # prefer explicit ship-type asset mapping, then fall back to shape mapping
+    fname = SHIP_TYPE_ASSET.get(ship_type)
+    if not fname:
+        config = SHIPS.get(ship_type, {})
+        shape = config.get('shape', 'square')
+        fname = SHIP_SHAPE_ASSET.get(shape, 'shipSquareBodyFill.png')
+    return fname
+
+def warm_ship_colors(ship_type, colors, size, flipped=False):
+    """Batch-build the sprites of one ship in many colors at one size."""
+    colors = [c for c in dict.fromkeys(colors) if (ship_type, c, size, flipped) not in SPRITE_CACHE]
+    if not colors:
+        return
+    for color, img in zip(colors, tint_images(scaled_image(ship_asset(ship_type), size), colors)):
+        SPRITE_CACHE.setdefault((ship_type, color, size, False), img)
+        if flipped:
+            SPRITE_CACHE[(ship_type, color, size, True)] = pygame.transform.flip(img, True, False) if img else None
+
+
+# Bullet sprites mapping
+BULLET_SPRITE_MAP = {
+    'circle': 'bulletCircleBodyOutline.png',
+    'square': 'bulletSquareBodyOutline.png',
+    'triangle': 'bulletTriangleBodyOutline.png',
+    'hexagon': 'bulletHexagonBodyOutline.png',
+    'kite': 'bulletKiteBody.png',
+    'cross': 'bulletCrossBodyFill.png',
+    'diamond': 'bulletKiteBody.png'
+}
+
+def get_bullet_sprite(bullet_shape, size, color):
+    key = (bullet_shape, size, color)
+    if key in SPRITE_CACHE:
+        return SPRITE_CACHE[key]
+    fname = BULLET_SPRITE_MAP.get(bullet_shape)
+    img = None
+    if fname:
+        img = tint_image(scaled_image(fname, size), color)
+    SPRITE_CACHE[key] = img
+    return img
+
+def warm_bullet_sprites(bullet_shape, colors, sizes):
+    """Batch-build bullet sprites for every color/size pair."""
+    fname = BULLET_SPRITE_MAP.get(bullet_shape)
+    for size in sizes:
+        todo = [c for c in dict.fromkeys(colors) if (bullet_shape, size, c) not in SPRITE_CACHE]
+        if not todo:
+            continue
+        if not fname:
+            for c in todo:
+                SPRITE_CACHE[(bullet_shape, size, c)] = None
+            continue
+        for color, img in zip(todo, tint_images(scaled_image(fname, size), todo)):
+            SPRITE_CACHE[(bullet_shape, size, color)] = img
+
+
+def view_scale(surface):
+    """Scale from logical SCREEN_WIDTH coordinates to pixels of the given render target."""
+    return surface.get_width() / SCREEN_WIDTH
+
+def build_background(size, arena=ARENA_SIZE):
+    """Arena background (tiled pattern, center divider) composited once at a canvas size.
+
+    An arena larger than the screen gets a surface to match, at the canvas
+    scale; the camera shows a canvas-sized window of it.
+    """
+    k = size[0] / SCREEN_WIDTH
+    width, height = max(size[0], int(arena[0] * k)), max(size[1], int(arena[1] * k))
+    surface = pygame.Surface((width, height))
+    try:
+        surface = surface.convert()
+    except pygame.error:
+        pass  # no display surface (texture renderer uploads it as is)
+    surface.fill(BACKGROUND_COLOR)
+    background_path = assets.background_image_path()
+    if background_path:
+        try:
+            tile = pygame.image.load(background_path)
+            tw, th = tile.get_size()
+            tile = pygame.transform.smoothscale(tile, (max(1, int(tw * k)), max(1, int(th * k))))
+            tw, th = tile.get_size()
+            for y in range(0, height, th):
+                for x in range(0, width, tw):
+                    surface.blit(tile, (x, y))
+        except Exception:
+            pass
+    # Middle border
+    pygame.draw.line(surface, BORDER_COLOR, (int(arena[0]//2 * k), 0), (int(arena[0]//2 * k), height), 2)
+    return surface
+
+def parse_resolution(text):
+    """'960x540' -> (960, 540); 'native' or '' -> None (render at the window's size)."""
+    text = (text or "").strip().lower()
+    if text in ("", "native"):
+        return None
+    w, sep, h = text.partition("x")
+    if not sep or not w.isdigit() or not h.isdigit() or int(w) < 1 or int(h) < 1:
+        raise ValueError(f"resolution must look like 960x540 or 'native', got {text!r}")
+    return int(w), int(h)
+
+def interpolate_pos(entity, alpha):
+    """Position of a ship/bullet blended between its previous and current tick."""
+    px = getattr(entity, 'prev_x', entity.x)
+    py = getattr(entity, 'prev_y', entity.y)
+    return px + (entity.x - px) * alpha, py + (entity.y - py) * alpha
+
+
+# ----------------- Camera and culling -----------------
+CAMERA_EASE = 6.0  # per second; how quickly the camera catches up with the action
+
+class Camera:
+    """View onto an arena larger than the screen, in world units.
+
+    x, y is the world point at the view's top-left corner; follow() eases it
+    toward the middle of the live ships, kept inside the arena.
+    """
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.view = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def follow(self, points, view, arena, dt=None):
+        """Track the centroid of points; dt None snaps there (new match)."""
+        self.view = view
+        tx, ty = self.x, self.y
+        if points:
+            tx = sum(p[0] for p in points) / len(points) - view[0] / 2
+            ty = sum(p[1] for p in points) / len(points) - view[1] / 2
+        tx = min(max(tx, 0), max(0, arena[0] - view[0]))
+        ty = min(max(ty, 0), max(0, arena[1] - view[1]))
+        if dt is None:
+            self.x, self.y = tx, ty
+        else:
+            blend = 1 - math.exp(-dt * CAMERA_EASE)
+            self.x += (tx - self.x) * blend
+            self.y += (ty - self.y) * blend
+
+    def box(self):
+        """(left, top, right, bottom) of the view in world units."""
+        return self.x, self.y, self.x + self.view[0], self.y + self.view[1]
+
+
+def ship_extent(ship):
+    """World box draw_ship can paint: hull, health bar, tilt and the spare bullets."""
+    half_w = ship.width / 2 + BULLET_OFFSET + BULLET_SIZE + getattr(ship, 'bullet_side_offset', 0)
+    half_h = ship.height / 2 + 20 + abs(getattr(ship, 'tilt', 0))
+    return (min(ship.prev_x, ship.x) - half_w, min(ship.prev_y, ship.y) - half_h,
+            max(ship.prev_x, ship.x) + half_w, max(ship.prev_y, ship.y) + half_h)
+
+
+def bullet_extent(b):
+    """World box draw_bullet can paint, rotated sprites, mine rings and beams included."""
+    if b.kernel == MOVE_BEAM:
+        if b.direction == 1:
+            return (b.x - 2, 0, b.arena[0], b.arena[1])
+        return (0, 0, b.x + 2, b.arena[1])
+    half = max(b.width, b.height) * 0.75
+    if b.kernel == MOVE_MINE:
+        half += 15 + (b.explosion_timer * 4 if b.exploding else 0)
+    return (min(b.prev_x, b.x) - half, min(b.prev_y, b.y) - half,
+            max(b.prev_x, b.x) + half, max(b.prev_y, b.y) + half)
+
+
+def particle_extent(p):
+    half = p.size / 2 + 1
+    return p.x - half, p.y - half, p.x + half, p.y + half
+
+
+# ----------------- Frame draw list -----------------
+# Draw order of the world; each layer goes down in one Surface.blits call
+LAYER_SHIPS, LAYER_BULLETS, LAYER_PARTICLES = range(3)
+LAYER_COUNT = 3
+
+class DrawList:
+    """Blits collected over a frame and submitted with one Surface.blits per layer.
+
+    Within a layer, commands keep the order they were added in, so overlapping
+    entities stack as if blitted directly. A ship's hull and its marks share a
+    layer for the same reason: the next ship's hull covers them.
+    """
+    def __init__(self):
+        self.layers = [[] for _ in range(LAYER_COUNT)]
+
+    def add(self, layer, source, dest):
+        self.layers[layer].append((source, dest))
+
+    def flush(self, target):
+        """Blit everything queued onto target, lowest layer first, and empty the list."""
+        for blits in self.layers:
+            if blits:
+                target.blits(blits, doreturn=False)
+                blits.clear()
+
+
+def _blit(screen, batch, layer, source, dest):
+    # Queue on the frame's DrawList when there is one, else blit straight away
+    if batch is None:
+        screen.blit(source, dest)
+    else:
+        batch.add(layer, source, dest)
+
+
+def _solid(size):
+    surface = pygame.Surface(size)
+    try:
+        surface = surface.convert()
+    except pygame.error:
+        pass  # no display mode set (headless tools)
+    return surface
+
+
+MARK_CACHE = {}
+def health_bar(width, height, filled):
+    """Health bar (track, fill, outline) composed once per size and fill width."""
+    key = ('bar', width, height, filled)
+    bar = MARK_CACHE.get(key)
+    if bar is None:
+        bar = MARK_CACHE[key] = _solid((width, height))
+        bar.fill((80, 80, 80))
+        bar.fill((0, 200, 0), (0, 0, filled, height))
+        pygame.draw.rect(bar, SHIP_OUTLINE_COLOR, bar.get_rect(), 1)
+    return bar
+
+
+def ship_block(width, height, color):
+    """Fallback hull for ships without a sprite: a filled, outlined rectangle."""
+    key = ('hull', width, height, color)
+    block = MARK_CACHE.get(key)
+    if block is None:
+        block = MARK_CACHE[key] = _solid((width, height))
+        block.fill(color)
+        pygame.draw.rect(block, SHIP_OUTLINE_COLOR, block.get_rect(), 2)
+    return block
+
+
+def direction_mark(height):
+    """The 2 px wide line drawn inside a ship's nose."""
+    key = ('nose', height)
+    mark = MARK_CACHE.get(key)
+    if mark is None:
+        mark = MARK_CACHE[key] = _solid((2, height))
+        mark.fill(SHIP_OUTLINE_COLOR)
+    return mark
+
+
+PARTICLE_CACHE = {}
+PARTICLE_CACHE_LIMIT = 4096
+def particle_image(size, color, alpha):
+    """Translucent square for a particle, shared by every particle that matches."""
+    key = (size, color, alpha)
+    img = PARTICLE_CACHE.get(key)
+    if img is None:
+        if len(PARTICLE_CACHE) >= PARTICLE_CACHE_LIMIT:
+            PARTICLE_CACHE.clear()  # damage tints make colors open-ended
+        img = PARTICLE_CACHE[key] = pygame.Surface((size, size), pygame.SRCALPHA)
+        img.fill((*color, alpha))
+    return img
+
+
+# ----------------- Entity drawing -----------------
+# The simulation core only holds state; these draw its ships, bullets and
+# particles onto a Surface (or through a TextureRenderer).
+
+def draw_ship(ship, screen, alpha=1.0, renderer=None, origin=(0, 0), batch=None):
+    # Draw ship using sprite from extracted APK assets when available.
+    # alpha blends between the previous and current tick (render interpolation)
+    # renderer (TextureRenderer) draws the sprites as textures instead of blits
+    # origin is the world point at the screen's top-left (camera)
+    # batch (DrawList) queues the blits for the frame instead of blitting now
+    x, y = interpolate_pos(ship, alpha)
+    # screen may be a reduced-resolution canvas; scale logical coords to it
+    k = view_scale(screen)
+    offset_x, offset_y = (x - ship.x - origin[0]) * k, (y - ship.y - origin[1]) * k
+    x, y = (x - origin[0]) * k, (y - origin[1]) * k
+    w, h = int(ship.width * k), int(ship.height * k)
+    # apply tilt visual offset if present
+    tilt_offset = getattr(ship, 'tilt', 0)
+
+    y_offset = int(tilt_offset * k)
+
+    # Try to get a preloaded sprite; falls back to vector drawing
+    if renderer is not None and renderer.sprite(ship_asset(ship.type), (x, y + y_offset), w,
+                                                ship.color, flip_x=not ship.is_left):
+        pass
+    else:
+        sprite = get_ship_sprite(ship.type, ship.color, w, not ship.is_left)
+        if sprite:
+            try:
+                rect = sprite.get_rect(center=(int(x), int(y + y_offset)))
+                _blit(screen, batch, LAYER_SHIPS, sprite, rect)
+            except Exception:
+                pygame.draw.rect(screen, ship.color, (x - w//2, y - h//2 + y_offset, w, h))
+        else:
+            # Fallback simple rectangle with outline
+            _blit(screen, batch, LAYER_SHIPS, ship_block(w, h, tuple(ship.color)),
+                  (x - w//2, y - h//2 + y_offset))
+
+    # Health bar above ship
+    try:
+        bar_w = w
+        bar_h = max(2, int(6 * k))
+        hp_ratio = max(0.0, min(1.0, float(ship.health) / float(ship.max_health)))
+        bar_x = int(x - bar_w // 2)
+        bar_y = int(y - h//2 - 12 * k + y_offset)
+        _blit(screen, batch, LAYER_SHIPS, health_bar(bar_w, bar_h, int(bar_w * hp_ratio)), (bar_x, bar_y))
+    except Exception:
+        pass
+
+    # Draw bullets on sides: use bullet sprites if available
+    bshape = ship.bullet_shape or SHIPS.get(ship.type, {}).get('bullet_shape', 'circle')
+    bullet_file = BULLET_SPRITE_MAP.get(bshape)
+    for bullet_pos in ship.bullets_visible:
+        bx, by = int(bullet_pos[0] * k + offset_x), int(bullet_pos[1] * k + offset_y)
+        if renderer is not None and bullet_file and renderer.sprite(
+                bullet_file, (bx, by), max(2, int(BULLET_SIZE * k)), UNFIRED_BULLET_COLOR):
+            continue
+        sprite = get_bullet_sprite(bshape, max(2, int(BULLET_SIZE * k)), UNFIRED_BULLET_COLOR)
+        if sprite:
+            try:
+                rect = sprite.get_rect(center=(bx, by))
+                _blit(screen, batch, LAYER_SHIPS, sprite, rect)
+            except Exception:
+                pygame.draw.circle(screen, UNFIRED_BULLET_COLOR, (bx, by), max(1, int(BULLET_SIZE * k)//2))
+        else:
+            # simple fallback
+            img, (cx, cy) = circle_image(max(1, int(BULLET_SIZE * k)//2), UNFIRED_BULLET_COLOR)
+            _blit(screen, batch, LAYER_SHIPS, img, (bx - cx, by - cy))
+
+    # Small vertical direction indicator drawn inside the ship
+    try:
+        front_x = int(x + (w//3 if ship.is_left else -w//3))
+        top = int(y - h//6)
+        _blit(screen, batch, LAYER_SHIPS, direction_mark(int(y + h//6) - top + 1), (front_x, top))
+    except Exception:
+        pass
+
+
+# Vector fallbacks for bullets without a sprite, one per bullet shape.
+# Each shape is rasterised once per (shape, size, color, direction, animation
+# step) into a transparent surface and blitted from then on, so asset-less
+# installs skip the per-frame polygon and trig work.
+SHAPE_CACHE = {}
+SHAPE_CACHE_LIMIT = 2048
+
+def cached_shape(key, half_w, half_h, paint, *args):
+    """(surface, (cx, cy)) holding paint(surface, cx, cy, *args), rasterised once.
+
+    paint draws the shape centred on (cx, cy); blitting the surface at
+    (x - cx, y - cy) centres it on (x, y).
+    """
+    entry = SHAPE_CACHE.get(key)
+    if entry is None:
+        if len(SHAPE_CACHE) >= SHAPE_CACHE_LIMIT:
+            SHAPE_CACHE.clear()  # damage tints and scales make keys open-ended
+        cx, cy = int(half_w) + 2, int(half_h) + 2
+        surface = pygame.Surface((2 * cx + 1, 2 * cy + 1), pygame.SRCALPHA)
+        paint(surface, cx, cy, *args)
+        entry = SHAPE_CACHE[key] = (surface, (cx, cy))
+    return entry
+
+
+def _blit_shape(screen, batch, entry, x, y):
+    surface, (cx, cy) = entry
+    _blit(screen, batch, LAYER_BULLETS, surface, (int(x) - cx, int(y) - cy))
+
+
+def _paint_circle(surface, x, y, radius, color):
+    pygame.draw.circle(surface, color, (x, y), radius)
+
+
+def circle_image(radius, color):
+    """Cached filled circle, as cached_shape returns it."""
+    return cached_shape(('circle', radius, color), radius, radius, _paint_circle, radius, color)
+
+
+def _paint_triangle(surface, x, y, w, h, direction, color):
+    if direction == 1:
+        points = [(x + w//2, y), (x - w//2, y - h//2), (x - w//2, y + h//2)]
+    else:
+        points = [(x - w//2, y), (x + w//2, y - h//2), (x + w//2, y + h//2)]
+    pygame.draw.polygon(surface, color, points)
+
+
+def _paint_diamond(surface, x, y, w, h, direction, stretch, color):
+    width = w * stretch
+    tip = width//2 if direction == 1 else -(width//2)
+    points = [(x + tip, y), (x, y - h//2), (x - tip, y), (x, y + h//2)]
+    pygame.draw.polygon(surface, color, points)
+
+
+def _paint_line(surface, x, y, h, color):
+    pygame.draw.line(surface, color, (x, y - h//2), (x, y + h//2), 4)
+
+
+def _paint_hexagon(surface, x, y, w, h, color):
+    points = []
+    for i in range(6):
+        angle = 2 * math.pi * i / 6
+        points.append((x + math.cos(angle) * w//2, y + math.sin(angle) * h//2))
+    pygame.draw.polygon(surface, color, points)
+
+
+def _paint_pulse(surface, x, y, radius, color):
+    pulse_points = []
+    for i in range(6):
+        angle = 2 * math.pi * i / 6
+        pulse_points.append((x + math.cos(angle) * radius, y + math.sin(angle) * radius))
+    pygame.draw.polygon(surface, color, pulse_points, 2)
+
+
+def _paint_rings(surface, x, y, explosion_timer, k, color, fade):
+    explosion_radius = explosion_timer * 4 * k  # Larger radius
+    alpha = max(0, 255 - explosion_timer * 8) if fade else 255  # Fade out
+    # Draw multiple hexagonal rings
+    for ring in range(3):
+        ring_points = []
+        ring_radius = explosion_radius * (1 - ring * 0.2)  # Decreasing sizes
+        for i in range(6):
+            angle = 2 * math.pi * i / 6 + (explosion_timer * 0.1)  # Rotating
+            ring_points.append((x + math.cos(angle) * ring_radius,
+                                y + math.sin(angle) * ring_radius))
+        pygame.draw.polygon(surface, (*color, alpha), ring_points, 2)
+
+
+def _draw_circle(b, screen, x, y, w, h, k, color, quality, batch=None):
+    _blit_shape(screen, batch, circle_image(w//2, color), x, y)
+
+
+def _draw_square(b, screen, x, y, w, h, k, color, quality, batch=None):
+    key = ('square', w, h, color)
+    block = MARK_CACHE.get(key)
+    if block is None:
+        block = MARK_CACHE[key] = _solid((w, h))
+        block.fill(color)
+    _blit(screen, batch, LAYER_BULLETS, block, (x - w//2, y - h//2))
+
+
+def _draw_triangle(b, screen, x, y, w, h, k, color, quality, batch=None):
+    entry = cached_shape(('triangle', w, h, b.direction, color), w / 2, h / 2,
+                         _paint_triangle, w, h, b.direction, color)
+    _blit_shape(screen, batch, entry, x, y)
+
+
+def _draw_diamond(b, screen, x, y, w, h, k, color, quality, batch=None, stretch=1.0):
+    entry = cached_shape(('diamond', w, h, b.direction, stretch, color), w * stretch / 2, h / 2,
+                         _paint_diamond, w, h, b.direction, stretch, color)
+    _blit_shape(screen, batch, entry, x, y)
+
+
+def _draw_boomerang(b, screen, x, y, w, h, k, color, quality, batch=None):
+    # Fired boomerangs are a stretched diamond pointing along the flight direction
+    _draw_diamond(b, screen, x, y, w, h, k, color, quality, batch, stretch=1.5)
+
+
+BEAM_CACHE = {}  # screen size -> opaque surface the beam is filled into
+
+def _draw_line(b, screen, x, y, w, h, k, color, quality, batch=None):
+    if b.kernel != MOVE_BEAM:
+        # Normal shots are vertical lines
+        _blit_shape(screen, batch, cached_shape(('line', h, color), 3, h / 2, _paint_line, h, color), x, y)
+        return
+
+    # Draw full-screen beam from origin to edge
+    screen_w, screen_h = screen.get_size()
+    beam_alpha = max(0, 255 - (b.timer * 4))  # Fade out
+
+    if quality is not None and not quality.settings["beam_alpha"]:
+        # Low quality: skip the full-screen alpha surface, draw edge + center line
+        if b.direction == 1:
+            pygame.draw.rect(screen, color, (x, 0, screen_w - x, screen_h), 2)
+        else:
+            pygame.draw.rect(screen, color, (0, 0, x, screen_h), 2)
+        pygame.draw.line(screen, color, (x, 0), (x, screen_h), 2)
+        return
+
+    # One screen-sized opaque surface, filled where the beam is and blitted
+    # with surface alpha (its 2 px center line shares the beam's color)
+    if b.direction == 1:  # Right-facing beam
+        left, right = int(x), screen_w
+    else:  # Left-facing beam
+        left, right = 0, int(x) + 2
+    left, right = max(0, left), min(screen_w, right)
+    if right <= left:
+        return
+    beam_surface = BEAM_CACHE.get((screen_w, screen_h))
+    if beam_surface is None:
+        beam_surface = BEAM_CACHE[(screen_w, screen_h)] = _solid((screen_w, screen_h))
+    area = pygame.Rect(left, 0, right - left, screen_h)
+    beam_surface.fill(color, area)
+    beam_surface.set_alpha(beam_alpha)
+    # Straight away: the shared surface is refilled by the next beam
+    screen.blit(beam_surface, area, area)
+
+
+def _draw_hexagon(b, screen, x, y, w, h, k, color, quality, batch=None):
+    _blit_shape(screen, batch, cached_shape(('hexagon', w, h, color), w / 2, h / 2,
+                                            _paint_hexagon, w, h, color), x, y)
+    if b.kernel != MOVE_MINE:
+        return
+    # Pulse and explosion rings are pure decoration; low quality drops them
+    if quality is not None and not quality.settings["mine_rings"]:
+        return
+
+    # Pulsing hexagonal outline before explosion, in whole-pixel steps
+    if b.timer > (CHARGED_MINE_EXPLOSION_TIME if b.is_charged else MINE_EXPLOSION_TIME) - 30:
+        pulse = int((abs(math.sin(b.timer * 0.2)) * 10 + 5) * k)  # Faster pulse
+        radius = w//2 + pulse
+        _blit_shape(screen, batch, cached_shape(('pulse', radius, color), radius, radius,
+                                                _paint_pulse, radius, color), x, y)
+
+    # Explosion visualization: rings grow, turn and fade with the explosion tick.
+    # Only targets with per-pixel alpha (the texture overlay) keep the fade;
+    # drawn straight onto the opaque screen the rings were always solid.
+    if b.exploding:
+        radius = b.explosion_timer * 4 * k
+        fade = bool(screen.get_flags() & pygame.SRCALPHA)
+        _blit_shape(screen, batch, cached_shape(('rings', b.explosion_timer, round(k, 3), color, fade),
+                                                radius, radius, _paint_rings,
+                                                b.explosion_timer, k, color, fade), x, y)
+
+
+# Indexed like BULLET_SHAPES; stars fall back to circles
+DRAW_KERNELS = (_draw_circle, _draw_square, _draw_triangle, _draw_line, _draw_hexagon,
+                _draw_boomerang, _draw_diamond, _draw_circle)
+
+
+def draw_bullet(b, screen, alpha=1.0, renderer=None, origin=(0, 0), batch=None):
+    # Try to draw a bullet sprite if available; otherwise fallback to vector shapes per bullet shape.
+    # alpha blends between the previous and current tick (render interpolation)
+    # renderer (TextureRenderer) draws the sprite as a texture instead of a blit
+    # batch (DrawList) queues the blits for the frame instead of blitting now
+    x, y = interpolate_pos(b, alpha)
+    # screen may be a reduced-resolution canvas; scale logical coords to it
+    k = view_scale(screen)
+    x, y = (x - origin[0]) * k, (y - origin[1]) * k
+    w, h = int(b.width * k), int(b.height * k)
+    quality = getattr(b.game, 'quality', None)
+    bcolor = tuple(b.color or BULLET_COLOR)
+    if b.kernel != MOVE_BEAM:
+        bullet_file = BULLET_SPRITE_MAP.get(b.spec.bullet_shape)
+        if renderer is not None and bullet_file and renderer.sprite(
+                bullet_file, (x, y), max(4, int(max(w, h))), bcolor, angle=math.degrees(b.angle)):
+            return
+        sprite = get_bullet_sprite(b.spec.bullet_shape, max(4, int(max(w, h))), bcolor)
+        if sprite:
+            try:
+                img = sprite
+                if b.angle:
+                    img = pygame.transform.rotate(sprite, -math.degrees(b.angle))
+                rect = img.get_rect(center=(int(x), int(y)))
+                _blit(screen, batch, LAYER_BULLETS, img, rect)
+                return
+            except Exception:
+                pass
+
+    # Fallback vector drawing
+    DRAW_KERNELS[b.spec.shape_id](b, screen, x, y, w, h, k, bcolor, quality, batch)
+
+
+def draw_particle(p, screen, origin=(0, 0), batch=None):
+    alpha = max(0, 255 - int(255 * (p.age / p.lifetime)))
+    k = view_scale(screen)
+    size = max(1, int(p.size * k))
+    _blit(screen, batch, LAYER_PARTICLES, particle_image(size, tuple(p.color), alpha),
+          (int((p.x - origin[0]) * k - size//2), int((p.y - origin[1]) * k - size//2)))
+
+
+# ----------------- Adaptive quality -----------------
+# Visual settings per quality level, best first. Each level sheds a bit more load:
+# particle spawns are thinned to 'particles' (fraction kept), Kombuz pulse and
+# explosion rings and the Komar beam's full-screen alpha surface are dropped, and
+# finally the arena is rendered at 'render_scale' of the window and scaled up.
+QUALITY_LEVELS = [
+    {"particles": 1.0, "mine_rings": True, "beam_alpha": True, "render_scale": 1.0},
+    {"particles": 0.5, "mine_rings": True, "beam_alpha": True, "render_scale": 1.0},
+    {"particles": 0.25, "mine_rings": False, "beam_alpha": True, "render_scale": 1.0},
+    {"particles": 0.25, "mine_rings": False, "beam_alpha": False, "render_scale": 1.0},
+    {"particles": 0.1, "mine_rings": False, "beam_alpha": False, "render_scale": 0.75},
+    {"particles": 0.0, "mine_rings": False, "beam_alpha": False, "render_scale": 0.5},
+]
+
+
+class QualityGovernor:
+    """Watches rolling frame time and steps QUALITY_LEVELS down under pressure.
+
+    record() takes the busy time of each frame (update + draw, not the idle wait
+    in clock.tick). When the rolling average goes over budget * degrade_at the
+    level drops one step; once it stays under budget * restore_at for a whole
+    window it climbs back one step. After every change the window is refilled
+    before deciding again, so it does not flap.
+    """
+    def __init__(self, budget=TICK_TIME, window=30, degrade_at=0.9, restore_at=0.5):
+        self.budget = budget
+        self.window = window
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.level = 0
+        self.samples = []
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    def average(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def record(self, frame_time):
+        """Add one frame's busy time; returns True when the level changed."""
+        self.samples.append(frame_time)
+        if len(self.samples) > self.window:
+            self.samples.pop(0)
+        if len(self.samples) < self.window:
+            return False
+        avg = self.average()
+        new_level = self.level
+        if avg > self.budget * self.degrade_at and self.level < len(QUALITY_LEVELS) - 1:
+            new_level += 1
+        elif avg < self.budget * self.restore_at and self.level > 0:
+            new_level -= 1
+        if new_level == self.level:
+            return False
+        self.level = new_level
+        self.changes += 1
+        self.samples = []
+        return True
+
+    def stats(self):
+        """Telemetry snapshot of the governor state."""
+        return {
+            "level": self.level,
+            "avg_frame_ms": round(self.average() * 1000.0, 3),
+            "budget_ms": round(self.budget * 1000.0, 3),
+            "changes": self.changes,
+            **self.settings,
+        }
+
+
+# ----------------- Texture renderer (optional) -----------------
+class TextureRenderer:
+    """Presentation backend on SDL's Renderer/Texture API (pygame._sdl2.video).
+
+    Sprite images are uploaded once, untinted, and tint (color mod), alpha,
+    rotation and mirroring are applied by the renderer when drawing.
+    Everything still drawn with pygame.draw / Surface.blit (UI screens,
+    vector shapes, particles, HUD) goes into a transparent overlay Surface
+    that is streamed up once per frame and drawn on top.
+
+    Raises if the SDL2 video module or a renderer is not available; Game
+    then falls back to the plain display Surface.
+    """
+    def __init__(self, size, title="2D-Flox"):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        self.Texture = Texture
+        self.window = Window(title, size=size)
+        self.renderer = Renderer(self.window)
+        # Draw in logical coordinates; SDL scales to the window (and maps mouse events back)
+        self.renderer.logical_size = size
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self.overlay_texture = Texture(self.renderer, size, streaming=True)
+        self.overlay_texture.blend_mode = pygame.BLENDMODE_BLEND
+        self.textures = {}
+        self.background = None  # (source Surface, Texture)
+
+    def texture(self, filename):
+        """Texture for an image asset, uploaded on first use; None if the file is missing."""
+        if filename not in self.textures:
+            img = load_image(filename)
+            tex = None
+            if img is not None:
+                tex = self.Texture.from_surface(self.renderer, img)
+                tex.blend_mode = pygame.BLENDMODE_BLEND
+            self.textures[filename] = tex
+        return self.textures[filename]
+
+    def begin(self, color, background=None, area=None):
+        """Start a frame: clear, draw the background Surface if given (uploaded once).
+
+        area is the part of a larger-than-screen background to show (camera).
+        """
+        self.renderer.draw_color = tuple(color) + (255,)
+        self.renderer.clear()
+        if background is not None:
+            if self.background is None or self.background[0] is not background:
+                self.background = (background, self.Texture.from_surface(self.renderer, background))
+            if area is None:
+                self.background[1].draw()
+            else:
+                self.background[1].draw(srcrect=area, dstrect=(0, 0) + self.overlay.get_size())
+        self.overlay.fill((0, 0, 0, 0))
+
+    def sprite(self, filename, center, size, color=None, angle=0.0, flip_x=False, alpha=255):
+        """Draw an asset centred at center, size px square; returns False if there is no texture."""
+        tex = self.texture(filename)
+        if tex is None:
+            return False
+        tex.color = color or (255, 255, 255)
+        tex.alpha = alpha
+        size = int(size)
+        dst = pygame.Rect(0, 0, size, size)
+        dst.center = (int(center[0]), int(center[1]))
+        # SDL rotates clockwise in degrees
+        tex.draw(dstrect=dst, angle=angle, flip_x=flip_x)
+        return True
+
+    def present(self):
+        self.overlay_texture.update(self.overlay)
+        self.overlay_texture.draw()
+        self.renderer.present()
+
+    def set_fullscreen(self, fullscreen):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+
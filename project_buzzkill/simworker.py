@@ -0,0 +1,327 @@
+"""Optional simulation worker process over a shared-memory ring of world states."""
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+from . import core
+from .core import Match, Bullet, Particle, MAX_SHIPS, SHIP_SPEC_LIST, damage_color, play_sound
+from .net import pack_input, input_keymap
+
+__all__ = [
+    "SIM_RING_SLOTS", "SIM_MAX_BULLETS", "SIM_MAX_PARTICLES", "SIM_SOUND_BYTES", "SIM_SYNC_WAIT",
+    "SIM_RING_HEADER", "SIM_SLOT_HEADER", "SIM_SHIP", "SIM_SHIPS_SIZE", "SIM_BULLET",
+    "SIM_PARTICLE", "SIM_SLOT_SIZE", "SIM_STATES", "WorldRing", "run_simulation",
+    "SimulationProcess"
+]
+
+# Optional mode: the Match runs in a child process, which publishes every tick
+# into a ring of slots in shared memory; the game process mirrors the newest
+# slot into ordinary Ship/Bullet/Particle objects and draws those.
+SIM_RING_SLOTS = 8
+SIM_MAX_BULLETS = 1024
+SIM_MAX_PARTICLES = 1024
+SIM_SOUND_BYTES = 512
+# Longest the game waits for the worker to publish the tick it just sent, in seconds
+SIM_SYNC_WAIT = core.TICK_TIME
+# Sequence number of the newest complete slot
+SIM_RING_HEADER = struct.Struct("<Q")
+# stamp (slot's sequence number, 0 while being written), tick, state,
+# winner (winning team + 1, 0 for none), bullet count, particle count, sound bytes,
+# next bullet id
+SIM_SLOT_HEADER = struct.Struct("<QqBBHHHI")
+# x, y, prev_x, prev_y, tilt, health, magazine, is_left, charging, charge time,
+# bullet cooldown, zone (min_x, max_x, min_y, max_y); MAX_SHIPS of them in slot order
+SIM_SHIP = struct.Struct("<6fhBBHH4i")
+SIM_SHIPS_SIZE = MAX_SHIPS * SIM_SHIP.size
+# id, ship type, kernel, charged, owner, direction, charge level, exploding,
+# returning, settled, explosion applied, x, y, prev_x, prev_y, angle, vx, vy,
+# distance traveled, timer, explosion timer, width, height
+SIM_BULLET = struct.Struct("<IBBBBbBBBBB8f4H")
+# x, y, r, g, b, lifetime, age, size
+SIM_PARTICLE = struct.Struct("<2f3BxHHH")
+SIM_SLOT_SIZE = (SIM_SLOT_HEADER.size + SIM_SHIPS_SIZE + SIM_MAX_BULLETS * SIM_BULLET.size
+                 + SIM_MAX_PARTICLES * SIM_PARTICLE.size + SIM_SOUND_BYTES)
+SIM_STATES = ("playing", "game_over")
+
+
+class WorldRing:
+    """Ring of world-state slots in a shared buffer: one writer, any readers.
+
+    The writer zeroes a slot's stamp, fills it, stamps it with its sequence
+    number and then publishes that number in the ring header. Readers copy a
+    slot and keep it only if the stamp was the same before and after, so a
+    slot overwritten mid-read is detected instead of half-applied.
+    """
+    size = SIM_RING_HEADER.size + SIM_RING_SLOTS * SIM_SLOT_SIZE
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.seq = 0  # last slot written (writer side)
+
+    def offset(self, seq):
+        return SIM_RING_HEADER.size + (seq % SIM_RING_SLOTS) * SIM_SLOT_SIZE
+
+    def latest(self):
+        return SIM_RING_HEADER.unpack_from(self.buf, 0)[0]
+
+    def write(self, match, sounds):
+        buf = self.buf
+        seq = self.seq + 1
+        start = self.offset(seq)
+        SIM_SLOT_HEADER.pack_into(buf, start, 0, 0, 0, 0, 0, 0, 0, 0)
+        pos = start + SIM_SLOT_HEADER.size
+        for ship in match.ships:
+            SIM_SHIP.pack_into(buf, pos, ship.x, ship.y, ship.prev_x, ship.prev_y,
+                               getattr(ship, 'tilt', 0), ship.health, ship.bullets, ship.is_left,
+                               ship.charging, ship.charge_time, ship.bullet_cooldown, *ship.zone)
+            pos += SIM_SHIP.size
+        pos = start + SIM_SLOT_HEADER.size + SIM_SHIPS_SIZE
+        bullets = match.bullets[:SIM_MAX_BULLETS]
+        for b in bullets:
+            SIM_BULLET.pack_into(buf, pos, b.id & 0xFFFFFFFF, b.spec.id, b.kernel,
+                                 b.is_charged, b.owner, b.direction, b.charge_level, b.exploding,
+                                 b.is_returning, b.settled, b.explosion_applied,
+                                 b.x, b.y, b.prev_x, b.prev_y, b.angle, b.vx, b.vy,
+                                 b.distance_traveled, min(b.timer, 0xFFFF),
+                                 min(b.explosion_timer, 0xFFFF), int(b.width), int(b.height))
+            pos += SIM_BULLET.size
+        pos = start + SIM_SLOT_HEADER.size + SIM_SHIPS_SIZE + SIM_MAX_BULLETS * SIM_BULLET.size
+        particles = match.particles[:SIM_MAX_PARTICLES]
+        for p in particles:
+            r, g, b = p.color[:3]
+            SIM_PARTICLE.pack_into(buf, pos, p.x, p.y, r, g, b, p.lifetime, p.age, p.size)
+            pos += SIM_PARTICLE.size
+        pos = start + SIM_SLOT_SIZE - SIM_SOUND_BYTES
+        # Whole events only: on a busy tick the ones that do not fit are dropped
+        data = b""
+        for name, ship_type in sounds:
+            event = f"{';' if data else ''}{name}:{ship_type or ''}".encode("utf-8")
+            if len(data) + len(event) > SIM_SOUND_BYTES:
+                break
+            data += event
+        buf[pos:pos + len(data)] = data
+        winner = 0 if match.winner_team is None else match.winner_team + 1
+        state = SIM_STATES.index(match.state) if match.state in SIM_STATES else 0
+        SIM_SLOT_HEADER.pack_into(buf, start, seq, match.tick, state, winner,
+                                  len(bullets), len(particles), len(data), match.next_bullet_id)
+        SIM_RING_HEADER.pack_into(buf, 0, seq)
+        self.seq = seq
+
+    def read(self, seq, sounds_only=False):
+        """(header, ships+bullets bytes, particle bytes, sounds) of slot seq.
+
+        Returns None if the slot no longer holds seq. With sounds_only the
+        byte fields are empty.
+        """
+        buf = self.buf
+        start = self.offset(seq)
+        header = SIM_SLOT_HEADER.unpack_from(buf, start)
+        if header[0] != seq:
+            return None
+        _, _, _, _, bullets, particles, sound_len, _ = header
+        body = particle_data = b""
+        if not sounds_only:
+            pos = start + SIM_SLOT_HEADER.size
+            body = bytes(buf[pos:pos + SIM_SHIPS_SIZE + bullets * SIM_BULLET.size])
+            pos += SIM_SHIPS_SIZE + SIM_MAX_BULLETS * SIM_BULLET.size
+            particle_data = bytes(buf[pos:pos + particles * SIM_PARTICLE.size])
+        pos = start + SIM_SLOT_SIZE - SIM_SOUND_BYTES
+        sounds = bytes(buf[pos:pos + sound_len])
+        if SIM_SLOT_HEADER.unpack_from(buf, start)[0] != seq:
+            return None  # overwritten while we copied
+        return header, body, particle_data, sounds
+
+
+def run_simulation(shm_name, setup, inputs):
+    """Child process: step a Match on the inputs it is sent, publishing each tick.
+
+    setup is (players, mode, arena, particle_density) as for Match.new_team_match.
+    inputs delivers ('fire', ship index, pressed) and ('tick', [bits per ship],
+    density) in the game's order; None stops the worker.
+    """
+    # Sounds are shipped to the game through the ring instead of played here
+    sounds = []
+    core.SOUND_SINK = lambda sound_name, ship_type: sounds.append((sound_name, ship_type))
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        ring = WorldRing(shm.buf)
+        match = Match()
+        players, mode, match.arena, match.particle_density = setup
+        match.new_team_match(players, mode)
+        ring.write(match, sounds)
+        while True:
+            msg = inputs.get()
+            if msg is None:
+                break
+            if msg[0] == 'fire':
+                ship = match.ships[msg[1]]
+                if msg[2]:
+                    match.press_fire(ship)
+                else:
+                    match.release_fire(ship)
+            elif msg[0] == 'tick':
+                match.particle_density = msg[2]
+                keys = [input_keymap(bits, ship.controls) for bits, ship in zip(msg[1], match.ships)]
+                match.step(keys[0], keys[1], others=keys[2:])
+                ring.write(match, sounds)
+                sounds.clear()
+        ring.buf = None
+    finally:
+        shm.close()
+
+
+class SimulationProcess:
+    """Game-side handle of a simulation worker: sends inputs, mirrors its world."""
+    def __init__(self, game):
+        self.shm = shared_memory.SharedMemory(create=True, size=WorldRing.size)
+        self.ring = WorldRing(self.shm.buf)
+        SIM_RING_HEADER.pack_into(self.shm.buf, 0, 0)
+        # spawn: a fork would inherit the display and audio devices
+        ctx = multiprocessing.get_context("spawn")
+        self.inputs = ctx.Queue()
+        setup = ([(ship.type, ship.original_color) for ship in game.ships], game.mode,
+                 game.arena, game.particle_density)
+        self.process = ctx.Process(target=run_simulation, args=(self.shm.name, setup, self.inputs),
+                                   daemon=True)
+        self.process.start()
+        self.seen = 0  # newest slot applied
+        self.sent = 0  # ticks sent; the worker publishes tick n as slot n + 1
+        self.mirror = {}  # bullet id -> Bullet
+
+    def fire(self, index, pressed):
+        self.inputs.put(('fire', index, pressed))
+
+    def tick(self, game, keys):
+        """Step the worker one tick; keys holds a key-state lookup per ship."""
+        bits = []
+        for ship, ship_keys in zip(game.ships, keys):
+            c = ship.controls
+            bits.append(pack_input(ship_keys[c['up']], ship_keys[c['down']], ship_keys[c['left']],
+                                   ship_keys[c['right']], False))
+        self.inputs.put(('tick', bits, game.particle_density))
+        self.sent += 1
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def sync(self, game, wait=0.0):
+        """Mirror the newest published tick into game; returns True if it changed.
+
+        With wait, first give the worker up to that many seconds to publish the
+        last tick sent, so the game shows it rather than the one before.
+        """
+        latest = self.ring.latest()
+        if wait and latest <= self.sent:
+            deadline = time.perf_counter() + wait
+            while latest <= self.sent and time.perf_counter() < deadline and self.alive():
+                time.sleep(0.0002)
+                latest = self.ring.latest()
+        if latest <= self.seen:
+            return False
+        # Sounds of every tick since the last sync, as long as the ring still has them
+        for seq in range(max(self.seen + 1, latest - SIM_RING_SLOTS + 2), latest):
+            slot = self.ring.read(seq, sounds_only=True)
+            if slot:
+                self.play(slot[3])
+        slot = self.ring.read(latest)
+        if slot is None:
+            return False
+        self.seen = latest
+        header, body, particle_data, sounds = slot
+        self.play(sounds)
+        self.apply(game, header, body, particle_data)
+        return True
+
+    def play(self, sounds):
+        if not sounds:
+            return
+        for event in sounds.decode("utf-8").split(";"):
+            name, _, ship_type = event.partition(":")
+            # Through the game's own sound sink (audio.play_sound)
+            play_sound(name, ship_type or None)
+
+    def apply(self, game, header, body, particle_data):
+        # Everything Match.step reads is mirrored, so the game can carry on
+        # in-process from this tick if the worker dies
+        _, tick, state, winner, _, _, _, next_bullet_id = header
+        game.tick = tick
+        game.next_bullet_id = next_bullet_id
+        for i, ship in enumerate(game.ships):
+            (ship.x, ship.y, ship.prev_x, ship.prev_y, ship.tilt, health, ship.bullets, is_left,
+             charging, ship.charge_time, ship.bullet_cooldown,
+             *zone) = SIM_SHIP.unpack_from(body, i * SIM_SHIP.size)
+            # ships change sides and lanes when a free-for-all side empties
+            ship.is_left, ship.charging, ship.zone = bool(is_left), bool(charging), tuple(zone)
+            if health != ship.health:
+                ship.health = health
+                ship.color = damage_color(ship.original_color, health, ship.max_health)
+            ship.update_bullet_positions()
+
+        mirror = {}
+        bullets = []
+        for rec in struct.iter_unpack(SIM_BULLET.format, body[SIM_SHIPS_SIZE:]):
+            (bid, type_index, kernel, charged, owner, direction, charge_level, exploding,
+             returning, settled, explosion_applied, x, y, prev_x, prev_y, angle, vx, vy,
+             distance_traveled, timer, explosion_timer, width, height) = rec
+            b = self.mirror.get(bid)
+            if b is None:
+                ship = game.ships[owner]
+                b = Bullet(x, y, 1 if ship.is_left else -1, SHIP_SPEC_LIST[type_index].name,
+                           bool(charged), charge_level, angle=angle, kernel=kernel)
+                b.id = bid
+                b.game = game
+                b.arena = game.arena
+                b.color = ship.color
+                b.owner, b.team = owner, ship.team
+            b.x, b.y, b.prev_x, b.prev_y, b.angle = x, y, prev_x, prev_y, angle
+            b.direction, b.timer, b.width, b.height = direction, timer, width, height
+            b.exploding, b.explosion_timer = bool(exploding), explosion_timer
+            b.vx, b.vy, b.distance_traveled = vx, vy, distance_traveled
+            b.explosion_applied = bool(explosion_applied)
+            if returning and not b.is_returning:
+                b.is_returning = True
+                b.damage = b.base_damage * b.spec.return_damage
+            if settled and not b.settled:
+                b.settled = True
+                b.speed = 0
+            mirror[bid] = b
+            bullets.append(b)
+        self.mirror = mirror
+        game.bullets = bullets
+
+        particles = game.particles
+        count = 0
+        for x, y, r, g, b, lifetime, age, size in struct.iter_unpack(SIM_PARTICLE.format, particle_data):
+            if count < len(particles):
+                p = particles[count]
+                p.x, p.y, p.color, p.lifetime, p.age, p.size = x, y, (r, g, b), lifetime, age, size
+            else:
+                p = Particle(x, y, (r, g, b), lifetime=lifetime, size=size)
+                p.age = age
+                particles.append(p)
+            count += 1
+        del particles[count:]
+
+        if SIM_STATES[state] == "game_over" and game.state == "playing":
+            game.state = "game_over"
+            game.winner_team = winner - 1 if winner else None
+            game.winner = game.team_name(winner - 1) if winner else "Nobody"
+        game.publish()
+        if game.state == "game_over":
+            game.stop_simulation()  # the match is over: nothing left for the worker to do
+
+    def stop(self):
+        try:
+            self.inputs.put(None)
+            self.process.join(1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        except Exception:
+            pass
+        try:
+            self.ring.buf = None
+            self.shm.close()
+            self.shm.unlink()
+        except Exception:
+            pass
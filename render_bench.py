@@ -0,0 +1,108 @@
+"""Benchmark the software Surface renderer against the SDL texture renderer.
+
+Plays the same seeded bot-vs-bot match under each backend and times only
+Game.draw(), so the numbers compare rendering and nothing else:
+
+    python render_bench.py --frames 600 --ships Osa,Rift
+    python render_bench.py --backends texture --ships Gwiazdka,Kombuz
+
+Each backend runs in its own process so they do not share a window. Without
+the sprite assets (dual/assets, 2d_flox/assets or assets/) both backends fall
+back to vector shapes and the comparison mostly measures the overlay upload.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+BACKENDS = ("software", "texture")
+
+
+def bench(backend, ship1, ship2, frames, warmup, seed):
+    """Time frames draws of a running match; returns a result dict."""
+    import pygame
+    import project_buzzkill as flox
+
+    pygame.init()
+    game = flox.Game(renderer=backend)
+    game.player1_ship, game.player2_ship = ship1, ship2
+    used = "texture" if game.renderer else "software"
+
+    def new_match():
+        game.start_game()
+        return (flox.SimpleBot(game.ship1, game.ship2, seed=seed * 2),
+                flox.SimpleBot(game.ship2, game.ship1, seed=seed * 2 + 1))
+
+    bot1, bot2 = new_match()
+    times = []
+    bullets = 0
+    for frame in range(warmup + frames):
+        if game.state != "playing":
+            bot1, bot2 = new_match()
+        keys1, fire1 = bot1.think()
+        keys2, fire2 = bot2.think()
+        game.set_fire(game.ship1, fire1)
+        game.set_fire(game.ship2, fire2)
+        game.step(keys1, keys2)
+        pygame.event.pump()
+        # Draw between ticks so interpolation is exercised too
+        game.render_alpha = 0.5
+        start = time.perf_counter()
+        game.draw()
+        elapsed = time.perf_counter() - start
+        if frame >= warmup:
+            times.append(elapsed)
+            bullets += len(game.bullets)
+    pygame.quit()
+
+    times.sort()
+    mean = sum(times) / len(times)
+    return {
+        "requested": backend,
+        "backend": used,
+        "frames": len(times),
+        "mean_ms": mean * 1000,
+        "p95_ms": times[int(len(times) * 0.95) - 1] * 1000,
+        "fps": 1.0 / mean if mean else 0.0,
+        "bullets": bullets / len(times),
+    }
+
+
+def _run(args):
+    return bench(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the software and texture renderers.")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="comma-separated backends to run (software, texture)")
+    parser.add_argument("--ships", default="Osa,Rift", help="SHIP1,SHIP2 for the match")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per backend")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames first")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the bots")
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(unknown)}")
+    ships = [s.strip() for s in args.ships.split(",")]
+    if len(ships) != 2:
+        parser.error("--ships needs exactly two ships")
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+
+    # spawn: every backend gets a fresh SDL with its own window
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'backend':<10} {'frames':>6} {'mean ms':>8} {'p95 ms':>8} {'fps':>8} {'bullets':>8}")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for backend in backends:
+            r = pool.apply(_run, ((backend, ships[0], ships[1], args.frames, args.warmup, args.seed),))
+            name = r["backend"] if r["backend"] == r["requested"] else f"{r['requested']}->{r['backend']}"
+            print(f"{name:<10} {r['frames']:>6} {r['mean_ms']:>8.3f} {r['p95_ms']:>8.3f} "
+                  f"{r['fps']:>8.1f} {r['bullets']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
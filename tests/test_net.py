@@ -0,0 +1,87 @@
+"""Round trips of the LAN wire format: input bits and length-prefixed frames."""
+import itertools
+import json
+
+from project_buzzkill import (FrameReader, INPUT_FIRE, encode_frame, encode_message,
+                              input_keymap, pack_input)
+
+# Key codes of player 1's WASD + space
+CONTROLS = {"up": 119, "down": 115, "left": 97, "right": 100, "fire": 32}
+
+
+class FakeSocket:
+    """Hands out the given byte chunks one recv_into() call at a time.
+
+    Like a real socket it never writes past the end of the view; the rest of
+    a chunk comes with the next call.
+    """
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def recv_into(self, view):
+        if not self.chunks:
+            return 0
+        chunk = self.chunks.pop(0)
+        n = min(len(chunk), len(view))
+        view[:n] = chunk[:n]
+        if n < len(chunk):
+            self.chunks.insert(0, chunk[n:])
+        return n
+
+
+def read_all(reader, sock):
+    messages = []
+    while reader.recv(sock):
+        messages.extend(json.loads(bytes(frame)) for frame in reader.frames())
+    return messages
+
+
+def test_input_bits_round_trip():
+    controls = CONTROLS
+    for up, down, left, right, fire in itertools.product((False, True), repeat=5):
+        bits = pack_input(up, down, left, right, fire)
+        keys = input_keymap(bits, controls)
+        assert (keys[controls['up']], keys[controls['down']], keys[controls['left']],
+                keys[controls['right']]) == (up, down, left, right)
+        assert bool(bits & INPUT_FIRE) == fire
+        assert not keys[controls['fire']]  # fire travels as press/release, not a held key
+    assert len({pack_input(*combo) for combo in itertools.product((False, True), repeat=5)}) == 32
+
+
+def test_frames_split_across_reads():
+    messages = [{'type': 'input', 'tick': tick, 'inputs': [tick, tick % 32]} for tick in range(1, 6)]
+    stream = b"".join(encode_message(msg) for msg in messages)
+    # One byte per recv: every header and body arrives in pieces
+    sock = FakeSocket(stream[i:i + 1] for i in range(len(stream)))
+    assert read_all(FrameReader(), sock) == messages
+
+
+def test_frames_coalesced_in_one_read():
+    messages = [{'type': 'ack', 'tick': tick} for tick in range(50)]
+    stream = b"".join(encode_message(msg) for msg in messages)
+    # Everything at once, then a frame straddling two reads
+    tail = encode_message({'type': 'ping', 't': 1.5})
+    sock = FakeSocket([stream + tail[:3], tail[3:]])
+    assert read_all(FrameReader(), sock) == messages + [{'type': 'ping', 't': 1.5}]
+
+
+def test_buffer_compacts_for_long_streams():
+    # Far more data than the buffer holds: partial frames move to the front
+    payload = {'type': 'state', 'pad': 'x' * 300}
+    frame = encode_message(payload)
+    reader = FrameReader(max_frame=len(frame))
+    stream = frame * 40
+    sock = FakeSocket(stream[i:i + 97] for i in range(0, len(stream), 97))
+    assert read_all(reader, sock) == [payload] * 40
+
+
+def test_oversized_frame_is_rejected():
+    reader = FrameReader(max_frame=16)
+    sock = FakeSocket([encode_frame(b"x" * 17)])
+    reader.recv(sock)
+    try:
+        list(reader.frames())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("oversized frame accepted")
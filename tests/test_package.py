@@ -0,0 +1,29 @@
+"""The lazy package: its name table matches the submodules and imports nothing it need not."""
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import project_buzzkill
+
+
+@pytest.mark.parametrize("name", project_buzzkill.SUBMODULES)
+def test_exports_match_submodule_all(name):
+    if name in ("audio", "render", "game"):
+        pytest.importorskip("pygame")
+    module = importlib.import_module(f"project_buzzkill.{name}")
+    assert set(project_buzzkill.EXPORTS[name]) == set(module.__all__)
+    assert all(hasattr(module, attr) for attr in module.__all__)
+
+
+def test_lookups_import_only_what_they_need():
+    # In a fresh interpreter, so modules other tests loaded do not count
+    code = ("import sys, project_buzzkill as flox\n"
+            "assert not hasattr(flox, 'nonexistent')\n"
+            "assert not [m for m in sys.modules if m.startswith('project_buzzkill.')]\n"
+            "flox.Match, flox.FrameReader, flox.WorldRing\n"
+            "assert 'pygame' not in sys.modules\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(project_buzzkill.__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
@@ -0,0 +1,88 @@
+"""WorldRing round trips: what the worker writes is what the game reads back."""
+import struct
+
+from project_buzzkill import (KeyMap, Match, SIM_BULLET, SIM_RING_SLOTS, SIM_SHIP, SIM_SHIPS_SIZE,
+                              SIM_STATES, SHIP_SPECS, WorldRing)
+
+
+def new_match(mode="ffa"):
+    match = Match()
+    match.new_team_match([("Osa", (255, 0, 0)), ("Kombuz", (0, 0, 255)),
+                          ("Rift", (0, 255, 0)), ("Zaba", (255, 165, 0))], mode)
+    return match
+
+
+def step(match, fire=False):
+    if fire:
+        # A tap: press and release before the tap threshold shoots one bullet
+        for ship in match.ships:
+            match.press_fire(ship)
+            match.release_fire(ship)
+    match.step(KeyMap(), KeyMap(), others=[KeyMap()] * (len(match.ships) - 2))
+
+
+def decode_bullets(body):
+    return [SIM_BULLET.unpack_from(body, pos) for pos in range(SIM_SHIPS_SIZE, len(body), SIM_BULLET.size)]
+
+
+def test_slots_round_trip_across_wrap_around():
+    match = new_match()
+    ring = WorldRing(bytearray(WorldRing.size))
+    ring.write(match, [])
+    for tick in range(3 * SIM_RING_SLOTS + 3):
+        step(match, fire=tick % 4 == 0)
+        ring.write(match, [("shoot", "Osa")] if tick % 2 else [])
+        seq = ring.latest()
+        assert seq == ring.seq == tick + 2
+
+        slot = ring.read(seq)
+        assert slot is not None
+        header, body, particle_data, sounds = slot
+        assert header[0] == seq and header[1] == match.tick
+        assert SIM_STATES[header[2]] == match.state
+        assert header[4] == len(match.bullets)
+        assert sounds == (b"shoot:Osa" if tick % 2 else b"")
+
+        for i, ship in enumerate(match.ships):
+            x, y, _, _, _, health, magazine, is_left = SIM_SHIP.unpack_from(body, i * SIM_SHIP.size)[:8]
+            assert (x, y, health, magazine, bool(is_left)) == (ship.x, ship.y, ship.health,
+                                                               ship.bullets, ship.is_left)
+        records = decode_bullets(body)
+        assert [(r[0], r[1], r[4]) for r in records] == [
+            (b.id, b.spec.id, b.owner) for b in match.bullets]
+
+        # The slot this one overwrote is gone; the ones still in the ring are intact
+        assert ring.read(seq - SIM_RING_SLOTS) is None
+        for older in range(max(1, seq - SIM_RING_SLOTS + 1), seq):
+            assert ring.read(older)[0][0] == older
+    assert any(decode_bullets(ring.read(ring.latest())[1]))
+
+
+def test_game_over_state_and_winner():
+    match = new_match("2v2")
+    ring = WorldRing(bytearray(WorldRing.size))
+    match.state, match.winner_team = "game_over", 1
+    ring.write(match, [])
+    header = ring.read(ring.latest())[0]
+    assert SIM_STATES[header[2]] == "game_over"
+    assert header[3] == 2  # winning team + 1
+
+
+def test_sounds_are_cut_between_events():
+    match = new_match()
+    ring = WorldRing(bytearray(WorldRing.size))
+    ring.write(match, [("shoot", name) for name in SHIP_SPECS] * 40)
+    sounds = ring.read(ring.latest())[3]
+    events = sounds.decode("utf-8").split(";")
+    assert 0 < len(events) < 40 * len(SHIP_SPECS)
+    assert all(event.split(":")[1] in SHIP_SPECS for event in events)
+
+
+def test_torn_slot_is_rejected():
+    match = new_match()
+    ring = WorldRing(bytearray(WorldRing.size))
+    ring.write(match, [])
+    seq = ring.latest()
+    # A writer that has zeroed the stamp but not finished the slot
+    struct.pack_into("<Q", ring.buf, ring.offset(seq), 0)
+    assert ring.read(seq) is None